@@ -3,17 +3,17 @@
 import { useEffect, useState } from 'react';
 import HistoryList from '@/components/HistoryList';
 import { apiClient } from '@/lib/api';
-import { ListDecisionSessionsResponse } from '@/lib/types';
+import { DecisionSessionSummary, ListDecisionSessionsResponse } from '@/lib/types';
 
 export default function HistoryPage() {
-  const [data, setData] = useState<ListDecisionSessionsResponse | null>(null);
+  const [data, setData] = useState<ListDecisionSessionsResponse<DecisionSessionSummary> | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
     const fetchSessions = async () => {
       try {
-        const response = await apiClient.listDecisionSessions();
+        const response = await apiClient.listDecisionSessionSummaries();
         setData(response);
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Failed to load sessions');
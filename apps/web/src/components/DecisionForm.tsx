@@ -1,8 +1,12 @@
 'use client';
 
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
+import { apiClient } from '@/lib/api';
 import { CreateDecisionSessionRequest } from '@/lib/types';
 
+// Pauza w pisaniu, po której formularz jest wstępnie przetwarzany
+const DRAFT_DEBOUNCE_MS = 1500;
+
 interface DecisionFormProps {
   onSubmit: (request: CreateDecisionSessionRequest) => Promise<void>;
   isLoading: boolean;
@@ -13,6 +17,19 @@ export default function DecisionForm({ onSubmit, isLoading }: DecisionFormProps)
   const [options, setOptions] = useState('');
   const [stressLevel, setStressLevel] = useState(5);
 
+  useEffect(() => {
+    if (context.trim().length < 10 || options.trim().length < 5) {
+      return;
+    }
+
+    const timer = setTimeout(() => {
+      // Błędy szkicu nie blokują formularza; zostaną zgłoszone przy wysłaniu
+      apiClient.prepareDraft({ context, options }).catch(() => undefined);
+    }, DRAFT_DEBOUNCE_MS);
+
+    return () => clearTimeout(timer);
+  }, [context, options]);
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     await onSubmit({
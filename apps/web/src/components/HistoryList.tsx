@@ -1,11 +1,11 @@
 'use client';
 
 import Link from 'next/link';
-import { DecisionSessionResponse } from '@/lib/types';
-import { formatDate, getStressLevelColor, truncate } from '@/lib/utils';
+import { DecisionSessionSummary } from '@/lib/types';
+import { formatDate, getStressLevelColor } from '@/lib/utils';
 
 interface HistoryListProps {
-  sessions: DecisionSessionResponse[];
+  sessions: DecisionSessionSummary[];
 }
 
 export default function HistoryList({ sessions }: HistoryListProps) {
@@ -31,7 +31,7 @@ export default function HistoryList({ sessions }: HistoryListProps) {
           <div className="flex items-start justify-between gap-4 mb-3">
             <div className="flex-1">
               <p className="text-gray-700 font-medium mb-1">
-                {truncate(session.input.context, 120)}
+                {session.context_preview}
               </p>
               <p className="text-sm text-gray-500">
                 {formatDate(session.created_at)}
@@ -46,10 +46,10 @@ export default function HistoryList({ sessions }: HistoryListProps) {
 
           <div className="flex gap-2 text-sm text-gray-600">
             <span className="bg-gray-100 px-2 py-1 rounded">
-              {session.output.options.length} {session.output.options.length === 1 ? 'opcja' : session.output.options.length >= 2 && session.output.options.length <= 4 ? 'opcje' : 'opcji'}
+              {session.option_count} {session.option_count === 1 ? 'opcja' : session.option_count >= 2 && session.option_count <= 4 ? 'opcje' : 'opcji'}
             </span>
             <span className="bg-calm-100 text-calm-700 px-2 py-1 rounded">
-              {session.output.calm_step.type}
+              {session.calm_step_type}
             </span>
           </div>
         </Link>
@@ -5,7 +5,11 @@
 import {
   CreateDecisionSessionRequest,
   DecisionSessionResponse,
+  DecisionSessionSummary,
+  DraftDecisionRequest,
+  DraftDecisionResponse,
   ListDecisionSessionsResponse,
+  SessionView,
   ApiError,
 } from './types';
 
@@ -45,10 +49,27 @@ class ApiClient {
     }
   }
 
+  /**
+   * Tworzy sesję decyzyjną. Ponowienia z tym samym kluczem idempotencji
+   * zwracają oryginalną sesję zamiast tworzyć duplikat.
+   */
   async createDecisionSession(
-    request: CreateDecisionSessionRequest
+    request: CreateDecisionSessionRequest,
+    idempotencyKey: string = crypto.randomUUID()
   ): Promise<DecisionSessionResponse> {
     return this.request<DecisionSessionResponse>('/v1/decision/sessions', {
+      method: 'POST',
+      headers: { 'Idempotency-Key': idempotencyKey },
+      body: JSON.stringify(request),
+    });
+  }
+
+  /**
+   * Wstępnie przetwarza formularz w trakcie pisania, aby skrócić czas
+   * tworzenia sesji po wysłaniu.
+   */
+  async prepareDraft(request: DraftDecisionRequest): Promise<DraftDecisionResponse> {
+    return this.request<DraftDecisionResponse>('/v1/decision/drafts', {
       method: 'POST',
       body: JSON.stringify(request),
     });
@@ -65,18 +86,38 @@ class ApiClient {
     page: number = 1,
     pageSize: number = 20
   ): Promise<ListDecisionSessionsResponse> {
+    return this.request<ListDecisionSessionsResponse>(
+      `/v1/decision/sessions?${this.listParams(userId, page, pageSize, 'full')}`
+    );
+  }
+
+  async listDecisionSessionSummaries(
+    userId?: string,
+    page: number = 1,
+    pageSize: number = 20
+  ): Promise<ListDecisionSessionsResponse<DecisionSessionSummary>> {
+    return this.request<ListDecisionSessionsResponse<DecisionSessionSummary>>(
+      `/v1/decision/sessions?${this.listParams(userId, page, pageSize, 'summary')}`
+    );
+  }
+
+  private listParams(
+    userId: string | undefined,
+    page: number,
+    pageSize: number,
+    view: SessionView
+  ): string {
     const params = new URLSearchParams({
       page: page.toString(),
       page_size: pageSize.toString(),
+      view,
     });
 
     if (userId) {
       params.append('user_id', userId);
     }
 
-    return this.request<ListDecisionSessionsResponse>(
-      `/v1/decision/sessions?${params.toString()}`
-    );
+    return params.toString();
   }
 
   async healthCheck(): Promise<{ status: string }> {
@@ -32,11 +32,34 @@ export interface DecisionBrief {
   disclaimer: string;
 }
 
+export type ProcessingTier = 'full' | 'reduced' | 'fast';
+
 export interface CreateDecisionSessionRequest {
   context: string;
   options: string;
   stress_level: number;
   user_id?: string;
+  tier?: ProcessingTier;
+  max_latency_ms?: number;
+}
+
+export interface ProcessingMetadata {
+  tier: ProcessingTier;
+  max_latency_ms: number | null;
+  degraded: boolean;
+  skipped_steps: string[];
+  degraded_steps: string[];
+}
+
+export interface DraftDecisionRequest {
+  context: string;
+  options: string;
+}
+
+export interface DraftDecisionResponse {
+  ready: boolean;
+  cached: boolean;
+  expires_in_seconds: number;
 }
 
 export interface DecisionSessionResponse {
@@ -47,13 +70,28 @@ export interface DecisionSessionResponse {
   output: DecisionBrief;
   stress_level: number;
   processing_time_seconds: number | null;
+  processing?: ProcessingMetadata | null;
+}
+
+export interface DecisionSessionSummary {
+  id: string;
+  created_at: string;
+  user_id: string | null;
+  stress_level: number;
+  context_preview: string;
+  option_count: number;
+  calm_step_type: string;
 }
 
-export interface ListDecisionSessionsResponse {
-  sessions: DecisionSessionResponse[];
-  total: number;
+export type SessionView = 'full' | 'summary';
+
+export interface ListDecisionSessionsResponse<T = DecisionSessionResponse> {
+  sessions: T[];
+  total: number | null;
+  total_estimated?: boolean;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface ApiError {
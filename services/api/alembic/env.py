@@ -12,7 +12,7 @@ from alembic import context
 # Import models and config
 from src.core.config import settings
 from src.db.base import Base
-from src.db.models import DecisionSession  # noqa: F401 - Needed for metadata
+from src.db.models import DecisionJob, DecisionSession, LLMCall  # noqa: F401 - Needed for metadata
 
 # Alembic Config object
 config = context.config
@@ -0,0 +1,51 @@
+"""llm usage ledger
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: str | None = "001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Per-session summary of LLM usage
+    op.add_column("decision_sessions", sa.Column("llm_usage", sa.JSON(), nullable=True))
+
+    # One row per LLM call for aggregated queries
+    op.create_table(
+        "llm_calls",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("agent_name", sa.String(length=100), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("cached_tokens", sa.Integer(), nullable=False),
+        sa.Column("wall_time_ms", sa.Float(), nullable=False),
+        sa.Column("retries", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["session_id"], ["decision_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_index("ix_llm_calls_session_id", "llm_calls", ["session_id"], unique=False)
+    op.create_index("ix_llm_calls_created_at", "llm_calls", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_calls_created_at", table_name="llm_calls")
+    op.drop_index("ix_llm_calls_session_id", table_name="llm_calls")
+    op.drop_table("llm_calls")
+    op.drop_column("decision_sessions", "llm_usage")
@@ -0,0 +1,38 @@
+"""idempotency key
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: str | None = "002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Idempotency-Key of the request that created the session
+    op.add_column(
+        "decision_sessions",
+        sa.Column("idempotency_key", sa.String(length=255), nullable=True),
+    )
+    op.create_index(
+        "ix_decision_sessions_idempotency_key",
+        "decision_sessions",
+        ["idempotency_key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_decision_sessions_idempotency_key", table_name="decision_sessions")
+    op.drop_column("decision_sessions", "idempotency_key")
@@ -0,0 +1,28 @@
+"""agent outputs
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: str | None = "003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Per-step agent outputs, reused when a session is re-evaluated
+    op.add_column("decision_sessions", sa.Column("agent_outputs", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("decision_sessions", "agent_outputs")
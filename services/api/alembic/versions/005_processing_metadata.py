@@ -0,0 +1,28 @@
+"""processing metadata
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Requested and achieved latency tier of the session
+    op.add_column("decision_sessions", sa.Column("processing_metadata", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("decision_sessions", "processing_metadata")
@@ -0,0 +1,55 @@
+"""session history index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+INDEX = "ix_decision_sessions_user_id_created_at"
+# Single-column index of 001; the composite index serves user_id lookups too
+OLD_INDEX = "ix_decision_sessions_user_id"
+
+
+def upgrade() -> None:
+    # Keyset pagination of a user's history, newest first. Built and swapped
+    # concurrently, so writes to decision_sessions are not blocked meanwhile.
+    with op.get_context().autocommit_block():
+        # Leftover of an interrupted run (CONCURRENTLY leaves INVALID indexes behind)
+        op.drop_index(
+            INDEX, table_name="decision_sessions", postgresql_concurrently=True, if_exists=True
+        )
+        op.create_index(
+            INDEX,
+            "decision_sessions",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            OLD_INDEX, table_name="decision_sessions", postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            OLD_INDEX, table_name="decision_sessions", postgresql_concurrently=True, if_exists=True
+        )
+        op.create_index(
+            OLD_INDEX, "decision_sessions", ["user_id"], unique=False, postgresql_concurrently=True
+        )
+        op.drop_index(INDEX, table_name="decision_sessions", postgresql_concurrently=True)
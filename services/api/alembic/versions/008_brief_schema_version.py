@@ -0,0 +1,29 @@
+"""brief schema version
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Storage format version of decision_brief; existing rows stay NULL and
+    # are validated when loaded
+    op.add_column("decision_sessions", sa.Column("schema_version", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("decision_sessions", "schema_version")
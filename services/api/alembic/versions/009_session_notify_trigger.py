@@ -0,0 +1,40 @@
+"""session notify trigger
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: str | None = "008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Completion notifications for long-polling readers are queued by the
+    # INSERT itself instead of a separate pg_notify round trip
+    op.execute("""
+        CREATE FUNCTION notify_decision_session_completed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('decision_session_completed', NEW.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute("""
+        CREATE TRIGGER decision_sessions_notify_completed
+        AFTER INSERT ON decision_sessions
+        FOR EACH ROW EXECUTE FUNCTION notify_decision_session_completed()
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER decision_sessions_notify_completed ON decision_sessions")
+    op.execute("DROP FUNCTION notify_decision_session_completed()")
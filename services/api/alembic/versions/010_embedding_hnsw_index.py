@@ -0,0 +1,65 @@
+"""embedding hnsw index
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+import math
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX = "ix_decision_sessions_embedding"
+NEW_INDEX = "ix_decision_sessions_embedding_new"
+
+
+def _index_method() -> str:
+    """Index method and storage parameters for the configured index type."""
+    if settings.vector_index_type == "hnsw":
+        return (
+            f"hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction})"
+        )
+
+    # IVFFlat centroids are trained on the rows present at build time; size
+    # the lists after them (rows / 1000, sqrt(rows) above 1M rows)
+    rows = (
+        op.get_bind()
+        .execute(sa.text("SELECT count(*) FROM decision_sessions WHERE embedding IS NOT NULL"))
+        .scalar_one()
+    )
+    lists = max(10, rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows)))
+    return f"ivfflat (embedding vector_cosine_ops) WITH (lists = {lists})"
+
+
+def _replace_index(method: str) -> None:
+    """Build the new index next to the old one, then swap them without locking writes."""
+    with op.get_context().autocommit_block():
+        # Leftover of an interrupted run (CONCURRENTLY leaves INVALID indexes behind)
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {NEW_INDEX}")
+        op.execute(f"CREATE INDEX CONCURRENTLY {NEW_INDEX} ON decision_sessions USING {method}")
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX}")
+        op.execute(f"ALTER INDEX {NEW_INDEX} RENAME TO {INDEX}")
+
+
+def upgrade() -> None:
+    # The ivfflat index of 001 was trained on an empty table, so its lists
+    # never matched the data. HNSW needs no training and keeps its recall as
+    # the table grows. Large builds are faster with a higher
+    # maintenance_work_mem for the migrating role.
+    _replace_index(_index_method())
+
+
+def downgrade() -> None:
+    _replace_index("ivfflat (embedding vector_cosine_ops) WITH (lists = 100)")
@@ -0,0 +1,85 @@
+"""embedding dimensions and storage precision
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+import math
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: str | None = "010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX = "ix_decision_sessions_embedding"
+FULL_DIMENSIONS = 1536
+
+
+def _create_index(storage: str) -> None:
+    """Build the embedding index of migration 010 for the given column type."""
+    ops = f"{storage}_cosine_ops"
+    if settings.vector_index_type == "hnsw":
+        method = (
+            f"hnsw (embedding {ops}) "
+            f"WITH (m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction})"
+        )
+    else:
+        rows = (
+            op.get_bind()
+            .execute(sa.text("SELECT count(*) FROM decision_sessions WHERE embedding IS NOT NULL"))
+            .scalar_one()
+        )
+        lists = max(10, rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows)))
+        method = f"ivfflat (embedding {ops}) WITH (lists = {lists})"
+    with op.get_context().autocommit_block():
+        op.execute(f"CREATE INDEX CONCURRENTLY {INDEX} ON decision_sessions USING {method}")
+
+
+def upgrade() -> None:
+    storage, dimensions = settings.embedding_storage, settings.embedding_dimensions
+    if (storage, dimensions) == ("vector", FULL_DIMENSIONS):
+        return
+
+    # text-embedding-3 vectors keep their meaning when truncated and
+    # re-normalized, which is what the API's `dimensions` parameter returns,
+    # so stored rows are converted in place instead of re-embedded. Rows of
+    # a larger size than stored cannot be restored on downgrade.
+    if dimensions < FULL_DIMENSIONS:
+        converted = f"l2_normalize(subvector(embedding, 1, {dimensions}))::{storage}({dimensions})"
+    elif dimensions == FULL_DIMENSIONS:
+        converted = f"embedding::{storage}({dimensions})"
+    else:
+        # Longer vectors need new embeddings; the embedding pipeline backfills them
+        converted = "NULL"
+
+    # The type change rewrites the table under an exclusive lock
+    op.execute(f"DROP INDEX IF EXISTS {INDEX}")
+    op.execute(
+        f"ALTER TABLE decision_sessions ALTER COLUMN embedding "
+        f"TYPE {storage}({dimensions}) USING {converted}"
+    )
+    _create_index(storage)
+
+
+def downgrade() -> None:
+    storage, dimensions = settings.embedding_storage, settings.embedding_dimensions
+    if (storage, dimensions) == ("vector", FULL_DIMENSIONS):
+        return
+
+    # Shortened vectors cannot be widened; they are re-embedded by the backfill
+    converted = f"embedding::vector({FULL_DIMENSIONS})" if dimensions == FULL_DIMENSIONS else "NULL"
+    op.execute(f"DROP INDEX IF EXISTS {INDEX}")
+    op.execute(
+        f"ALTER TABLE decision_sessions ALTER COLUMN embedding "
+        f"TYPE vector({FULL_DIMENSIONS}) USING {converted}"
+    )
+    _create_index("vector")
@@ -0,0 +1,36 @@
+"""embedding model version
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: str | None = "011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "decision_sessions", sa.Column("embedding_model", sa.String(length=100), nullable=True)
+    )
+    # Stored embeddings were produced by the configured model
+    op.execute(
+        sa.text(
+            "UPDATE decision_sessions SET embedding_model = :version WHERE embedding IS NOT NULL"
+        ).bindparams(version=settings.embedding_version)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("decision_sessions", "embedding_model")
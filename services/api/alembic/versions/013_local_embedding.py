@@ -0,0 +1,42 @@
+"""local embedding
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from alembic import op
+from src.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "013"
+down_revision: str | None = "012"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX = "ix_decision_sessions_local_embedding"
+
+
+def upgrade() -> None:
+    # Filled on write; existing sessions: python -m scripts.reembed_sessions --local
+    op.add_column(
+        "decision_sessions",
+        sa.Column("local_embedding", Vector(settings.local_embedding_dimensions), nullable=True),
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY {INDEX} ON decision_sessions "
+            f"USING hnsw (local_embedding vector_cosine_ops) "
+            f"WITH (m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction})"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="decision_sessions")
+    op.drop_column("decision_sessions", "local_embedding")
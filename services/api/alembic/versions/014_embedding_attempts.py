@@ -0,0 +1,31 @@
+"""embedding attempts
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "014"
+down_revision: str | None = "013"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Failed background embedding attempts; the backfill skips sessions over the limit
+    op.add_column(
+        "decision_sessions",
+        sa.Column("embedding_attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("decision_sessions", "embedding_attempts")
@@ -0,0 +1,40 @@
+"""local embedding model version
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.services.embedding_providers import local_embedding_provider
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: str | None = "015"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "decision_sessions",
+        sa.Column("local_embedding_model", sa.String(length=100), nullable=True),
+    )
+    # Stored local embeddings were produced by the configured provider
+    sessions = sa.table(
+        "decision_sessions", sa.column("local_embedding"), sa.column("local_embedding_model")
+    )
+    op.execute(
+        sessions.update()
+        .where(sessions.c.local_embedding.isnot(None))
+        .values(local_embedding_model=local_embedding_provider.version)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("decision_sessions", "local_embedding_model")
@@ -0,0 +1,142 @@
+"""Benchmark building and serializing a page of stored decision sessions.
+
+Compares, for one list page of stored sessions:
+
+- models: build DecisionSessionResponse models (validating every stored brief)
+  and respond the FastAPI way (dump to dict, validate against
+  response_model, serialize)
+- json, legacy rows: rows written before schema versioning, validated and
+  serialized once
+- json, current rows: stored JSON of current-version rows serialized as-is
+
+Usage (from services/api):
+    python -m scripts.benchmark_session_list [--page-size 100] [--repeat 200]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from src.db.models import DecisionSession
+from src.schemas.decision import ListDecisionSessionsResponse
+from src.schemas.storage import BRIEF_SCHEMA_VERSION
+from src.services.decision_service import DecisionService
+
+BRIEF = {
+    "options": [
+        {
+            "title": f"Opcja {index}",
+            "description": "Przyjęcie oferty oznacza wyższą pensję, ale mniejszą stabilność. " * 3,
+            "consequences": [
+                "Wyższe zarobki od przyszłego miesiąca",
+                "Nowy zespół i nowe obowiązki",
+                "Ryzyko związane z młodą firmą",
+            ],
+            "emotional_risk": "Średnie",
+            "confidence_level": 0.7,
+        }
+        for index in range(3)
+    ],
+    "calm_step": {
+        "type": "breathing",
+        "title": "Oddech 4-7-8",
+        "description": "Wdech przez 4 sekundy, zatrzymanie na 7, wydech przez 8.",
+        "duration_minutes": 3,
+    },
+    "control_question": "Która opcja będzie dla Ciebie ważna za pięć lat?",
+    "next_check_in": {"suggestion": "jutro rano", "reasoning": "Po odpoczynku"},
+    "disclaimer": "To wsparcie w podejmowaniu decyzji, nie porada medyczna ani terapeutyczna.",
+}
+
+PROCESSING = {
+    "tier": "full",
+    "max_latency_ms": None,
+    "degraded": False,
+    "skipped_steps": [],
+    "degraded_steps": [],
+    "requested_tier": None,
+    "requested_max_latency_ms": None,
+}
+
+
+def make_rows(count: int, schema_version: int | None) -> list[DecisionSession]:
+    """Build stored session rows, as loaded by the ORM."""
+    started = datetime(2026, 10, 19)
+    return [
+        DecisionSession(
+            id=uuid4(),
+            created_at=started - timedelta(minutes=index),
+            user_id="benchmark",
+            context="Czy powinienem zmienić pracę? Mam ofertę, ale tutaj jest mi wygodnie. " * 5,
+            options="Zostać w obecnej pracy, Przyjąć nową ofertę, Negocjować",
+            stress_level=6,
+            decision_brief=BRIEF,
+            schema_version=schema_version,
+            processing_time_seconds=4.2,
+            processing_metadata=PROCESSING,
+        )
+        for index in range(count)
+    ]
+
+
+def respond_with_models(rows: list[DecisionSession]) -> bytes:
+    """Previous read path: build models, then FastAPI dumps and re-validates them."""
+    page = ListDecisionSessionsResponse(
+        sessions=[DecisionService._to_response(row) for row in rows],
+        total=len(rows),
+        page_size=len(rows),
+    )
+    adapter = TypeAdapter(ListDecisionSessionsResponse)
+    return adapter.dump_json(adapter.validate_python(page.model_dump()))
+
+
+def respond_with_json(rows: list[DecisionSession]) -> bytes:
+    """Current read path of list_decision_sessions_json."""
+    return to_json(
+        {
+            "sessions": [DecisionService._to_payload(row) for row in rows],
+            "total": len(rows),
+            "page_size": len(rows),
+        }
+    )
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Mean wall time of fn in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    legacy_rows = make_rows(args.page_size, schema_version=None)
+    current_rows = make_rows(args.page_size, schema_version=BRIEF_SCHEMA_VERSION)
+
+    results = [
+        ("models", measure(lambda: respond_with_models(current_rows), args.repeat)),
+        ("json, legacy rows", measure(lambda: respond_with_json(legacy_rows), args.repeat)),
+        ("json, current rows", measure(lambda: respond_with_json(current_rows), args.repeat)),
+    ]
+
+    header = f"{'page of ' + str(args.page_size):<24}{'ms':>10}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    baseline = results[0][1]
+    for name, ms in results:
+        print(f"{name:<24}{ms:>10.3f}{baseline / ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""Benchmark recall, size and latency of pgvector index types and storage formats.
+
+Seeds N synthetic, clustered embeddings into temporary tables of the
+configured database and, for each storage format, index type and search
+breadth, reports:
+
+- MB: table + index size (smaller relations stay cached in shared_buffers)
+- build: index build time
+- recall@k: share of the exact k nearest neighbours of the full-size float32
+  vectors (sequential scan) returned
+- p50 / p99: query latency
+
+Storage formats are given as type:dimensions; shortened vectors are
+truncated and re-normalized, as migration 011 converts stored rows. The exact
+sequential scan is reported as the baseline. IVFFlat is built after the data
+is loaded, with lists sized the way migration 010 sizes them.
+
+Usage (from services/api, with PostgreSQL + pgvector running):
+    python -m scripts.benchmark_vector_index [--rows 10000] [--queries 100] [--k 10]
+        [--ef-search 40 100] [--probes 10 30] [--storage vector:1536 halfvec:1536 halfvec:512]
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import statistics
+import time
+from collections.abc import Sequence
+
+import asyncpg
+
+from src.core.config import settings
+
+TABLE = "vector_benchmark"
+
+
+def unit(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length."""
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def literal(vector: Sequence[float]) -> str:
+    """pgvector text representation of a vector."""
+    return "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+
+
+def shorten(vector: list[float], dimensions: int) -> list[float]:
+    """Leading dimensions of a vector, re-normalized."""
+    return unit(vector[:dimensions])
+
+
+def make_vectors(
+    count: int, centers: list[list[float]], spread: float, rng: random.Random
+) -> list[list[float]]:
+    """Random unit vectors scattered around cluster centers, like topical embeddings."""
+    vectors = []
+    for _ in range(count):
+        center = rng.choice(centers)
+        vectors.append(unit([value + rng.gauss(0, spread) for value in center]))
+    return vectors
+
+
+def percentile(latencies: list[float], q: int) -> float:
+    """q-th percentile of latencies in milliseconds."""
+    return statistics.quantiles(latencies, n=100, method="inclusive")[q - 1] * 1000
+
+
+async def run_queries(
+    connection: asyncpg.Connection, table: str, storage: str, queries: list[str], k: int
+) -> tuple[list[list[int]], list[float]]:
+    """Run k-NN queries, returning result IDs and latencies in seconds."""
+    results, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        rows = await connection.fetch(
+            f"SELECT id FROM {table} ORDER BY embedding <=> $1::text::{storage} LIMIT $2", query, k
+        )
+        latencies.append(time.perf_counter() - started)
+        results.append([row["id"] for row in rows])
+    return results, latencies
+
+
+async def create_table(
+    connection: asyncpg.Connection, table: str, storage: str, vectors: list[list[float]]
+) -> None:
+    """Create and fill a temporary table of embeddings."""
+    await connection.execute(
+        f"CREATE TEMP TABLE {table} "
+        f"(id integer PRIMARY KEY, embedding {storage}({len(vectors[0])}))"
+    )
+    await connection.executemany(
+        f"INSERT INTO {table} VALUES ($1, $2::text::{storage})",
+        [(index, literal(vector)) for index, vector in enumerate(vectors)],
+    )
+    await connection.execute(f"ANALYZE {table}")
+
+
+async def size_mb(connection: asyncpg.Connection, table: str) -> float:
+    """Size of a table with its indexes and TOAST data in MB."""
+    return await connection.fetchval("SELECT pg_total_relation_size($1::regclass)", table) / 2**20
+
+
+def recall(results: list[list[int]], exact: list[list[int]], k: int) -> float:
+    """Mean share of the exact neighbours found."""
+    return statistics.mean(
+        len(set(found) & set(truth)) / k for found, truth in zip(results, exact, strict=True)
+    )
+
+
+async def main() -> None:
+    """Run the benchmark and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=settings.hnsw_m)
+    parser.add_argument("--ef-construction", type=int, default=settings.hnsw_ef_construction)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[settings.hnsw_ef_search])
+    parser.add_argument("--probes", type=int, nargs="+", default=[settings.ivfflat_probes])
+    parser.add_argument(
+        "--storage",
+        nargs="+",
+        default=[f"{settings.embedding_storage}:{settings.embedding_dimensions}"],
+        help="storage formats as vector|halfvec:dimensions",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    storages = [(spec.split(":")[0], int(spec.split(":")[1])) for spec in args.storage]
+
+    rng = random.Random(args.seed)
+    centers = [
+        unit([rng.gauss(0, 1) for _ in range(args.dimensions)]) for _ in range(args.clusters)
+    ]
+    spread = 1.5 / math.sqrt(args.dimensions)
+    print(f"generating {args.rows} x {args.dimensions} vectors ...")
+    data = make_vectors(args.rows, centers, spread, rng)
+    queries = make_vectors(args.queries, centers, spread, rng)
+
+    dsn = str(settings.database_url).replace("postgresql+asyncpg://", "postgresql://")
+    connection = await asyncpg.connect(dsn)
+    try:
+        await connection.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+        # Ground truth: exact neighbours of the full-size float32 vectors
+        await create_table(connection, f"{TABLE}_exact", "vector", data)
+        exact, exact_latencies = await run_queries(
+            connection, f"{TABLE}_exact", "vector", [literal(query) for query in queries], args.k
+        )
+        report = [
+            (
+                f"vector:{args.dimensions}",
+                "exact (seq scan)",
+                "",
+                await size_mb(connection, f"{TABLE}_exact"),
+                0.0,
+                1.0,
+                exact_latencies,
+            )
+        ]
+
+        lists = max(10, args.rows // 1000 if args.rows <= 1_000_000 else int(math.sqrt(args.rows)))
+        # Measure the index, not the planner's choice between index and scan
+        await connection.execute("SET enable_seqscan = off")
+        for number, (storage, dimensions) in enumerate(storages):
+            table = f"{TABLE}_{number}"
+            await create_table(
+                connection, table, storage, [shorten(vector, dimensions) for vector in data]
+            )
+            stored_queries = [literal(shorten(query, dimensions)) for query in queries]
+            indexes = [
+                (
+                    f"hnsw m={args.m} efc={args.ef_construction}",
+                    f"hnsw (embedding {storage}_cosine_ops) "
+                    f"WITH (m = {args.m}, ef_construction = {args.ef_construction})",
+                    "hnsw.ef_search",
+                    args.ef_search,
+                ),
+                (
+                    f"ivfflat lists={lists}",
+                    f"ivfflat (embedding {storage}_cosine_ops) WITH (lists = {lists})",
+                    "ivfflat.probes",
+                    args.probes,
+                ),
+            ]
+            for name, method, parameter, values in indexes:
+                started = time.perf_counter()
+                await connection.execute(
+                    f"CREATE INDEX {table}_embedding ON {table} USING {method}"
+                )
+                build = time.perf_counter() - started
+                size = await size_mb(connection, table)
+                for value in values:
+                    await connection.execute(f"SET {parameter} = {int(value)}")
+                    results, latencies = await run_queries(
+                        connection, table, storage, stored_queries, args.k
+                    )
+                    report.append(
+                        (
+                            f"{storage}:{dimensions}",
+                            name,
+                            f"{parameter}={value}",
+                            size,
+                            build,
+                            recall(results, exact, args.k),
+                            latencies,
+                        )
+                    )
+                await connection.execute(f"DROP INDEX {table}_embedding")
+    finally:
+        await connection.close()
+
+    header = (
+        f"{'storage':<15}{'index':<28}{'search':<20}{'MB':>8}{'build s':>9}"
+        f"{'recall@' + str(args.k):>11}{'p50 ms':>9}{'p99 ms':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for storage, name, search, size, build, found, latencies in report:
+        print(
+            f"{storage:<15}{name:<28}{search:<20}{size:>8.1f}{build:>9.2f}{found:>11.3f}"
+            f"{percentile(latencies, 50):>9.2f}{percentile(latencies, 99):>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
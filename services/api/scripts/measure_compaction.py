@@ -0,0 +1,160 @@
+"""Measure token savings and drift of local context compaction.
+
+Runs compaction over a fixed set of sample decisions and reports, per sample,
+the estimated token savings and two drift proxies:
+
+- keyword recall: share of the original's top salient keywords still present
+- option recall: share of option keywords (mentioned in the context) still present
+
+Usage (from services/api):
+    python -m scripts.measure_compaction [--ratio 0.6] [--min-chars 600]
+"""
+
+import argparse
+from collections import Counter
+
+from src.agents.prompt import estimate_tokens
+from src.orchestrator.compaction import compact_context, keywords
+
+TOP_KEYWORDS = 15
+
+SAMPLE_DECISIONS: list[dict[str, str]] = [
+    {
+        "name": "zmiana_pracy",
+        "options": "Zostać w obecnej pracy, Przyjąć ofertę w nowej firmie, Negocjować podwyżkę",
+        "context": (
+            "Czy powinienem zmienić pracę? Od pięciu lat pracuję w firmie logistycznej jako analityk. "
+            "Dostałem ofertę z nowej firmy technologicznej z pensją wyższą o 25 procent. "
+            "Nowa firma jest startupem i nie wiem, czy przetrwa kolejne dwa lata. "
+            "W obecnej pracy mam stabilność, dobry zespół i szefa, który mnie wspiera. "
+            "W obecnej pracy mam stabilność i dobry zespół. "
+            "Z drugiej strony od roku nie dostałem podwyżki, a obowiązków przybywa. "
+            "Mam kredyt hipoteczny i dwoje dzieci, więc stabilność jest dla mnie ważna. "
+            "Żona mówi, że to moja decyzja, ale widzę, że martwi się o finanse. "
+            "Rekruter z nowej firmy chce odpowiedzi do piątku. "
+            "Myślałem też o negocjowaniu podwyżki z obecnym pracodawcą, ale boję się, że to zepsuje relacje. "
+            "Nie śpię dobrze od tygodnia i ciągle o tym myślę."
+        ),
+    },
+    {
+        "name": "przeprowadzka",
+        "options": "Przeprowadzić się do Krakowa, Zostać w Łodzi, Wynająć mieszkanie na próbę",
+        "context": (
+            "Zastanawiam się nad przeprowadzką do Krakowa. Mieszkam w Łodzi od urodzenia. "
+            "Mój partner dostał pracę w Krakowie i przeprowadza się za dwa miesiące. "
+            "Ja pracuję zdalnie, więc technicznie mogę mieszkać gdziekolwiek. "
+            "W Łodzi mam rodziców, którzy się starzeją i czasem potrzebują pomocy. "
+            "Mam też w Łodzi przyjaciół z liceum, z którymi widuję się co tydzień. "
+            "Kraków jest droższy, mieszkania są o wiele droższe niż w Łodzi. "
+            "Kraków jest droższy i mieszkania kosztują więcej. "
+            "Boję się, że związek na odległość nie przetrwa. "
+            "Z drugiej strony boję się, że w Krakowie będę samotna i będę tęsknić za rodzicami. "
+            "Może mogłabym wynająć mieszkanie w Krakowie na kilka miesięcy na próbę? "
+            "Rodzice mówią, żebym robiła to, co czuję, ale wiem, że byłoby im przykro."
+        ),
+    },
+    {
+        "name": "studia",
+        "options": "Rzucić studia, Kontynuować studia, Wziąć urlop dziekański",
+        "context": (
+            "Jestem na trzecim roku studiów prawniczych i coraz bardziej czuję, że to nie dla mnie. "
+            "Wybrałem prawo, bo rodzice są prawnikami i oczekiwali tego ode mnie. "
+            "Od dwóch lat po zajęciach programuję i zrobiłem kilka aplikacji. "
+            "Programowanie daje mi dużo więcej radości niż prawo. "
+            "Oceny mam przeciętne, ale zdaję wszystkie egzaminy. "
+            "Zostały mi dwa lata do dyplomu. "
+            "Rzucenie studiów oznacza rozmowę z rodzicami, której bardzo się boję. "
+            "Mógłbym wziąć urlop dziekański i przez rok spróbować pracy jako programista. "
+            "Kolega mówi, że dyplom zawsze się przyda, nawet jeśli nie będę prawnikiem. "
+            "Kolega twierdzi, że dyplom zawsze się przydaje. "
+            "Nie wiem, czy to chwilowe zmęczenie, czy naprawdę chcę zmienić kierunek."
+        ),
+    },
+    {
+        "name": "zakup_samochodu",
+        "options": "Kupić nowy samochód, Kupić używany samochód, Naprawić obecny samochód",
+        "context": (
+            "Mój samochód ma czternaście lat i coraz częściej się psuje. "
+            "Ostatnia naprawa kosztowała trzy tysiące złotych, a mechanik mówi, że wkrótce trzeba będzie wymienić sprzęgło. "
+            "Dojeżdżam do pracy czterdzieści kilometrów dziennie, więc samochód jest mi niezbędny. "
+            "Mam oszczędności na poziomie trzydziestu tysięcy złotych. "
+            "Nowy samochód kosztowałby około stu tysięcy, musiałbym wziąć kredyt lub leasing. "
+            "Używany samochód w dobrym stanie to koszt około pięćdziesięciu tysięcy. "
+            "Boję się kupić używany samochód z ukrytymi wadami. "
+            "Naprawa obecnego samochodu to około pięciu tysięcy, ale nie wiem, co zepsuje się następne. "
+            "Mechanik mówi, że sprzęgło trzeba będzie wkrótce wymienić. "
+            "Nie znam się na samochodach i łatwo mnie oszukać."
+        ),
+    },
+    {
+        "name": "opieka_nad_rodzicem",
+        "options": "Zamieszkać z mamą, Zatrudnić opiekunkę, Dom opieki",
+        "context": (
+            "Moja mama ma osiemdziesiąt lat i po ostatnim upadku nie radzi sobie sama. "
+            "Mieszka sama w mieszkaniu na trzecim piętrze bez windy. "
+            "Ja mieszkam z mężem i dziećmi w domu oddalonym o godzinę drogi. "
+            "Mogłabym zabrać mamę do nas, ale mamy mało miejsca i dzieci są nastolatkami. "
+            "Opiekunka na kilka godzin dziennie kosztuje około czterech tysięcy miesięcznie. "
+            "Dom opieki jest drogi, a mama mówi, że nigdy się tam nie przeprowadzi. "
+            "Brat mieszka za granicą i może pomóc tylko finansowo. "
+            "Brat może pomóc tylko finansowo, bo mieszka za granicą. "
+            "Czuję ogromne poczucie winy niezależnie od tego, co wybiorę. "
+            "Jestem zmęczona, bo od miesiąca jeżdżę do mamy codziennie po pracy. "
+            "Czy to egoizm, że myślę o opiekunce zamiast zająć się nią sama?"
+        ),
+    },
+]
+
+
+def top_keywords(text: str, limit: int = TOP_KEYWORDS) -> set[str]:
+    """Return the most frequent content words of a text."""
+    return {word for word, _ in Counter(keywords(text)).most_common(limit)}
+
+
+def recall(expected: set[str], text: str) -> float:
+    """Share of expected keywords that are still present in text."""
+    if not expected:
+        return 1.0
+    present = set(keywords(text))
+    return len(expected & present) / len(expected)
+
+
+def main() -> None:
+    """Run compaction over the sample decisions and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ratio", type=float, default=0.6)
+    parser.add_argument("--min-chars", type=int, default=600)
+    args = parser.parse_args()
+
+    header = f"{'sample':<22}{'tok_before':>11}{'tok_after':>10}{'saved':>8}{'kw_recall':>11}{'opt_recall':>11}"
+    print(header)
+    print("-" * len(header))
+
+    total_before = total_after = 0
+    for sample in SAMPLE_DECISIONS:
+        original = sample["context"]
+        compacted = compact_context(
+            original,
+            options=sample["options"],
+            target_ratio=args.ratio,
+            min_chars=args.min_chars,
+        )
+
+        before = estimate_tokens(original)
+        after = estimate_tokens(compacted)
+        total_before += before
+        total_after += after
+
+        option_words = set(keywords(sample["options"])) & set(keywords(original))
+        print(
+            f"{sample['name']:<22}{before:>11}{after:>10}{1 - after / before:>8.0%}"
+            f"{recall(top_keywords(original), compacted):>11.0%}"
+            f"{recall(option_words, compacted):>11.0%}"
+        )
+
+    print("-" * len(header))
+    print(f"{'total':<22}{total_before:>11}{total_after:>10}{1 - total_after / total_before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Re-embed stored decision sessions with the active embedding version.
+
+Embeds every session whose embedding is missing or was produced by another
+model or size (``embedding_model`` differs from settings.embedding_version),
+e.g. after changing OPENAI_EMBEDDING_MODEL. Sessions are read in ID order in
+pages of batch size x concurrency; the batches of a page are embedded
+concurrently and the last ID of each finished page is written to a
+checkpoint file, so an interrupted run resumes where it stopped.
+
+The column size is not changed here: a new EMBEDDING_DIMENSIONS goes through
+migration 011 first.
+
+With --local the run instead re-embeds sessions whose local embedding
+(local_embedding, computed on the CPU without API calls) is missing or of
+another version (``local_embedding_model`` differs from
+local_embedding_provider.version), e.g. for sessions stored before migration
+013 or after changing the local embedding settings.
+
+Usage (from services/api):
+    python -m scripts.reembed_sessions [--batch-size 256] [--concurrency 4] [--limit N]
+        [--checkpoint .reembed_checkpoint.json] [--restart]
+        [--base-url http://localhost:8100/v1] [--local]
+
+With --base-url the run uses an OpenAI-compatible stand-in instead of the API,
+e.g. python -m scripts.stub_embeddings_server.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, bindparam, select, update
+
+from src.core.config import settings
+from src.db.models import DecisionSession
+from src.db.session import SessionLocal, engine
+from src.services.embedding_pipeline import EmbeddingPipeline, embedding_text
+from src.services.embedding_providers import local_embedding_provider
+from src.services.openai_client import OpenAIClient
+
+
+class Checkpoint:
+    """Progress of a re-embedding run for one embedding version."""
+
+    def __init__(self, path: Path, version: str) -> None:
+        """Initialize checkpoint.
+
+        Args:
+            path: Checkpoint file
+            version: Embedding version being written
+        """
+        self.path = path
+        self.version = version
+
+    def load(self) -> tuple[UUID | None, int]:
+        """Last finished session ID and sessions embedded so far (a new run without a file)."""
+        if not self.path.exists():
+            return None, 0
+        state = json.loads(self.path.read_text())
+        if state.get("version") != self.version:
+            # Progress of another version says nothing about this one
+            return None, 0
+        return UUID(state["last_id"]), state["embedded"]
+
+    def save(self, last_id: UUID, embedded: int) -> None:
+        """Record a finished page; the file is replaced atomically."""
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(
+            json.dumps({"version": self.version, "last_id": str(last_id), "embedded": embedded})
+        )
+        os.replace(temporary, self.path)
+
+
+class LocalEmbedder:
+    """Re-embeds missing or outdated local embeddings in batches (CPU only)."""
+
+    # Sessions this embedder processes
+    stale = DecisionSession.local_embedding_model.is_distinct_from(local_embedding_provider.version)
+
+    def __init__(self, batch_size: int) -> None:
+        """Initialize embedder.
+
+        Args:
+            batch_size: Sessions read and updated per batch
+        """
+        self.batch_size = batch_size
+
+    async def embed_batch(self, session_ids: list[UUID]) -> int:
+        """Compute and store local embeddings of sessions without a current one.
+
+        Args:
+            session_ids: IDs of sessions to embed
+
+        Returns:
+            Number of sessions embedded
+        """
+        async with SessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(
+                        DecisionSession.id, DecisionSession.context, DecisionSession.options
+                    ).where(DecisionSession.id.in_(session_ids), self.stale)
+                )
+            ).all()
+            if not rows:
+                return 0
+            table = DecisionSession.__table__
+            await db.execute(
+                update(table)
+                .where(
+                    table.c.id == bindparam("b_id"),
+                    table.c.local_embedding_model.is_distinct_from(
+                        local_embedding_provider.version
+                    ),
+                )
+                .values(
+                    local_embedding=bindparam("b_embedding"),
+                    local_embedding_model=local_embedding_provider.version,
+                    updated_at=table.c.updated_at,
+                ),
+                [
+                    {
+                        "b_id": row.id,
+                        "b_embedding": local_embedding_provider.embed_one(
+                            embedding_text(row.context, row.options)
+                        ),
+                    }
+                    for row in rows
+                ],
+            )
+            await db.commit()
+        return len(rows)
+
+
+async def reembed(
+    pipeline: EmbeddingPipeline | LocalEmbedder,
+    checkpoint: Checkpoint,
+    concurrency: int,
+    limit: int | None = None,
+    stale: ColumnElement[bool] | None = None,
+) -> int:
+    """Embed stale sessions page by page, resuming from the checkpoint.
+
+    Args:
+        pipeline: Embedder whose embed_batch embeds and stores a batch
+        checkpoint: Progress file
+        concurrency: Batches embedded at the same time
+        limit: Stop after about this many sessions
+        stale: Sessions to embed (defaults to those not embedded with checkpoint.version)
+
+    Returns:
+        Sessions embedded, including earlier runs of the same checkpoint
+    """
+    if stale is None:
+        stale = DecisionSession.embedding_model.is_distinct_from(checkpoint.version)
+    last_id, embedded = checkpoint.load()
+    started, embedded_at_start = time.perf_counter(), embedded
+    while limit is None or embedded < limit:
+        query = (
+            select(DecisionSession.id)
+            .where(stale)
+            .order_by(DecisionSession.id)
+            .limit(pipeline.batch_size * concurrency)
+        )
+        if last_id is not None:
+            query = query.where(DecisionSession.id > last_id)
+        async with SessionLocal() as db:
+            session_ids = (await db.execute(query)).scalars().all()
+        if not session_ids:
+            break
+
+        batches = [
+            session_ids[start : start + pipeline.batch_size]
+            for start in range(0, len(session_ids), pipeline.batch_size)
+        ]
+        # A failed batch stops the run before the checkpoint moves past it
+        embedded += sum(await asyncio.gather(*(pipeline.embed_batch(batch) for batch in batches)))
+        last_id = session_ids[-1]
+        checkpoint.save(last_id, embedded)
+
+        rate = (embedded - embedded_at_start) / (time.perf_counter() - started)
+        print(f"embedded {embedded} sessions (last {last_id}, {rate:.0f}/s)")
+    return embedded
+
+
+async def main() -> None:
+    """Parse arguments and run the re-embedding."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--checkpoint", type=Path, default=Path(".reembed_checkpoint.json"))
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible embeddings endpoint")
+    parser.add_argument("--local", action="store_true", help="re-embed local embeddings")
+    args = parser.parse_args()
+
+    if args.restart:
+        args.checkpoint.unlink(missing_ok=True)
+    if args.local:
+        embedder: EmbeddingPipeline | LocalEmbedder = LocalEmbedder(args.batch_size)
+        checkpoint = Checkpoint(args.checkpoint, local_embedding_provider.version)
+        stale = LocalEmbedder.stale
+    else:
+        embedder = EmbeddingPipeline(
+            OpenAIClient(base_url=args.base_url), batch_size=args.batch_size
+        )
+        checkpoint = Checkpoint(args.checkpoint, settings.embedding_version)
+        stale = None
+    print(f"re-embedding sessions with {checkpoint.version}")
+    try:
+        embedded = await reembed(embedder, checkpoint, args.concurrency, args.limit, stale)
+    finally:
+        await engine.dispose()
+    print(f"done: {embedded} sessions embedded with {checkpoint.version}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
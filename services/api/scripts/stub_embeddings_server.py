@@ -0,0 +1,84 @@
+"""Local stand-in for the OpenAI embeddings endpoint.
+
+Serves ``POST /v1/embeddings`` with deterministic unit vectors derived from a
+hash of each input, with an optional artificial latency. Point
+OPENAI_BASE_URL or ``scripts.reembed_sessions --base-url`` at it to run
+embedding pipelines without API calls or costs; the vectors carry no meaning.
+
+Usage (from services/api):
+    python -m scripts.stub_embeddings_server [--port 8100] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import random
+import struct
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from src.core.config import settings
+
+app = FastAPI(title="Embeddings stand-in")
+latency_seconds = 0.0
+
+
+class EmbeddingRequest(BaseModel):
+    """Subset of the embeddings request used by OpenAIClient."""
+
+    input: str | list[str]
+    model: str
+    dimensions: int | None = None
+    encoding_format: str = "float"
+
+
+def stub_embedding(text: str, dimensions: int) -> list[float]:
+    """Deterministic unit vector for a text."""
+    rng = random.Random(hashlib.sha256(text.encode()).digest())
+    vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+    norm = sum(value * value for value in vector) ** 0.5
+    return [value / norm for value in vector]
+
+
+@app.post("/v1/embeddings")
+async def create_embeddings(request: EmbeddingRequest) -> dict[str, Any]:
+    """Embed the inputs like the OpenAI API does (float or base64 float32)."""
+    await asyncio.sleep(latency_seconds)
+    texts = [request.input] if isinstance(request.input, str) else request.input
+    dimensions = request.dimensions or settings.embedding_dimensions
+
+    data = []
+    for index, text in enumerate(texts):
+        embedding: Any = stub_embedding(text, dimensions)
+        if request.encoding_format == "base64":
+            embedding = base64.b64encode(struct.pack(f"<{dimensions}f", *embedding)).decode()
+        data.append({"object": "embedding", "index": index, "embedding": embedding})
+
+    tokens = sum(len(text.split()) for text in texts)
+    return {
+        "object": "list",
+        "data": data,
+        "model": request.model,
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+def main() -> None:
+    """Run the stand-in server."""
+    global latency_seconds
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    latency_seconds = args.latency_ms / 1000
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
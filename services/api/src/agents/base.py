@@ -1,11 +1,28 @@
 """Base agent interface for multi-agent system."""
 
+import hashlib
+import time
 from abc import ABC, abstractmethod
-from typing import Any
-
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from src.agents.prompt import (
+    FieldSpec,
+    estimate_tokens,
+    project,
+    render_prompt,
+    to_compact_json,
+)
+from src.agents.prompt_cache import get_cached_tokens, prompt_cache_stats
+from src.agents.token_limits import token_limiter
+from src.core.config import settings
 from src.core.logging import get_logger
 from src.schemas.agents import AgentInput, AgentOutput
-from src.services.openai_client import OpenAIClient
+from src.schemas.structured_output import json_schema_response_format, strict_json_schema
+
+if TYPE_CHECKING:
+    from src.services.openai_client import OpenAIClient
 
 logger = get_logger(__name__)
 
@@ -13,7 +30,16 @@ logger = get_logger(__name__)
 class Agent(ABC):
     """Base class for all decision processing agents."""
 
-    def __init__(self, openai_client: OpenAIClient, name: str) -> None:
+    # Context fields the agent needs, in priority order (None sends everything)
+    prompt_fields: dict[str, FieldSpec] | None = None
+    # Approximate prompt size above which low-priority fields are dropped
+    prompt_token_budget: int | None = None
+    # Pydantic model of the JSON the agent expects back from the LLM
+    output_schema: type[BaseModel] | None = None
+    # Bump whenever the static prompt changes, so cache telemetry is comparable
+    prompt_version: str = "1"
+
+    def __init__(self, openai_client: "OpenAIClient", name: str) -> None:
         """Initialize agent with OpenAI client.
 
         Args:
@@ -22,6 +48,7 @@ class Agent(ABC):
         """
         self.openai_client = openai_client
         self.name = name
+        self._static_prefixes: dict[tuple[str, str, bool], str] = {}
         logger.info("agent_initialized", agent_name=name)
 
     @abstractmethod
@@ -45,35 +72,149 @@ class Agent(ABC):
         """
         pass
 
+    def fallback_output(self, agent_input: AgentInput) -> dict[str, Any]:
+        """Template output used when the agent is skipped or misses its deadline.
+
+        Args:
+            agent_input: Standardized agent input
+
+        Returns:
+            Output metadata built without calling the LLM
+        """
+        return {}
+
     async def _call_llm(
         self,
         user_message: str,
         temperature: float = 0.7,
         max_tokens: int | None = None,
+        system_prompt: str | None = None,
+        call_name: str | None = None,
+        output_schema: type[BaseModel] | None = None,
     ) -> str:
         """Call LLM with agent's system prompt.
 
         Args:
             user_message: User message content
             temperature: Sampling temperature
-            max_tokens: Maximum tokens to generate
+            max_tokens: Maximum tokens to generate (initial value when adaptive
+                limits are enabled)
+            system_prompt: Optional override of the agent's system prompt
+            call_name: Identifier of this kind of call (defaults to agent name)
+            output_schema: Expected output model (defaults to the agent's schema)
 
         Returns:
             LLM response content
         """
+        call_name = call_name or self.name
+        if settings.adaptive_max_tokens_enabled:
+            max_tokens = token_limiter.limit_for(call_name, default=max_tokens)
+
+        output_schema = output_schema or self.output_schema
+
+        response_format = None
+        if output_schema is not None:
+            if settings.structured_outputs_enabled:
+                response_format = json_schema_response_format(output_schema)
+            else:
+                response_format = {"type": "json_object"}
+
+        # Static content first, request data last: the provider can reuse the
+        # cached prefix only if it is byte-identical between calls.
         messages = [
-            {"role": "system", "content": self.get_system_prompt()},
+            {
+                "role": "system",
+                "content": self._get_static_prefix(call_name, system_prompt, output_schema),
+            },
             {"role": "user", "content": user_message},
         ]
 
+        started = time.perf_counter()
         response = await self.openai_client.chat_completion(
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
+            response_format=response_format,
+            agent_name=self.name,
         )
+        wall_time = time.perf_counter() - started
+
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            if settings.adaptive_max_tokens_enabled:
+                token_limiter.observe(
+                    call_name,
+                    completion_tokens=usage.completion_tokens,
+                    truncated=response.choices[0].finish_reason == "length",
+                )
+            prompt_cache_stats.record(
+                call_name,
+                prompt_version=self.prompt_version,
+                prompt_tokens=usage.prompt_tokens,
+                cached_tokens=get_cached_tokens(usage),
+                wall_time_seconds=wall_time,
+            )
 
         return response.choices[0].message.content or ""
 
+    def _get_static_prefix(
+        self,
+        call_name: str,
+        system_prompt: str | None,
+        output_schema: type[BaseModel] | None,
+    ) -> str:
+        """Get the static system message for a call, built once per prompt version.
+
+        Args:
+            call_name: Identifier of this kind of call
+            system_prompt: Optional override of the agent's system prompt
+            output_schema: Expected output model
+
+        Returns:
+            System message content, identical for every call of this kind
+        """
+        key = (call_name, self.prompt_version, settings.structured_outputs_enabled)
+        prefix = self._static_prefixes.get(key)
+        if prefix is None:
+            prefix = system_prompt or self.get_system_prompt()
+            if output_schema is not None and not settings.structured_outputs_enabled:
+                # Without schema enforcement the model still needs to see the shape
+                prefix += "\n\nSchemat JSON odpowiedzi:\n" + to_compact_json(
+                    strict_json_schema(output_schema)
+                )
+            self._static_prefixes[key] = prefix
+        return prefix
+
+    def input_fingerprint(self, agent_input: AgentInput) -> str:
+        """Hash of everything the agent's output depends on.
+
+        Covers the prompt version, the content and the projection of the
+        context the agent actually sees, so unrelated context changes do not
+        change the fingerprint.
+
+        Args:
+            agent_input: Standardized agent input
+
+        Returns:
+            SHA-256 hex digest
+        """
+        if self.prompt_fields is None:
+            context = agent_input.context
+        else:
+            context = {
+                key: project(agent_input.context.get(key), spec)
+                for key, spec in self.prompt_fields.items()
+            }
+        payload = to_compact_json(
+            {
+                "agent": self.name,
+                "prompt_version": self.prompt_version,
+                "content": agent_input.content,
+                "context": context,
+            }
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     def _format_input(self, agent_input: AgentInput) -> str:
         """Format agent input into LLM prompt.
 
@@ -83,7 +224,20 @@ class Agent(ABC):
         Returns:
             Formatted prompt string
         """
-        context_str = "\n".join(
-            f"{key}: {value}" for key, value in agent_input.context.items()
+        prompt, dropped = render_prompt(
+            agent_input.content,
+            agent_input.context,
+            fields=self.prompt_fields,
+            token_budget=self.prompt_token_budget,
         )
-        return f"{agent_input.content}\n\nContext:\n{context_str}"
+
+        legacy_context = "\n".join(f"{key}: {value}" for key, value in agent_input.context.items())
+        logger.info(
+            "prompt_serialized",
+            agent_name=self.name,
+            tokens_before=estimate_tokens(f"{agent_input.content}\n\nContext:\n{legacy_context}"),
+            tokens_after=estimate_tokens(prompt),
+            dropped_fields=dropped,
+        )
+
+        return prompt
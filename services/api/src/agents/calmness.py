@@ -1,10 +1,18 @@
 """Calmness Agent: Detects stress and suggests calming actions."""
 
-import json
+from typing import Any
+
+from pydantic import ValidationError
 
 from src.agents.base import Agent
 from src.core.logging import get_logger
-from src.schemas.agents import AgentInput, AgentOutput, CalmStep, CalmStepType
+from src.schemas.agents import (
+    AgentInput,
+    AgentOutput,
+    CalmnessResult,
+    CalmStep,
+    CalmStepType,
+)
 
 logger = get_logger(__name__)
 
@@ -12,6 +20,13 @@ logger = get_logger(__name__)
 class CalmnessAgent(Agent):
     """Detects emotional overload and suggests appropriate calming actions."""
 
+    prompt_fields = {
+        "stress_level": None,
+        "intake_output": ("emotional_indicators", "decision_question", "time_sensitive"),
+    }
+    prompt_token_budget = 1000
+    output_schema = CalmnessResult
+
     def __init__(self, openai_client: any) -> None:
         """Initialize calmness agent."""
         super().__init__(openai_client, "CalmnessAgent")
@@ -36,17 +51,7 @@ Typy kroków uspokajających:
 - movement: Lekka aktywność fizyczna (5-10 min)
 - grounding: Ćwiczenia uziemiające (2-5 min)
 
-Zwróć JSON:
-{
-  "calm_step": {
-    "type": "breathing|break|journaling|movement|grounding",
-    "title": "Jasny, krótki tytuł (max 100 znaków)",
-    "description": "Konkretne instrukcje (max 500 znaków)",
-    "duration_minutes": 1-30
-  },
-  "stress_assessment": "Krótka ocena stanu emocjonalnego",
-  "reasoning": "Dlaczego ten krok uspokajający jest odpowiedni"
-}
+Zwróć wynik jako JSON zgodny ze schematem odpowiedzi. Tytuł kroku: max 100 znaków, opis: max 500 znaków, czas trwania: 1-30 minut.
 
 Bądź pełen współczucia, ale nie protekcjonalny. Skup się na natychmiastowych, praktycznych działaniach."""
 
@@ -66,37 +71,20 @@ Bądź pełen współczucia, ale nie protekcjonalny. Skup się na natychmiastowy
         response = await self._call_llm(prompt, temperature=0.7)
 
         try:
-            calmness_data = json.loads(response)
-            calm_step_dict = calmness_data.get("calm_step", {})
-
-            # Validate and create CalmStep
-            calm_step = CalmStep(
-                type=CalmStepType(calm_step_dict.get("type", "breathing")),
-                title=calm_step_dict.get("title", "Weź głęboki oddech"),
-                description=calm_step_dict.get(
-                    "description",
-                    "Wdech na 4 oddechy, wstrzymaj na 4, wydech na 4."
-                ),
-                duration_minutes=calm_step_dict.get("duration_minutes", 3),
-            )
+            result = CalmnessResult.model_validate_json(response)
 
             logger.info(
                 "uspokojenie_sukces",
-                typ_uspokojenia=calm_step.type,
-                czas_trwania=calm_step.duration_minutes,
+                typ_uspokojenia=result.calm_step.type,
+                czas_trwania=result.calm_step.duration_minutes,
             )
 
-            metadata = {
-                "calm_step": calm_step.model_dump(),
-                "stress_assessment": calmness_data.get("stress_assessment", ""),
-                "reasoning": calmness_data.get("reasoning", ""),
-            }
+            metadata = result.model_dump()
 
-        except (json.JSONDecodeError, ValueError) as e:
+        except ValidationError as e:
             logger.warning("uspokojenie_blad_parsowania", blad=str(e))
             # Fallback calm step based on stress level
-            calm_step = self._get_fallback_calm_step(stress_level)
-            metadata = {"calm_step": calm_step.model_dump()}
+            metadata = self.fallback_output(agent_input)
 
         return AgentOutput(
             content=response,
@@ -105,6 +93,11 @@ Bądź pełen współczucia, ale nie protekcjonalny. Skup się na natychmiastowy
             confidence=0.8,
         )
 
+    def fallback_output(self, agent_input: AgentInput) -> dict[str, Any]:
+        """Calm step chosen by stress level alone."""
+        stress_level = agent_input.context.get("stress_level", 5)
+        return {"calm_step": self._get_fallback_calm_step(stress_level).model_dump()}
+
     def _get_fallback_calm_step(self, stress_level: int) -> CalmStep:
         """Get fallback calm step based on stress level.
 
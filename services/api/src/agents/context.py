@@ -1,10 +1,12 @@
 """Context Agent: Asks 0-2 clarifying questions if needed."""
 
-import json
+from typing import Any
+
+from pydantic import ValidationError
 
 from src.agents.base import Agent
 from src.core.logging import get_logger
-from src.schemas.agents import AgentInput, AgentOutput
+from src.schemas.agents import AgentInput, AgentOutput, ContextResult
 
 logger = get_logger(__name__)
 
@@ -12,6 +14,19 @@ logger = get_logger(__name__)
 class ContextAgent(Agent):
     """Determines if clarifying questions are needed (0-2 max)."""
 
+    prompt_fields = {
+        "intake_output": (
+            "decision_question",
+            "options",
+            "constraints",
+            "time_sensitive",
+            "context_summary",
+        ),
+        "stress_level": None,
+    }
+    prompt_token_budget = 1200
+    output_schema = ContextResult
+
     def __init__(self, openai_client: any) -> None:
         """Initialize context agent."""
         super().__init__(openai_client, "ContextAgent")
@@ -30,20 +45,14 @@ WAŻNE:
 - Preferuj BRAK pytań, jeśli decyzja jest w miarę jasna
 - Skup się na: brakujących ograniczeniach, niejasnych opcjach, niejednoznacznych celach
 
-Zwróć JSON:
-{
-  "needs_clarification": true/false,
-  "questions": [
-    {
-      "question": "Jasne, konkretne pytanie",
-      "reasoning": "Dlaczego to pytanie jest krytyczne"
-    }
-  ],
-  "missing_info": ["Co brakuje"]
-}
+Zwróć wynik jako JSON zgodny ze schematem odpowiedzi.
 
 Domyślnie needs_clarification: false, chyba że coś naprawdę krytycznego jest niejasne."""
 
+    def fallback_output(self, agent_input: AgentInput) -> dict[str, Any]:
+        """No clarifying questions."""
+        return {"needs_clarification": False, "questions": [], "missing_info": []}
+
     async def process(self, agent_input: AgentInput) -> AgentOutput:
         """Process and determine if clarification is needed.
 
@@ -59,23 +68,22 @@ Domyślnie needs_clarification: false, chyba że coś naprawdę krytycznego jest
         response = await self._call_llm(prompt, temperature=0.3)
 
         try:
-            context_data = json.loads(response)
-            needs_clarification = context_data.get("needs_clarification", False)
-            questions = context_data.get("questions", [])
+            result = ContextResult.model_validate_json(response)
 
             # Enforce max 2 questions
-            if len(questions) > 2:
-                questions = questions[:2]
-                logger.warning("kontekst_za_duzo_pytan", oryginalna_liczba=len(questions))
+            if len(result.questions) > 2:
+                logger.warning("kontekst_za_duzo_pytan", oryginalna_liczba=len(result.questions))
+                result.questions = result.questions[:2]
 
+            context_data = result.model_dump()
             logger.info(
                 "kontekst_sukces",
-                wymaga_wyjasnienia=needs_clarification,
-                liczba_pytan=len(questions),
+                wymaga_wyjasnienia=result.needs_clarification,
+                liczba_pytan=len(result.questions),
             )
-        except json.JSONDecodeError:
+        except ValidationError:
             logger.warning("kontekst_blad_parsowania_json")
-            context_data = {"needs_clarification": False, "questions": []}
+            context_data = self.fallback_output(agent_input)
 
         return AgentOutput(
             content=response,
@@ -1,10 +1,12 @@
 """Intake Agent: Normalizes user input into structured schema."""
 
-import json
+from typing import Any
+
+from pydantic import ValidationError
 
 from src.agents.base import Agent
 from src.core.logging import get_logger
-from src.schemas.agents import AgentInput, AgentOutput
+from src.schemas.agents import AgentInput, AgentOutput, IntakeResult
 
 logger = get_logger(__name__)
 
@@ -12,6 +14,12 @@ logger = get_logger(__name__)
 class IntakeAgent(Agent):
     """Normalizes and structures user input for processing."""
 
+    # Stress level is left out on purpose: intake only structures the text,
+    # so edits of the stress level can reuse its output
+    prompt_fields = {"options": None}
+    prompt_token_budget = 1200
+    output_schema = IntakeResult
+
     def __init__(self, openai_client: any) -> None:
         """Initialize intake agent."""
         super().__init__(openai_client, "IntakeAgent")
@@ -31,18 +39,25 @@ Wyodrębnij i ustrukturyzuj:
 4. Wskaźniki stanu emocjonalnego
 5. Wrażliwość czasowa
 
-Zwróć obiekt JSON z następującymi polami:
-{
-  "decision_question": "Jasne sformułowanie decyzji",
-  "options": ["Opcja 1", "Opcja 2", ...],
-  "constraints": ["Ograniczenie 1", "Ograniczenie 2", ...],
-  "emotional_indicators": ["wskaźnik 1", "wskaźnik 2", ...],
-  "time_sensitive": true/false,
-  "context_summary": "Krótkie podsumowanie dodatkowego kontekstu"
-}
+Zwróć wynik jako JSON zgodny ze schematem odpowiedzi.
 
 Bądź obiektywny i nie oceniaj. Wyodrębniaj tylko to, co jest wyraźnie stwierdzone lub wyraźnie sugerowane."""
 
+    def fallback_output(self, agent_input: AgentInput) -> dict[str, Any]:
+        """Question and options taken from the user's text as-is."""
+        return {
+            "decision_question": agent_input.content[:200],
+            "options": [
+                option.strip()
+                for option in agent_input.context.get("options", "").split(",")
+                if option.strip()
+            ],
+            "constraints": [],
+            "emotional_indicators": [],
+            "time_sensitive": False,
+            "context_summary": "",
+        }
+
     async def process(self, agent_input: AgentInput) -> AgentOutput:
         """Process and normalize user input.
 
@@ -60,18 +75,15 @@ Bądź obiektywny i nie oceniaj. Wyodrębniaj tylko to, co jest wyraźnie stwier
         # Call LLM
         response = await self._call_llm(prompt, temperature=0.3)
 
-        # Parse JSON response
+        # Parse and validate JSON response
         try:
-            structured_data = json.loads(response)
-            logger.info("intake_sukces", pytanie_decyzyjne=structured_data.get("decision_question", "")[:100])
-        except json.JSONDecodeError:
+            structured_data = IntakeResult.model_validate_json(response).model_dump()
+            logger.info(
+                "intake_sukces", pytanie_decyzyjne=structured_data["decision_question"][:100]
+            )
+        except ValidationError:
             logger.warning("intake_blad_parsowania_json", odpowiedz=response[:200])
-            # Fallback to raw response
-            structured_data = {
-                "decision_question": agent_input.content[:200],
-                "options": agent_input.context.get("options", "").split(","),
-                "context_summary": response,
-            }
+            structured_data = self.fallback_output(agent_input)
 
         return AgentOutput(
             content=response,
@@ -1,17 +1,50 @@
 """Options Agent: Generates decision options with consequences."""
 
+import asyncio
 import json
+import re
+from typing import Any
+
+from pydantic import ValidationError
 
 from src.agents.base import Agent
+from src.core.config import settings
 from src.core.logging import get_logger
-from src.schemas.agents import AgentInput, AgentOutput, DecisionOption
+from src.schemas.agents import (
+    AgentInput,
+    AgentOutput,
+    DecisionOption,
+    OptionDescription,
+    OptionsEnvelope,
+    OptionsResult,
+)
 
 logger = get_logger(__name__)
 
+DEFAULT_CONTROL_QUESTION = "Co jest dla Ciebie najważniejsze w tej decyzji?"
+
+# Separators users put between options in free text
+OPTION_SEPARATOR_RE = re.compile(r"[,;\n]|\s+(?:albo|lub|czy)\s+")
+
 
 class OptionsAgent(Agent):
     """Generates 2-4 decision options with consequences and risks."""
 
+    prompt_fields = {
+        "intake_output": (
+            "decision_question",
+            "options",
+            "constraints",
+            "time_sensitive",
+            "emotional_indicators",
+            "context_summary",
+        ),
+        "stress_level": None,
+        "options": None,
+    }
+    prompt_token_budget = 1500
+    output_schema = OptionsResult
+
     def __init__(self, openai_client: any) -> None:
         """Initialize options agent."""
         super().__init__(openai_client, "OptionsAgent")
@@ -35,27 +68,24 @@ Wytyczne:
 - Oceniaj obciążenie emocjonalne uczciwie
 - Bądź zwięzły, ale kompletny
 
-Zwróć JSON:
-{
-  "options": [
-    {
-      "title": "Jasna nazwa opcji (max 200 znaków)",
-      "description": "Co oznacza ta opcja (max 1000 znaków)",
-      "consequences": [
-        "Konsekwencja 1",
-        "Konsekwencja 2",
-        "Konsekwencja 3"
-      ],
-      "emotional_risk": "Niskie|Średnie|Wysokie",
-      "confidence_level": 0.0-1.0
-    }
-  ],
-  "considerations": "Kluczowe czynniki do rozważenia dla wszystkich opcji",
-  "control_question": "Pytanie refleksyjne, które pomoże użytkownikowi myśleć głębiej"
-}
+Zwróć wynik jako JSON zgodny ze schematem odpowiedzi. Tytuł opcji: max 200 znaków, opis: max 1000 znaków, 1-5 konsekwencji, ryzyko emocjonalne: Niskie/Średnie/Wysokie, pewność: 0.0-1.0.
 
 Przedstawiaj opcje neutralnie. Nigdy nie rozkazuj ani nie przepisuj. To użytkownik wybiera."""
 
+    def get_option_system_prompt(self) -> str:
+        """Get system prompt for describing a single option in fan-out mode."""
+        return """Jesteś Agentem Opcji w systemie wsparcia decyzyjnego.
+
+Twoja rola polega na opisaniu JEDNEJ wskazanej opcji decyzyjnej z:
+1. Konkretnymi konsekwencjami (pozytywnymi i negatywnymi)
+2. Oceną ryzyka emocjonalnego (Niskie/Średnie/Wysokie)
+
+WAŻNE: Odpowiadaj WYŁĄCZNIE po polsku. Cała komunikacja z użytkownikiem musi być w języku polskim.
+
+Bądź obiektywny, zwięzły i nie oceniaj. Nigdy nie rozkazuj ani nie przepisuj.
+
+Zwróć wynik jako JSON zgodny ze schematem odpowiedzi."""
+
     async def process(self, agent_input: AgentInput) -> AgentOutput:
         """Process and generate decision options.
 
@@ -67,28 +97,22 @@ Przedstawiaj opcje neutralnie. Nigdy nie rozkazuj ani nie przepisuj. To użytkow
         """
         logger.info("przetwarzanie_opcji")
 
+        if settings.options_fan_out_enabled:
+            option_titles = self._get_intake_option_titles(agent_input)
+            if len(option_titles) >= 2:
+                return await self._process_fan_out(agent_input, option_titles)
+
         prompt = self._format_input(agent_input)
         response = await self._call_llm(prompt, temperature=0.7, max_tokens=1500)
 
         try:
-            options_data = json.loads(response)
-            options_list = options_data.get("options", [])
-
-            # Validate and create DecisionOption objects
-            decision_options = []
-            for opt_dict in options_list[:4]:  # Max 4 options
-                try:
-                    decision_option = DecisionOption(
-                        title=opt_dict.get("title", "Nieznana opcja"),
-                        description=opt_dict.get("description", ""),
-                        consequences=opt_dict.get("consequences", [])[:5],  # Max 5
-                        emotional_risk=opt_dict.get("emotional_risk", "Średnie"),
-                        confidence_level=opt_dict.get("confidence_level", 0.7),
-                    )
-                    decision_options.append(decision_option)
-                except ValueError as e:
-                    logger.warning("opcje_walidacja_niepowodzenie", blad=str(e))
-                    continue
+            result = OptionsEnvelope.model_validate_json(response)
+        except ValidationError as e:
+            logger.error("opcje_blad_parsowania", blad=str(e))
+            metadata = self.fallback_output(agent_input)
+        else:
+            fitted = (self._fit_option(raw) for raw in result.options)
+            decision_options = [option for option in fitted if option is not None][:4]
 
             # Ensure at least 2 options
             if len(decision_options) < 2:
@@ -99,25 +123,209 @@ Przedstawiaj opcje neutralnie. Nigdy nie rozkazuj ani nie przepisuj. To użytkow
 
             metadata = {
                 "options": [opt.model_dump() for opt in decision_options],
-                "considerations": options_data.get("considerations", ""),
-                "control_question": options_data.get(
-                    "control_question",
-                    "Co jest dla Ciebie najważniejsze w tej decyzji?"
-                ),
+                "considerations": result.considerations,
+                "control_question": result.control_question or DEFAULT_CONTROL_QUESTION,
             }
 
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.error("opcje_blad_parsowania", blad=str(e))
+        return AgentOutput(
+            content=response,
+            metadata=metadata,
+            agent_name=self.name,
+            confidence=0.75,
+        )
+
+    async def _process_fan_out(
+        self, agent_input: AgentInput, option_titles: list[str]
+    ) -> AgentOutput:
+        """Describe each intake option in a separate, concurrent LLM call.
+
+        Wall-clock time scales with the slowest option instead of the sum of
+        all of them; the control question comes from a template.
+
+        Args:
+            agent_input: Structured decision context
+            option_titles: Normalized option titles from the intake agent
+
+        Returns:
+            Decision options with consequences
+        """
+        logger.info("opcje_fan_out", liczba_opcji=len(option_titles))
+
+        prompt = self._format_input(agent_input)
+        results = await asyncio.gather(
+            *(self._generate_option(prompt, title) for title in option_titles)
+        )
+        described = [result for result in results if result is not None]
+        decision_options = [option for option, _ in described]
+        # Per-option considerations, merged into the single-call field
+        considerations = "\n".join(f"{option.title}: {text}" for option, text in described if text)
+
+        if len(decision_options) < 2:
+            logger.warning("opcje_niewystarczajace", liczba=len(decision_options))
             decision_options = self._get_fallback_options(agent_input)
-            metadata = {"options": [opt.model_dump() for opt in decision_options]}
+            considerations = ""
+
+        logger.info("opcje_sukces", liczba_opcji=len(decision_options))
+
+        metadata = {
+            "options": [opt.model_dump() for opt in decision_options],
+            "considerations": considerations,
+            "control_question": self._build_control_question(decision_options),
+        }
 
         return AgentOutput(
-            content=response,
+            content=json.dumps(metadata, ensure_ascii=False),
             metadata=metadata,
             agent_name=self.name,
             confidence=0.75,
         )
 
+    async def _generate_option(self, prompt: str, title: str) -> tuple[DecisionOption, str] | None:
+        """Generate description, consequences and considerations for a single option.
+
+        Args:
+            prompt: Formatted decision context shared by all options
+            title: Option title to describe
+
+        Returns:
+            Decision option and its considerations, or None if the response
+            could not be parsed
+        """
+        response = await self._call_llm(
+            f"{prompt}\n\nOpcja do opisania: {title}",
+            temperature=0.7,
+            max_tokens=settings.options_fan_out_max_tokens,
+            system_prompt=self.get_option_system_prompt(),
+            call_name=f"{self.name}.option",
+            output_schema=OptionDescription,
+        )
+
+        try:
+            described = OptionDescription.model_validate_json(response)
+        except ValidationError as e:
+            logger.warning("opcje_walidacja_niepowodzenie", opcja=title[:100], blad=str(e))
+            return None
+
+        option = self._fit_option(
+            {
+                "title": title,
+                "description": described.description or title,
+                "consequences": described.consequences,
+                "emotional_risk": described.emotional_risk,
+                "confidence_level": described.confidence_level,
+            }
+        )
+        if option is None:
+            return None
+        return option, described.considerations.strip()[:200]
+
+    @staticmethod
+    def _fit_option(raw: Any) -> DecisionOption | None:
+        """Fit an LLM option into the DecisionOption limits.
+
+        The strict schema cannot carry length, item and range limits, so
+        over-long texts and lists are truncated and the confidence is clamped.
+        An option that still fails validation is dropped on its own.
+
+        Args:
+            raw: Option as returned by the model
+
+        Returns:
+            Validated option, or None if it cannot be repaired
+        """
+        if not isinstance(raw, dict):
+            logger.warning("opcje_walidacja_niepowodzenie", blad="opcja nie jest obiektem")
+            return None
+
+        option = dict(raw)
+        for field, max_length in (("title", 200), ("description", 1000)):
+            if isinstance(option.get(field), str):
+                option[field] = option[field].strip()[:max_length]
+        if isinstance(option.get("consequences"), list):
+            option["consequences"] = option["consequences"][:5]  # Max 5
+        if isinstance(option.get("confidence_level"), int | float):
+            option["confidence_level"] = min(max(option["confidence_level"], 0.0), 1.0)
+
+        try:
+            return DecisionOption.model_validate(option)
+        except ValidationError as e:
+            logger.warning(
+                "opcje_walidacja_niepowodzenie", opcja=str(option.get("title"))[:100], blad=str(e)
+            )
+            return None
+
+    def _get_intake_option_titles(self, agent_input: AgentInput) -> list[str]:
+        """Extract normalized option titles from intake output.
+
+        Args:
+            agent_input: Structured decision context
+
+        Returns:
+            Up to 4 unique, non-empty option titles
+        """
+        intake_output: dict[str, Any] = agent_input.context.get("intake_output") or {}
+        raw_options = intake_output.get("options") or []
+
+        titles: list[str] = []
+        for raw in raw_options:
+            title = str(raw).strip()[:200]
+            if title and title not in titles:
+                titles.append(title)
+
+        return titles[:4]  # Max 4 options
+
+    def _build_control_question(self, decision_options: list[DecisionOption]) -> str:
+        """Build the control question from a template instead of an LLM call.
+
+        Args:
+            decision_options: Generated decision options
+
+        Returns:
+            Reflective question for the user
+        """
+        if len(decision_options) == 2:
+            question = (
+                f"Wyobraź sobie, że wybierasz „{decision_options[0].title}” zamiast "
+                f"„{decision_options[1].title}”. Co czujesz i co jest dla Ciebie najważniejsze?"
+            )
+            if len(question) <= 300:
+                return question
+
+        return DEFAULT_CONTROL_QUESTION
+
+    def fallback_output(self, agent_input: AgentInput) -> dict[str, Any]:
+        """Options built from the user's own option list and fixed templates."""
+        titles = (
+            self._get_intake_option_titles(agent_input)
+            or [
+                title.strip()[:200]
+                for title in OPTION_SEPARATOR_RE.split(agent_input.context.get("options", ""))
+                if title.strip()
+            ][:4]
+        )
+
+        if len(titles) < 2:
+            decision_options = self._get_fallback_options(agent_input)
+        else:
+            decision_options = [
+                DecisionOption(
+                    title=title,
+                    description=f"Opcja, którą rozważasz: {title}.",
+                    consequences=[
+                        "Zastanów się, co zyskujesz, wybierając tę opcję",
+                        "Zastanów się, z czego musisz zrezygnować",
+                    ],
+                    emotional_risk="Średnie",
+                    confidence_level=0.5,
+                )
+                for title in titles
+            ]
+
+        return {
+            "options": [opt.model_dump() for opt in decision_options],
+            "control_question": self._build_control_question(decision_options),
+        }
+
     def _get_fallback_options(self, agent_input: AgentInput) -> list[DecisionOption]:
         """Generate fallback options if parsing fails.
 
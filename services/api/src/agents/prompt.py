@@ -0,0 +1,135 @@
+"""Compact, token-budgeted serialization of agent prompt inputs."""
+
+import json
+import math
+from typing import Any
+
+# Rough average for mixed Polish/English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+# Projection spec: None keeps the whole value, a tuple keeps the listed keys,
+# a dict maps keys to nested specs. Lists are projected element-wise.
+FieldSpec = None | tuple[str, ...] | dict[str, Any]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count of a prompt fragment.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Approximate number of tokens
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def to_compact_json(value: Any) -> str:
+    """Serialize value to minified, deterministic JSON.
+
+    Args:
+        value: JSON-compatible value
+
+    Returns:
+        Minified JSON with sorted keys and unescaped unicode
+    """
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+        default=str,
+    )
+
+
+def project(value: Any, spec: FieldSpec) -> Any:
+    """Keep only the fields of value described by spec.
+
+    Args:
+        value: Value to project
+        spec: Projection spec
+
+    Returns:
+        Projected value
+    """
+    if spec is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, spec) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if isinstance(spec, tuple):
+        return {key: value[key] for key in spec if not _is_empty(value.get(key))}
+    return {
+        key: project(value[key], sub_spec)
+        for key, sub_spec in spec.items()
+        if not _is_empty(value.get(key))
+    }
+
+
+def render_value(value: Any) -> str:
+    """Render a single context value for a prompt.
+
+    Args:
+        value: Context value
+
+    Returns:
+        Plain text for scalars, minified JSON for containers
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict | list):
+        return to_compact_json(value)
+    return str(value)
+
+
+def render_prompt(
+    content: str,
+    context: dict[str, Any],
+    fields: dict[str, FieldSpec] | None = None,
+    token_budget: int | None = None,
+) -> tuple[str, list[str]]:
+    """Render agent input into a compact prompt within a token budget.
+
+    Fields are listed in priority order; when the prompt exceeds the budget,
+    fields are dropped from the end of the list. The content is never trimmed.
+
+    Args:
+        content: Main prompt content
+        context: Agent context values
+        fields: Ordered projection spec per context key (None keeps all keys)
+        token_budget: Optional maximum prompt size in tokens
+
+    Returns:
+        Rendered prompt and the list of context keys dropped to fit the budget
+    """
+    if fields is None:
+        fields = dict.fromkeys(context)
+
+    lines = [
+        f"{key}: {render_value(project(context[key], spec))}"
+        for key, spec in fields.items()
+        if not _is_empty(context.get(key))
+    ]
+    keys = [key for key in fields if not _is_empty(context.get(key))]
+
+    dropped: list[str] = []
+    prompt = _join(content, lines)
+    while token_budget is not None and lines and estimate_tokens(prompt) > token_budget:
+        lines.pop()
+        dropped.append(keys.pop())
+        prompt = _join(content, lines)
+
+    return prompt, dropped
+
+
+def _join(content: str, lines: list[str]) -> str:
+    """Join content and context lines into the final prompt."""
+    if not lines:
+        return content
+    return content + "\n\nContext:\n" + "\n".join(lines)
+
+
+def _is_empty(value: Any) -> bool:
+    """Check whether a value carries no information for the prompt."""
+    return value is None or value == "" or value == [] or value == {}
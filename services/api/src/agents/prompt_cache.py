@@ -0,0 +1,120 @@
+"""Prompt prefix cache telemetry per agent."""
+
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _AgentCacheCounters:
+    """Cumulative prompt cache counters for a single agent call."""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    hit_calls: int = 0
+    hit_seconds: float = 0.0
+    miss_seconds: float = 0.0
+
+    @property
+    def cached_ratio(self) -> float:
+        """Share of prompt tokens served from the provider's prefix cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    @property
+    def saved_seconds_per_hit(self) -> float | None:
+        """Average latency difference between cache misses and hits."""
+        miss_calls = self.calls - self.hit_calls
+        if not self.hit_calls or not miss_calls:
+            return None
+        return self.miss_seconds / miss_calls - self.hit_seconds / self.hit_calls
+
+
+class PromptCacheStats:
+    """Tracks cached prompt tokens and latency per agent and prompt version."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self._counters: dict[tuple[str, str], _AgentCacheCounters] = {}
+
+    def record(
+        self,
+        agent_name: str,
+        prompt_version: str,
+        prompt_tokens: int,
+        cached_tokens: int,
+        wall_time_seconds: float,
+    ) -> None:
+        """Record a completed LLM call.
+
+        Args:
+            agent_name: Agent (or agent call) identifier
+            prompt_version: Version of the agent's static prompt prefix
+            prompt_tokens: usage.prompt_tokens of the response
+            cached_tokens: usage.prompt_tokens_details.cached_tokens of the response
+            wall_time_seconds: Call duration
+        """
+        counters = self._counters.setdefault((agent_name, prompt_version), _AgentCacheCounters())
+        counters.calls += 1
+        counters.prompt_tokens += prompt_tokens
+        counters.cached_tokens += cached_tokens
+        if cached_tokens:
+            counters.hit_calls += 1
+            counters.hit_seconds += wall_time_seconds
+        else:
+            counters.miss_seconds += wall_time_seconds
+
+        logger.info(
+            "llm_prompt_cache",
+            agent_name=agent_name,
+            prompt_version=prompt_version,
+            prompt_tokens=prompt_tokens,
+            cached_tokens=cached_tokens,
+            cached_ratio_total=round(counters.cached_ratio, 3),
+            saved_seconds_per_hit=counters.saved_seconds_per_hit,
+        )
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Get cumulative counters for all agents.
+
+        Returns:
+            One entry per agent and prompt version
+        """
+        return [
+            {
+                "agent_name": agent_name,
+                "prompt_version": prompt_version,
+                "calls": counters.calls,
+                "prompt_tokens": counters.prompt_tokens,
+                "cached_tokens": counters.cached_tokens,
+                "cached_ratio": counters.cached_ratio,
+                "saved_seconds_per_hit": counters.saved_seconds_per_hit,
+            }
+            for (agent_name, prompt_version), counters in self._counters.items()
+        ]
+
+
+def get_cached_tokens(usage: Any) -> int:
+    """Extract cached prompt tokens from a completion usage object.
+
+    Args:
+        usage: Completion usage (object or dict, depending on SDK version)
+
+    Returns:
+        Number of cached prompt tokens, 0 if not reported
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is None and isinstance(usage, dict):
+        details = usage.get("prompt_tokens_details")
+    if details is None:
+        return 0
+    if isinstance(details, dict):
+        return int(details.get("cached_tokens") or 0)
+    return int(getattr(details, "cached_tokens", 0) or 0)
+
+
+# Global telemetry instance
+prompt_cache_stats = PromptCacheStats()
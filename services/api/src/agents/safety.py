@@ -1,11 +1,15 @@
 """Safety Agent: Validates content safety and ethical guidelines."""
 
 import re
+from typing import Any
+
+from pydantic import ValidationError
 
 from src.agents.base import Agent
+from src.agents.prompt import to_compact_json
 from src.core.errors import ContentSafetyException
 from src.core.logging import get_logger
-from src.schemas.agents import AgentInput, AgentOutput
+from src.schemas.agents import AgentInput, AgentOutput, SafetyResult
 
 logger = get_logger(__name__)
 
@@ -64,6 +68,16 @@ class SafetyAgent(Agent):
         r"\bjedyna słuszna\b",
     ]
 
+    prompt_fields = {
+        "output": {
+            "options": ("title", "description", "consequences", "emotional_risk"),
+            "control_question": None,
+        },
+        "calmness_output": {"calm_step": ("title", "description")},
+    }
+    prompt_token_budget = 2500
+    output_schema = SafetyResult
+
     def __init__(self, openai_client: any) -> None:
         """Initialize safety agent."""
         super().__init__(openai_client, "SafetyAgent")
@@ -85,33 +99,20 @@ Sprawdź:
 - Autorytarne rozkazy ("musisz", "powinieneś") → OZNACZ
 - Brakujące zastrzeżenia → DODAJ
 
-Zwróć JSON:
-{
-  "is_safe": true/false,
-  "blocked_reason": "Dlaczego treść została zablokowana (jeśli dotyczy)",
-  "tone_violations": ["Lista znalezionych fraz autorytarnych"],
-  "needs_disclaimer": true/false,
-  "recommended_action": "approve|block|revise"
-}
+Zwróć wynik jako JSON zgodny ze schematem odpowiedzi.
 
 Priorytet: Bezpieczeństwo użytkownika ponad wszystko. Bądź ostrożny."""
 
-    async def process(self, agent_input: AgentInput) -> AgentOutput:
-        """Validate content safety.
+    def screen_input(self, text: str) -> None:
+        """Screen user input for crisis keywords without calling the LLM.
 
         Args:
-            agent_input: Content to validate
-
-        Returns:
-            Safety validation results
+            text: User input
 
         Raises:
-            ContentSafetyException: If content is unsafe
+            ContentSafetyException: If a danger keyword is found
         """
-        logger.info("przetwarzanie_bezpieczenstwa")
-
-        # Check input for danger keywords
-        input_text = agent_input.content.lower()
+        input_text = text.lower()
         for keyword in self.DANGER_KEYWORDS:
             if keyword in input_text:
                 logger.warning("bezpieczenstwo_wykryto_zagrozenie", slowo_kluczowe=keyword)
@@ -124,13 +125,57 @@ Priorytet: Bezpieczeństwo użytkownika ponad wszystko. Bądź ostrożny."""
                     blocked_reason=f"Wykryto potencjalną treść o samookaleczeniu: {keyword}",
                 )
 
-        # Check for authoritarian tone in output
-        output_text = agent_input.context.get("output", "")
+    def fallback_output(self, agent_input: AgentInput) -> dict[str, Any]:
+        """Local checks only: crisis keywords (raises) and authoritarian tone.
+
+        Raises:
+            ContentSafetyException: If a danger keyword is found
+        """
+        self.screen_input(agent_input.content)
+        return {
+            "is_safe": True,
+            "tone_violations": self._find_tone_violations(agent_input),
+            "needs_disclaimer": True,
+            "safety_check_passed": False,
+        }
+
+    def _find_tone_violations(self, agent_input: AgentInput) -> list[str]:
+        """Find authoritarian phrases in the generated output.
+
+        Args:
+            agent_input: Safety input with the generated output in context
+
+        Returns:
+            Matched phrases
+        """
+        output = agent_input.context.get("output", "")
+        output_text = output if isinstance(output, str) else to_compact_json(output)
         tone_violations = []
         for pattern in self.AUTHORITARIAN_PATTERNS:
             matches = re.findall(pattern, output_text, re.IGNORECASE)
             if matches:
                 tone_violations.extend(matches)
+        return tone_violations
+
+    async def process(self, agent_input: AgentInput) -> AgentOutput:
+        """Validate content safety.
+
+        Args:
+            agent_input: Content to validate
+
+        Returns:
+            Safety validation results
+
+        Raises:
+            ContentSafetyException: If content is unsafe
+        """
+        logger.info("przetwarzanie_bezpieczenstwa")
+
+        # Check input for danger keywords
+        self.screen_input(agent_input.content)
+
+        # Check for authoritarian tone in output
+        tone_violations = self._find_tone_violations(agent_input)
 
         if tone_violations:
             logger.warning("bezpieczenstwo_naruszenie_tonu", naruszenia=tone_violations)
@@ -140,38 +185,28 @@ Priorytet: Bezpieczeństwo użytkownika ponad wszystko. Bądź ostrożny."""
         response = await self._call_llm(prompt, temperature=0.2)
 
         try:
-            import json
-            safety_data = json.loads(response)
-            is_safe = safety_data.get("is_safe", True)
-            blocked_reason = safety_data.get("blocked_reason", "")
-
-            if not is_safe:
-                logger.error("bezpieczenstwo_zablokowano", powod=blocked_reason)
+            safety_data = SafetyResult.model_validate_json(response)
+        except ValidationError as e:
+            logger.warning("bezpieczenstwo_blad_parsowania", blad=str(e))
+            metadata = self.fallback_output(agent_input)
+        else:
+            if not safety_data.is_safe:
+                logger.error("bezpieczenstwo_zablokowano", powod=safety_data.blocked_reason)
                 raise ContentSafetyException(
                     detail="Treść zablokowana ze względów bezpieczeństwa",
-                    blocked_reason=blocked_reason,
+                    blocked_reason=safety_data.blocked_reason,
                 )
 
             logger.info(
                 "bezpieczenstwo_zatwierdzono",
                 naruszenia_tonu=len(tone_violations),
-                wymaga_zastrzezenia=safety_data.get("needs_disclaimer", False),
+                wymaga_zastrzezenia=safety_data.needs_disclaimer,
             )
 
-            metadata = {
-                "is_safe": is_safe,
-                "tone_violations": tone_violations,
-                "needs_disclaimer": safety_data.get("needs_disclaimer", True),
-                "safety_check_passed": True,
-            }
-
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.warning("bezpieczenstwo_blad_parsowania", blad=str(e))
-            # Default to safe if parsing fails
             metadata = {
                 "is_safe": True,
                 "tone_violations": tone_violations,
-                "needs_disclaimer": True,
+                "needs_disclaimer": safety_data.needs_disclaimer,
                 "safety_check_passed": True,
             }
 
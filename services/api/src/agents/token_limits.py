@@ -0,0 +1,147 @@
+"""Adaptive per-agent completion limits learned from observed output lengths."""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _AgentWindow:
+    """Rolling window of observations for a single agent."""
+
+    completion_tokens: deque[int]
+    truncated: deque[bool]
+    truncation_count: int = 0
+    observation_count: int = 0
+    last_limit: int | None = field(default=None)
+
+
+class AdaptiveTokenLimiter:
+    """Learns each agent's max_tokens from a rolling window of completion lengths.
+
+    The limit is a high percentile of recent completion lengths plus headroom,
+    clamped to [floor, ceiling]. Completions cut off by the limit
+    (finish_reason == "length") are counted and raise the limit by a backoff
+    factor for as long as they stay in the window.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        percentile: float = 99.0,
+        headroom: float = 0.2,
+        floor: int = 128,
+        ceiling: int = 2000,
+        min_samples: int = 20,
+        backoff: float = 1.5,
+    ) -> None:
+        """Initialize limiter.
+
+        Args:
+            window: Number of recent completions kept per agent
+            percentile: Percentile of completion lengths used as the base limit
+            headroom: Fraction added on top of the percentile
+            floor: Minimum limit
+            ceiling: Maximum limit
+            min_samples: Observations required before the learned limit is used
+            backoff: Multiplier applied per truncated completion in the window
+        """
+        self.window = window
+        self.percentile = percentile
+        self.headroom = headroom
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.backoff = backoff
+        self._agents: dict[str, _AgentWindow] = {}
+
+    def limit_for(self, agent_name: str, default: int | None = None) -> int:
+        """Get the completion limit for the next call of an agent.
+
+        Args:
+            agent_name: Agent (or agent call) identifier
+            default: Limit used until enough observations are collected
+
+        Returns:
+            max_tokens for the next completion
+        """
+        agent = self._agents.get(agent_name)
+        if agent is None or len(agent.completion_tokens) < self.min_samples:
+            return min(default, self.ceiling) if default is not None else self.ceiling
+
+        base = _percentile(list(agent.completion_tokens), self.percentile)
+        limit = base * (1 + self.headroom) * self.backoff ** sum(agent.truncated)
+        limit = max(self.floor, min(self.ceiling, math.ceil(limit)))
+
+        if limit != agent.last_limit:
+            logger.info("adaptive_max_tokens_updated", agent_name=agent_name, max_tokens=limit)
+            agent.last_limit = limit
+
+        return limit
+
+    def observe(self, agent_name: str, completion_tokens: int, truncated: bool) -> None:
+        """Record a completed call.
+
+        Args:
+            agent_name: Agent (or agent call) identifier
+            completion_tokens: usage.completion_tokens of the response
+            truncated: Whether generation stopped because of max_tokens
+        """
+        agent = self._agents.setdefault(
+            agent_name,
+            _AgentWindow(
+                completion_tokens=deque(maxlen=self.window),
+                truncated=deque(maxlen=self.window),
+            ),
+        )
+        agent.completion_tokens.append(completion_tokens)
+        agent.truncated.append(truncated)
+        agent.observation_count += 1
+
+        if truncated:
+            agent.truncation_count += 1
+            logger.warning(
+                "llm_output_truncated",
+                agent_name=agent_name,
+                completion_tokens=completion_tokens,
+                truncation_count=agent.truncation_count,
+            )
+
+    def stats(self) -> dict[str, dict[str, int | None]]:
+        """Get per-agent observation and truncation counters.
+
+        Returns:
+            Mapping of agent name to counters and the last applied limit
+        """
+        return {
+            name: {
+                "observations": agent.observation_count,
+                "truncations": agent.truncation_count,
+                "max_tokens": agent.last_limit,
+            }
+            for name, agent in self._agents.items()
+        }
+
+
+def _percentile(values: list[int], percentile: float) -> int:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+# Global limiter instance
+token_limiter = AdaptiveTokenLimiter(
+    window=settings.adaptive_max_tokens_window,
+    percentile=settings.adaptive_max_tokens_percentile,
+    headroom=settings.adaptive_max_tokens_headroom,
+    floor=settings.adaptive_max_tokens_floor,
+    ceiling=settings.adaptive_max_tokens_ceiling,
+    min_samples=settings.adaptive_max_tokens_min_samples,
+    backoff=settings.adaptive_max_tokens_backoff,
+)
@@ -0,0 +1,59 @@
+"""Cancellation of request work when the HTTP client disconnects."""
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable
+from typing import TypeVar
+
+from fastapi import Request
+
+from src.core.config import settings
+from src.core.errors import ClientDisconnectedException
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+async def run_until_disconnected(
+    request: Request,
+    awaitable: Awaitable[T],
+    poll_interval: float | None = None,
+) -> T:
+    """Run awaitable as a task and cancel it if the client goes away.
+
+    Cancellation propagates into the task, so in-flight OpenAI requests are
+    aborted and no further agents are started.
+
+    Args:
+        request: Incoming HTTP request
+        awaitable: Work to run on behalf of the request
+        poll_interval: Seconds between disconnect checks
+
+    Returns:
+        Result of the awaitable
+
+    Raises:
+        ClientDisconnectedException: If the client disconnected before completion
+    """
+    poll_interval = poll_interval or settings.disconnect_poll_interval_seconds
+    task = asyncio.ensure_future(awaitable)
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+
+            if await request.is_disconnected():
+                logger.warning("client_disconnected", path=request.url.path)
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+                raise ClientDisconnectedException(
+                    detail="Klient zamknął połączenie, przetwarzanie zostało przerwane",
+                )
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
@@ -1,17 +1,39 @@
 """Decision session endpoints."""
 
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.errors import AppException, ContentSafetyException, NotFoundException
+from src.api.disconnect import run_until_disconnected
+from src.core.config import settings
+from src.core.errors import (
+    AppException,
+    ClientDisconnectedException,
+    ContentSafetyException,
+    NotFoundException,
+    ValidationException,
+)
 from src.core.logging import get_logger
 from src.db.base import get_db
+from src.db.session import SessionLocal
 from src.schemas.decision import (
+    BatchCreateDecisionSessionsRequest,
+    CountMode,
     CreateDecisionSessionRequest,
+    DecisionJobResponse,
     DecisionSessionResponse,
+    DecisionSessionSummary,
+    DraftDecisionRequest,
+    DraftDecisionResponse,
     ListDecisionSessionsResponse,
+    LLMUsageReport,
+    SessionView,
+    UpdateDecisionSessionRequest,
 )
 from src.services.decision_service import DecisionService
 from src.services.openai_client import openai_client
@@ -37,21 +59,46 @@ def get_decision_service(db: AsyncSession = Depends(get_db)) -> DecisionService:
     "/sessions",
     response_model=DecisionSessionResponse,
     status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": DecisionJobResponse, "description": "Queued for a worker"}},
 )
 async def create_decision_session(
     request: CreateDecisionSessionRequest,
+    http_request: Request,
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description="Client-generated key; retries with the same key return the original session",
+    ),
+    prefer: str | None = Header(
+        None,
+        alias="Prefer",
+        description="`respond-async` queues the session for a worker and returns 202 with a job",
+    ),
     service: DecisionService = Depends(get_decision_service),
-) -> DecisionSessionResponse:
+) -> DecisionSessionResponse | JSONResponse:
     """Create a new decision session.
 
     Process user's decision through multi-agent system and return Decision Brief.
+    Processing is cancelled if the client disconnects before it completes.
+    Retries carrying the same Idempotency-Key wait for or replay the original
+    session instead of running the agents again.
+
+    With ``Prefer: respond-async`` the request is written to the job queue and
+    processed by a worker (``python -m src.worker``). The response is 202 with
+    the job, whose status is available at the Location header URL; the
+    session is readable under ``session_id`` once the job has succeeded.
 
     Args:
         request: Decision context, options, and stress level
+        http_request: Raw HTTP request, watched for client disconnects
+        idempotency_key: Optional Idempotency-Key header
+        prefer: Optional Prefer header
         service: Decision service instance
 
     Returns:
-        Complete decision session with AI-generated brief
+        Complete decision session with AI-generated brief, or the queued job
 
     Raises:
         HTTPException: If content fails safety check or processing fails
@@ -61,26 +108,49 @@ async def create_decision_session(
             "api_create_session_request",
             stress_level=request.stress_level,
             context_length=len(request.context),
+            has_idempotency_key=idempotency_key is not None,
         )
 
-        session = await service.create_decision_session(request)
+        if prefer and "respond-async" in prefer:
+            job = await service.enqueue_decision_session(request, idempotency_key)
+            logger.info("api_create_session_queued", job_id=job.id)
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=job.model_dump(mode="json"),
+                headers={
+                    "Location": f"/v1/decision/jobs/{job.id}",
+                    "Preference-Applied": "respond-async",
+                },
+            )
+
+        session = await run_until_disconnected(
+            http_request, service.create_decision_session(request, idempotency_key)
+        )
 
         logger.info("api_create_session_success", session_id=session.id)
 
         return session
 
+    except ClientDisconnectedException as e:
+        # Nothing of the cancelled request may be committed
+        await service.db.rollback()
+        logger.warning("api_create_session_cancelled", outcome="cancelled")
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
     except ContentSafetyException as e:
         logger.warning("api_content_safety_blocked", reason=e.detail)
         raise HTTPException(
             status_code=e.status,
             detail=e.to_dict(),
-        )
+        ) from e
     except AppException as e:
         logger.error("api_create_session_error", error=e.detail)
         raise HTTPException(
             status_code=e.status,
             detail=e.to_dict(),
-        )
+        ) from e
     except Exception as e:
         logger.error("api_create_session_unexpected", error=str(e))
         raise HTTPException(
@@ -91,18 +161,117 @@ async def create_decision_session(
                 "status": 500,
                 "detail": "Wystąpił nieoczekiwany błąd",
             },
+        ) from e
+
+
+@router.post(
+    "/sessions/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def create_decision_sessions_batch(
+    batch: BatchCreateDecisionSessionsRequest,
+) -> StreamingResponse:
+    """Create many decision sessions in one request.
+
+    Items are processed with bounded concurrency. Results are streamed as
+    NDJSON, one line per item in completion order:
+    ``{"index": 0, "status": "created", "session": {...}}`` or
+    ``{"index": 1, "status": "error", "error": {...problem+json...}}``.
+    A failing item does not abort the batch.
+
+    Args:
+        batch: Items to process
+
+    Returns:
+        NDJSON stream of per-item results
+
+    Raises:
+        HTTPException: If the batch exceeds the maximum size
+    """
+    if len(batch.items) > settings.batch_max_items:
+        e = ValidationException(
+            detail=f"Partia może zawierać najwyżej {settings.batch_max_items} elementów",
+            field="items",
         )
+        raise HTTPException(status_code=e.status, detail=e.to_dict())
+
+    logger.info("api_batch_request", count=len(batch.items))
+
+    async def stream() -> AsyncIterator[str]:
+        # The request-scoped session is closed before the body is streamed
+        async with SessionLocal() as db:
+            service = DecisionService(db_session=db, openai_client=openai_client)
+            async for item in service.create_decision_sessions_batch(batch.items):
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/drafts", response_model=DraftDecisionResponse)
+async def prepare_draft(
+    request: DraftDecisionRequest,
+    service: DecisionService = Depends(get_decision_service),
+) -> DraftDecisionResponse:
+    """Pre-process a decision while the user is still filling in the form.
+
+    Runs the input safety screen and the intake agent speculatively. A later
+    POST /sessions with the same context and options reuses the intake output.
+    Clients should call this debounced, not on every keystroke.
+
+    Args:
+        request: Current context and options
+        service: Decision service instance
+
+    Returns:
+        Draft status
+
+    Raises:
+        HTTPException: If content fails safety check or processing fails
+    """
+    try:
+        logger.info("api_draft_request", context_length=len(request.context))
+        return await service.prepare_draft(request)
+
+    except ContentSafetyException as e:
+        logger.warning("api_content_safety_blocked", reason=e.detail)
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except AppException as e:
+        logger.error("api_draft_error", error=e.detail)
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except Exception as e:
+        logger.error("api_draft_unexpected", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Nie udało się przetworzyć szkicu",
+        ) from e
 
 
 @router.get("/sessions/{session_id}", response_model=DecisionSessionResponse)
 async def get_decision_session(
     session_id: UUID,
+    wait: float = Query(
+        0,
+        ge=0,
+        description="Seconds to wait for a session that is still being processed (long-poll)",
+    ),
     service: DecisionService = Depends(get_decision_service),
-) -> DecisionSessionResponse:
+) -> Response:
     """Get a decision session by ID.
 
+    With ``wait`` the request is held until the session is stored (e.g. by a
+    worker processing an async job) or the wait elapses, instead of the
+    client polling in a loop. Waits are capped at LONG_POLL_MAX_WAIT_SECONDS.
+
     Args:
         session_id: Session UUID
+        wait: Maximum seconds to wait for the session
         service: Decision service instance
 
     Returns:
@@ -112,41 +281,207 @@ async def get_decision_session(
         HTTPException: If session not found
     """
     try:
-        logger.info("api_get_session_request", session_id=session_id)
-        session = await service.get_decision_session(session_id)
-        return session
+        logger.info("api_get_session_request", session_id=session_id, wait=wait)
+        # Serialized by the service from stored JSON; skips response_model re-validation
+        content = await service.get_decision_session_json(
+            session_id, wait_seconds=min(wait, settings.long_poll_max_wait_seconds)
+        )
+        return Response(content=content, media_type="application/json")
 
     except NotFoundException as e:
         logger.warning("api_session_not_found", session_id=session_id)
         raise HTTPException(
             status_code=e.status,
             detail=e.to_dict(),
-        )
+        ) from e
     except Exception as e:
         logger.error("api_get_session_error", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Nie udało się pobrać sesji",
+        ) from e
+
+
+@router.get("/sessions/{session_id}/similar", response_model=list[DecisionSessionSummary])
+async def find_similar_sessions(
+    session_id: UUID,
+    limit: int = Query(5, ge=1, le=20, description="Maximum number of sessions"),
+    service: DecisionService = Depends(get_decision_service),
+) -> list[DecisionSessionSummary]:
+    """Find the user's past sessions most similar to a session.
+
+    Compares the local (hashed n-gram) embeddings stored with every session,
+    so the lookup needs no embeddings API call. Anonymous sessions have no
+    history and return an empty list.
+
+    Args:
+        session_id: Session UUID
+        limit: Maximum number of sessions
+        service: Decision service instance
+
+    Returns:
+        Session summaries, most similar first
+
+    Raises:
+        HTTPException: If session not found
+    """
+    try:
+        return await service.find_similar_sessions(session_id, limit=limit)
+
+    except NotFoundException as e:
+        logger.warning("api_session_not_found", session_id=session_id)
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except Exception as e:
+        logger.error("api_similar_sessions_error", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Nie udało się wyszukać podobnych sesji",
+        ) from e
+
+
+@router.get("/jobs/{job_id}", response_model=DecisionJobResponse)
+async def get_decision_job(
+    job_id: UUID,
+    service: DecisionService = Depends(get_decision_service),
+) -> DecisionJobResponse:
+    """Get the status of a queued decision job.
+
+    Args:
+        job_id: Job UUID
+        service: Decision service instance
+
+    Returns:
+        Job status; once it has succeeded, the session is available under session_id
+
+    Raises:
+        HTTPException: If job not found
+    """
+    try:
+        return await service.get_job(job_id)
+
+    except NotFoundException as e:
+        logger.warning("api_job_not_found", job_id=job_id)
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except Exception as e:
+        logger.error("api_get_job_error", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Nie udało się pobrać zadania",
+        ) from e
+
+
+@router.patch("/sessions/{session_id}", response_model=DecisionSessionResponse)
+async def update_decision_session(
+    session_id: UUID,
+    update: UpdateDecisionSessionRequest,
+    http_request: Request,
+    service: DecisionService = Depends(get_decision_service),
+) -> DecisionSessionResponse:
+    """Change the input of a decision session and re-evaluate it.
+
+    Only orchestration steps whose input changed are executed again; the
+    others reuse their stored outputs.
+
+    Args:
+        session_id: Session UUID
+        update: Changed context, options and/or stress level
+        http_request: Raw HTTP request, watched for client disconnects
+        service: Decision service instance
+
+    Returns:
+        Updated decision session
+
+    Raises:
+        HTTPException: If session not found, content fails safety check or processing fails
+    """
+    try:
+        logger.info(
+            "api_update_session_request",
+            session_id=session_id,
+            fields=sorted(update.model_dump(exclude_none=True)),
         )
 
+        session = await run_until_disconnected(
+            http_request, service.update_decision_session(session_id, update)
+        )
+
+        logger.info("api_update_session_success", session_id=session.id)
+
+        return session
+
+    except ClientDisconnectedException as e:
+        await service.db.rollback()
+        logger.warning("api_update_session_cancelled", outcome="cancelled")
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except NotFoundException as e:
+        logger.warning("api_session_not_found", session_id=session_id)
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except ContentSafetyException as e:
+        logger.warning("api_content_safety_blocked", reason=e.detail)
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except AppException as e:
+        logger.error("api_update_session_error", error=e.detail)
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
+    except Exception as e:
+        logger.error("api_update_session_unexpected", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Nie udało się zaktualizować sesji",
+        ) from e
+
 
 @router.get("/sessions", response_model=ListDecisionSessionsResponse)
 async def list_decision_sessions(
     user_id: str | None = Query(None, description="Filter by user ID"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored with cursor)"),
     page_size: int = Query(20, ge=1, le=100, description="Results per page"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    count: CountMode = Query("exact", description="How to compute total: exact, estimated or none"),
+    view: SessionView = Query(
+        "full", description="full sessions, or summary with only what a history list shows"
+    ),
     service: DecisionService = Depends(get_decision_service),
-) -> ListDecisionSessionsResponse:
+) -> Response:
     """List decision sessions with pagination.
 
+    Pass ``next_cursor`` back as ``cursor`` to get the next page; cursor pages
+    cost the same however deep into the history they are, unlike ``page``.
+    ``count=estimated`` or ``count=none`` avoid counting every session.
+    ``view=summary`` returns DecisionSessionSummary items, selecting only the
+    columns a history list needs.
+
     Args:
         user_id: Optional user ID filter
         page: Page number (1-indexed)
         page_size: Results per page
+        cursor: Keyset cursor of the next page
+        count: Total count mode
+        view: Item representation
         service: Decision service instance
 
     Returns:
         Paginated list of sessions
+
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     try:
         logger.info(
@@ -154,19 +489,61 @@ async def list_decision_sessions(
             user_id=user_id,
             page=page,
             page_size=page_size,
+            has_cursor=cursor is not None,
+            count=count,
+            view=view,
         )
 
-        sessions = await service.list_decision_sessions(
+        # Serialized by the service from stored JSON; skips response_model re-validation
+        content = await service.list_decision_sessions_json(
             user_id=user_id,
             page=page,
             page_size=page_size,
+            cursor=cursor,
+            count=count,
+            view=view,
         )
 
-        return sessions
+        return Response(content=content, media_type="application/json")
 
+    except AppException as e:
+        raise HTTPException(
+            status_code=e.status,
+            detail=e.to_dict(),
+        ) from e
     except Exception as e:
         logger.error("api_list_sessions_error", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Nie udało się pobrać listy sesji",
-        )
+        ) from e
+
+
+@router.get("/usage", response_model=LLMUsageReport)
+async def get_llm_usage(
+    since: datetime | None = Query(None, description="Start of period (inclusive)"),
+    until: datetime | None = Query(None, description="End of period (exclusive)"),
+    user_id: str | None = Query(None, description="Filter by user ID"),
+    service: DecisionService = Depends(get_decision_service),
+) -> LLMUsageReport:
+    """Aggregate LLM token usage, latency and retries per agent and model.
+
+    Args:
+        since: Start of period (inclusive)
+        until: End of period (exclusive)
+        user_id: Optional user ID filter
+        service: Decision service instance
+
+    Returns:
+        LLM usage report
+    """
+    try:
+        logger.info("api_llm_usage_request", since=since, until=until, user_id=user_id)
+        return await service.get_llm_usage(since=since, until=until, user_id=user_id)
+
+    except Exception as e:
+        logger.error("api_llm_usage_error", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Nie udało się pobrać użycia LLM",
+        ) from e
@@ -1,9 +1,9 @@
 """Application configuration using Pydantic v2 settings."""
 
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, Self
 
-from pydantic import Field, PostgresDsn, field_validator
+from pydantic import Field, PostgresDsn, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -36,8 +36,88 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(default="")
     openai_model: str = "gpt-4o-mini"
     openai_embedding_model: str = "text-embedding-3-small"
+    # Stored embedding size (text-embedding-3 models shorten vectors natively) and
+    # precision: vector (float32) or halfvec (float16); applied by migration 011.
+    # Indexed columns are capped by pgvector: 2000 for vector, 4000 for halfvec
+    embedding_dimensions: int = Field(default=1536, ge=1, le=4000)
+    embedding_storage: Literal["vector", "halfvec"] = "vector"
     openai_max_retries: int = 3
     openai_timeout: int = 60
+    # OpenAI-compatible endpoint instead of api.openai.com (e.g. a local stand-in)
+    openai_base_url: str | None = None
+
+    # Agents
+    structured_outputs_enabled: bool = True
+    options_fan_out_enabled: bool = False
+    options_fan_out_max_tokens: int = 400
+    context_compaction_enabled: bool = False
+    context_compaction_min_chars: int = 600
+    context_compaction_ratio: float = Field(default=0.6, gt=0.0, le=1.0)
+    draft_cache_ttl_seconds: int = 300
+    draft_cache_max_entries: int = 1000
+
+    # Adaptive completion limits (max_tokens learned from observed output lengths)
+    adaptive_max_tokens_enabled: bool = True
+    adaptive_max_tokens_window: int = 200
+    adaptive_max_tokens_percentile: float = 99.0
+    adaptive_max_tokens_headroom: float = 0.2
+    adaptive_max_tokens_floor: int = 128
+    adaptive_max_tokens_ceiling: int = 2000
+    adaptive_max_tokens_min_samples: int = 20
+    adaptive_max_tokens_backoff: float = 1.5
+
+    # Latency tiers (requests with max_latency_ms up to the limit run the tier's pipeline)
+    tier_fast_latency_ms: int = 3000
+    tier_reduced_latency_ms: int = 10000
+    # Time reserved after orchestration for persistence
+    tier_deadline_reserve_ms: int = 300
+
+    # Batch processing
+    batch_max_items: int = 500
+    batch_max_concurrency: int = 8
+    batch_insert_size: int = 20
+
+    # Job queue (POST /v1/decision/sessions with Prefer: respond-async)
+    job_visibility_timeout_seconds: int = 300
+    # Running jobs extend their lease this often (well below the visibility timeout)
+    job_heartbeat_interval_seconds: float = 60.0
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 10.0
+    worker_concurrency: int = 4
+    worker_poll_interval_seconds: float = 1.0
+
+    # Local CPU embeddings (hashed n-grams) for near-duplicate and history lookups;
+    # stored in decision_sessions.local_embedding (migration 013)
+    local_embedding_enabled: bool = True
+    local_embedding_dimensions: int = Field(default=256, ge=8, le=2000)
+    # Hash into this many features and project randomly to the dimensions (0 = hash directly)
+    local_embedding_projection_features: int = Field(default=0, ge=0)
+
+    # Vector index (pgvector); type and build parameters are applied by migration 010
+    vector_index_type: Literal["hnsw", "ivfflat"] = "hnsw"
+    hnsw_m: int = Field(default=16, ge=2, le=100)
+    hnsw_ef_construction: int = Field(default=64, ge=4, le=1000)
+    # Query-time search breadth, set per transaction in VectorStore.find_similar
+    hnsw_ef_search: int = Field(default=40, ge=1, le=1000)
+    ivfflat_probes: int = Field(default=10, ge=1)
+
+    # Background embeddings (batched after the session is committed)
+    embedding_batch_size: int = Field(default=64, ge=1, le=2048)
+    embedding_workers: int = Field(default=2, ge=1)
+    embedding_batch_linger_seconds: float = 0.05
+    embedding_queue_size: int = 10000
+    # Failed attempts after which the backfill stops retrying a session
+    embedding_max_attempts: int = Field(default=5, ge=1)
+
+    # Request handling
+    disconnect_poll_interval_seconds: float = 0.5
+    idempotency_retention_hours: int = Field(default=24, ge=1)
+    # A key whose request stored neither a session nor a job for this long is free again
+    idempotency_claim_timeout_seconds: int = Field(default=600, ge=1)
+    # How long a retry waits for the session of the request holding its key
+    idempotency_wait_seconds: float = Field(default=120, ge=0)
+    orchestration_coalescing_enabled: bool = True
+    long_poll_max_wait_seconds: int = Field(default=60, ge=0)
 
     # Redis (optional)
     redis_host: str = "localhost"
@@ -61,6 +141,18 @@ class Settings(BaseSettings):
     enable_vector_search: bool = True
     enable_observability: bool = False
 
+    @model_validator(mode="after")
+    def check_embedding_dimensions(self) -> Self:
+        """Reject embedding sizes the HNSW and IVFFlat indexes cannot hold."""
+        limit = 2000 if self.embedding_storage == "vector" else 4000
+        if self.embedding_dimensions > limit:
+            raise ValueError(
+                f"EMBEDDING_DIMENSIONS={self.embedding_dimensions} is too large for "
+                f"EMBEDDING_STORAGE={self.embedding_storage}: pgvector HNSW and IVFFlat "
+                "indexes hold at most 2000 dimensions for vector and 4000 for halfvec"
+            )
+        return self
+
     @property
     def allowed_origins_list(self) -> list[str]:
         """Get CORS origins as list."""
@@ -78,6 +170,11 @@ class Settings(BaseSettings):
         """Check if running in development."""
         return self.api_env == "development"
 
+    @property
+    def embedding_version(self) -> str:
+        """Tag of the vector space of new embeddings (model and dimensions)."""
+        return f"{self.openai_embedding_model}:{self.embedding_dimensions}"
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -113,3 +113,29 @@ class NotFoundException(AppException):
             resource_type=resource_type,
             **kwargs,
         )
+
+
+class ClientDisconnectedException(AppException):
+    """Klient zamknął połączenie przed zakończeniem przetwarzania."""
+
+    def __init__(self, detail: str, **kwargs: Any) -> None:
+        super().__init__(
+            title="Klient rozłączony",
+            detail=detail,
+            status=499,
+            type_uri="https://decisioncalm.ai/errors/client-disconnected",
+            **kwargs,
+        )
+
+
+class ConflictException(AppException):
+    """Żądanie jest sprzeczne z bieżącym stanem zasobu."""
+
+    def __init__(self, detail: str, **kwargs: Any) -> None:
+        super().__init__(
+            title="Konflikt",
+            detail=detail,
+            status=409,
+            type_uri="https://decisioncalm.ai/errors/conflict",
+            **kwargs,
+        )
@@ -0,0 +1,88 @@
+"""Per-request ledger of LLM calls: tokens, latency and retries per agent."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+_current_ledger: ContextVar["LLMLedger | None"] = ContextVar("llm_ledger", default=None)
+
+USAGE_FIELDS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_tokens",
+    "wall_time_ms",
+    "retries",
+)
+
+
+@dataclass
+class LLMCallRecord:
+    """A single LLM call."""
+
+    agent_name: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    wall_time_ms: float
+    retries: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert record to a plain dict."""
+        return asdict(self)
+
+
+class LLMLedger:
+    """Collects LLM calls made while the ledger is active.
+
+    The active ledger is stored in a context variable, so calls made from
+    tasks spawned inside ``activate()`` (e.g. ``asyncio.gather``) are
+    recorded in the same ledger.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty ledger."""
+        self.records: list[LLMCallRecord] = []
+
+    @contextmanager
+    def activate(self) -> Iterator["LLMLedger"]:
+        """Make this ledger the current one for the enclosed block."""
+        token = _current_ledger.set(self)
+        try:
+            yield self
+        finally:
+            _current_ledger.reset(token)
+
+    def record(self, record: LLMCallRecord) -> None:
+        """Add a call to the ledger.
+
+        Args:
+            record: Completed LLM call
+        """
+        self.records.append(record)
+
+    def summary(self) -> dict[str, Any]:
+        """Aggregate recorded calls in total and per agent.
+
+        Returns:
+            Totals plus a per-agent breakdown
+        """
+        agents: dict[str, dict[str, Any]] = {}
+        for record in self.records:
+            agent = agents.setdefault(
+                record.agent_name,
+                {"model": record.model, "calls": 0, **dict.fromkeys(USAGE_FIELDS, 0)},
+            )
+            agent["calls"] += 1
+            for field in USAGE_FIELDS:
+                agent[field] += getattr(record, field)
+
+        totals = {field: sum(agent[field] for agent in agents.values()) for field in USAGE_FIELDS}
+        return {"calls": len(self.records), **totals, "agents": agents}
+
+
+def current_ledger() -> LLMLedger | None:
+    """Get the ledger active in the current context, if any."""
+    return _current_ledger.get()
@@ -1,13 +1,15 @@
 """Database layer: models, sessions, vector store."""
 
 from src.db.base import Base, get_db
-from src.db.models import DecisionSession
+from src.db.models import DecisionJob, DecisionSession, LLMCall
 from src.db.session import SessionLocal, engine
 
 __all__ = [
     "Base",
     "get_db",
+    "DecisionJob",
     "DecisionSession",
+    "LLMCall",
     "SessionLocal",
     "engine",
 ]
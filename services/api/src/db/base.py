@@ -1,6 +1,6 @@
 """SQLAlchemy base configuration."""
 
-from typing import AsyncGenerator
+from collections.abc import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
@@ -17,6 +17,9 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session.
 
+    The request's writes are flushed by the services and committed here, once,
+    when the endpoint returns.
+
     Yields:
         Database session that auto-closes after request
     """
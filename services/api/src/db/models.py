@@ -4,12 +4,12 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from pgvector.sqlalchemy import Vector
-from sqlalchemy import JSON, DateTime, Float, Integer, String, Text
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.base import Base
+from src.db.types import embedding_type, local_embedding_type
 
 
 class DecisionSession(Base):
@@ -17,9 +17,7 @@ class DecisionSession(Base):
 
     __tablename__ = "decision_sessions"
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
@@ -28,7 +26,12 @@ class DecisionSession(Base):
     )
 
     # User tracking (anonymous)
-    user_id: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    user_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # Client-supplied Idempotency-Key of the creating request
+    idempotency_key: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, unique=True, index=True
+    )
 
     # Input data
     context: Mapped[str] = mapped_column(Text, nullable=False)
@@ -37,14 +40,138 @@ class DecisionSession(Base):
 
     # Output data (JSON for flexibility)
     decision_brief: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=True)
+    # Storage format version of decision_brief (None: written before versioning)
+    schema_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Input fingerprint and output per orchestration step, for incremental re-runs
+    agent_outputs: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
     # Metadata
     processing_time_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Requested and achieved latency tier (see ProcessingMetadata)
+    processing_metadata: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    llm_usage: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     tags: Mapped[list[str]] = mapped_column(JSON, default=list, nullable=False)
 
-    # Vector embedding for semantic search (1536 dimensions for text-embedding-3-small)
-    embedding: Mapped[Any] = mapped_column(Vector(1536), nullable=True)
+    # Vector embedding for semantic search; size and precision follow
+    # settings.embedding_dimensions / embedding_storage (migration 011).
+    # Deferred: only similarity queries need it, and it is the largest column.
+    embedding: Mapped[Any] = mapped_column(embedding_type(), nullable=True, deferred=True)
+    # Vector space of the embedding (settings.embedding_version); only
+    # embeddings of the active version are compared with each other
+    embedding_model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Failed background embedding attempts; the backfill skips sessions that
+    # reached settings.embedding_max_attempts
+    embedding_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Local hashed n-gram embedding (src.services.embedding_providers), computed
+    # on write; for near-duplicate and history lookups without API calls
+    local_embedding: Mapped[Any] = mapped_column(
+        local_embedding_type(), nullable=True, deferred=True
+    )
+    # Vector space of the local embedding (local_embedding_provider.version);
+    # only local embeddings of the active version are compared with each other
+    local_embedding_model: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
     def __repr__(self) -> str:
         """String representation."""
         return f"<DecisionSession(id={self.id}, created_at={self.created_at})>"
+
+
+# Serves a user's history newest first, including keyset pagination on (created_at, id),
+# and every other lookup by user_id (replaces the index of 001, migration 007)
+Index(
+    "ix_decision_sessions_user_id_created_at",
+    DecisionSession.user_id,
+    DecisionSession.created_at.desc(),
+    DecisionSession.id.desc(),
+)
+
+
+class LLMCall(Base):
+    """A single LLM call made while processing a decision session."""
+
+    __tablename__ = "llm_calls"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("decision_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True
+    )
+
+    agent_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    cached_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    wall_time_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    retries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<LLMCall(agent_name={self.agent_name}, session_id={self.session_id})>"
+
+
+class DecisionJob(Base):
+    """Queued decision processing job, executed by a worker process."""
+
+    __tablename__ = "decision_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    # Session created by the job, assigned up front so clients can poll it
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, unique=True)
+    idempotency_key: Mapped[str | None] = mapped_column(String(255), nullable=True, unique=True)
+
+    # CreateDecisionSessionRequest as JSON
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    # queued -> running -> succeeded | failed (running jobs past locked_until are reclaimed)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (Index("ix_decision_jobs_status_available_at", "status", "available_at"),)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<DecisionJob(id={self.id}, status={self.status})>"
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Key claimed by a request before it is processed.
+
+    Sync and queued requests share the key space, and the claim is committed
+    before the agents run, so a retry on any API process finds it.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
+    )
+    # Fingerprint of the request body; a retry must send the same request
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Session the request creates (for a queued request: the job's session)
+    session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    # Job of a queued request (None: processed synchronously)
+    job_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<IdempotencyKey(key={self.key}, session_id={self.session_id})>"
@@ -0,0 +1,116 @@
+"""Session completion notifications via PostgreSQL LISTEN/NOTIFY.
+
+Notifications are sent by the decision_sessions_notify_completed trigger
+(migration 009) for every inserted session, so PostgreSQL delivers them when
+the storing transaction commits and drops them on rollback.
+"""
+
+import asyncio
+from typing import Any
+
+import asyncpg
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SESSION_COMPLETED_CHANNEL = "decision_session_completed"
+
+
+class SessionNotifier:
+    """Wakes waiters when a decision session is committed by any process.
+
+    Each process holds a single dedicated connection listening on
+    SESSION_COMPLETED_CHANNEL, however many requests are waiting. The
+    connection is opened on first use; if it drops, all waiters are woken so
+    they re-check the database, and the next wait reconnects.
+    """
+
+    def __init__(self) -> None:
+        """Initialize notifier without connecting."""
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._waiters: dict[str, set[asyncio.Future[bool]]] = {}
+
+    async def start(self) -> None:
+        """Open the listener connection if it is not open yet."""
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            dsn = str(settings.database_url).replace("postgresql+asyncpg://", "postgresql://")
+            connection = await asyncpg.connect(dsn)
+            connection.add_termination_listener(self._on_terminated)
+            await connection.add_listener(SESSION_COMPLETED_CHANNEL, self._on_notification)
+            self._connection = connection
+            logger.info("session_notifier_listening", channel=SESSION_COMPLETED_CHANNEL)
+
+    async def close(self) -> None:
+        """Close the listener connection and wake all waiters."""
+        async with self._lock:
+            connection, self._connection = self._connection, None
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        self._wake_all()
+
+    def subscribe(self, session_id: Any) -> asyncio.Future[bool]:
+        """Register interest in a session before checking whether it exists.
+
+        Subscribing first means a commit between the check and the wait is not
+        missed. Pair every call with unsubscribe().
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Future resolved with True on notification, or False if the listener
+            connection was lost
+        """
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(str(session_id), set()).add(future)
+        return future
+
+    def unsubscribe(self, session_id: Any, future: asyncio.Future[bool]) -> None:
+        """Remove a waiter registered with subscribe().
+
+        Args:
+            session_id: Session ID
+            future: Future returned by subscribe()
+        """
+        key = str(session_id)
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+        waiters.discard(future)
+        if not waiters:
+            del self._waiters[key]
+
+    @property
+    def waiting(self) -> int:
+        """Number of sessions with at least one waiter."""
+        return len(self._waiters)
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """Resolve the waiters of the notified session."""
+        for future in self._waiters.pop(payload, ()):
+            if not future.done():
+                future.set_result(True)
+
+    def _on_terminated(self, connection: Any) -> None:
+        """Wake everyone: notifications may be lost until the next reconnect."""
+        logger.warning("session_notifier_disconnected", waiters=self.waiting)
+        if self._connection is connection:
+            self._connection = None
+        self._wake_all()
+
+    def _wake_all(self) -> None:
+        """Resolve every waiter with False."""
+        waiters, self._waiters = self._waiters, {}
+        for futures in waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(False)
+
+
+# Global notifier instance (one listener connection per process)
+session_notifier = SessionNotifier()
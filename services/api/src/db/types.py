@@ -0,0 +1,88 @@
+"""Column types of stored embeddings."""
+
+from collections.abc import Callable
+from typing import Any
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core.config import settings
+
+
+class HalfVector(Vector):
+    """pgvector ``halfvec`` column: 16-bit floats, half the size of ``vector``.
+
+    The text format and distance operators are the same as for ``vector``,
+    so values are bound and read like Vector values.
+    """
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw: Any) -> str:
+        """SQL type of the column."""
+        if self.dim is None:
+            return "HALFVEC"
+        return f"HALFVEC({self.dim})"
+
+
+def embedding_type() -> Vector:
+    """Column type for the configured embedding size and storage precision.
+
+    Returns:
+        vector(n) or halfvec(n), n = settings.embedding_dimensions
+    """
+    if settings.embedding_storage == "halfvec":
+        return HalfVector(settings.embedding_dimensions)
+    return Vector(settings.embedding_dimensions)
+
+
+def local_embedding_type() -> Vector:
+    """Column type of local (hashed n-gram) embeddings.
+
+    Returns:
+        vector(n), n = settings.local_embedding_dimensions
+    """
+    return Vector(settings.local_embedding_dimensions)
+
+
+# Vector columns whose database type is set by the settings in force when
+# their migration ran (011 and 013)
+EMBEDDING_COLUMNS: dict[str, Callable[[], Vector]] = {
+    "embedding": embedding_type,
+    "local_embedding": local_embedding_type,
+}
+
+
+async def verify_embedding_columns(conn: AsyncConnection) -> None:
+    """Check the vector columns in the database have the configured types.
+
+    Changing EMBEDDING_DIMENSIONS, EMBEDDING_STORAGE or
+    LOCAL_EMBEDDING_DIMENSIONS after the migrations ran does not alter the
+    columns, and every write and similarity query would then fail.
+
+    Args:
+        conn: Database connection
+
+    Raises:
+        RuntimeError: If a column has another type than the settings describe
+    """
+    rows = await conn.execute(
+        text(
+            "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = to_regclass('decision_sessions') "
+            "AND attname = ANY(:columns) AND NOT attisdropped"
+        ),
+        {"columns": list(EMBEDDING_COLUMNS)},
+    )
+    mismatches = {
+        name: (expected, actual)
+        for name, actual in rows
+        if actual != (expected := EMBEDDING_COLUMNS[name]().get_col_spec().lower())
+    }
+    if mismatches:
+        details = ", ".join(
+            f"{name} is {actual}, settings expect {expected}"
+            for name, (expected, actual) in mismatches.items()
+        )
+        raise RuntimeError(f"Embedding columns do not match the settings: {details}")
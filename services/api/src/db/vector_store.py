@@ -2,9 +2,10 @@
 
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
 from src.core.logging import get_logger
 from src.db.models import DecisionSession
 
@@ -22,55 +23,53 @@ class VectorStore:
         """
         self.session = session
 
-    async def store_embedding(
-        self, session_id: str, embedding: list[float]
-    ) -> None:
-        """Store embedding vector for a decision session.
-
-        Args:
-            session_id: UUID of the decision session
-            embedding: Vector embedding (1536 dimensions)
-        """
-        stmt = (
-            select(DecisionSession)
-            .where(DecisionSession.id == session_id)
-        )
-        result = await self.session.execute(stmt)
-        decision_session = result.scalar_one_or_none()
-
-        if decision_session:
-            decision_session.embedding = embedding
-            await self.session.commit()
-            logger.info("embedding_stored", session_id=session_id)
-
     async def find_similar(
         self,
         query_embedding: list[float],
         limit: int = 5,
         user_id: str | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[DecisionSession]:
         """Find similar decision sessions using cosine similarity.
 
         Args:
-            query_embedding: Query vector (1536 dimensions)
+            query_embedding: Query vector of the active embedding version
             limit: Maximum number of results
             user_id: Optional filter by user ID
+            ef_search: HNSW search breadth (defaults to settings, at least limit)
+            probes: IVFFlat lists searched (defaults to settings)
 
         Returns:
             List of similar decision sessions
         """
-        # Build query with vector similarity
+        # Search breadth is set for this transaction only, so pooled
+        # connections keep the server defaults
+        await self.session.execute(
+            text(
+                "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+                "set_config('ivfflat.probes', :probes, true)"
+            ),
+            {
+                "ef_search": str(max(ef_search or settings.hnsw_ef_search, limit)),
+                "probes": str(probes or settings.ivfflat_probes),
+            },
+        )
+
+        # Build query with vector similarity; embeddings of other models or
+        # sizes are not comparable with the query vector
         stmt = select(DecisionSession).where(
-            DecisionSession.embedding.isnot(None)
+            DecisionSession.embedding.isnot(None),
+            DecisionSession.embedding_model == settings.embedding_version,
         )
 
         if user_id:
             stmt = stmt.where(DecisionSession.user_id == user_id)
 
         # Order by cosine distance (L2 distance normalized)
-        stmt = stmt.order_by(
-            DecisionSession.embedding.cosine_distance(query_embedding)
-        ).limit(limit)
+        stmt = stmt.order_by(DecisionSession.embedding.cosine_distance(query_embedding)).limit(
+            limit
+        )
 
         result = await self.session.execute(stmt)
         similar_sessions = result.scalars().all()
@@ -1,7 +1,7 @@
 """FastAPI application entry point."""
 
+from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
@@ -11,7 +11,10 @@ from src.api.middleware import setup_middleware
 from src.api.v1 import api_router
 from src.core.config import settings
 from src.core.logging import configure_logging, get_logger
+from src.db.notifications import session_notifier
 from src.db.session import engine
+from src.db.types import verify_embedding_columns
+from src.services.embedding_pipeline import embedding_pipeline
 
 # Configure logging first
 configure_logging()
@@ -42,11 +45,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info("database_connected")
     except Exception as e:
         logger.error("database_connection_failed", error=str(e))
+    else:
+        async with engine.connect() as conn:
+            await verify_embedding_columns(conn)
+
+    # Embeds new sessions after commit and catches up on ones left without an embedding
+    await embedding_pipeline.start()
 
     yield
 
     # Shutdown
     logger.info("application_shutting_down")
+    await embedding_pipeline.stop()
+    await session_notifier.close()
     await engine.dispose()
     logger.info("database_connections_closed")
 
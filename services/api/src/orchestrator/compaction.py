@@ -0,0 +1,188 @@
+"""Local extractive compaction of long decision contexts.
+
+Shortens the user's context once per request so downstream agents receive
+fewer input tokens. Works without any LLM call: duplicate sentences are
+removed and the remaining ones are ranked by keyword overlap with the whole
+text and with the user's options.
+"""
+
+import math
+import re
+from collections import Counter
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+|\n+")
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Near-duplicate threshold (Jaccard similarity of keyword sets)
+DUPLICATE_SIMILARITY = 0.8
+
+STOPWORDS = frozenset(
+    {
+        # Polish
+        "ale",
+        "albo",
+        "bardzo",
+        "bez",
+        "bo",
+        "być",
+        "był",
+        "była",
+        "było",
+        "czy",
+        "dla",
+        "do",
+        "gdy",
+        "jak",
+        "jest",
+        "jestem",
+        "już",
+        "lub",
+        "mam",
+        "mnie",
+        "może",
+        "mój",
+        "moja",
+        "moje",
+        "nad",
+        "nie",
+        "oraz",
+        "po",
+        "pod",
+        "przez",
+        "przy",
+        "się",
+        "są",
+        "tak",
+        "także",
+        "tam",
+        "też",
+        "tego",
+        "teraz",
+        "to",
+        "tylko",
+        "tym",
+        "jego",
+        "jej",
+        "ich",
+        "które",
+        "który",
+        "która",
+        "więc",
+        "że",
+        "żeby",
+        "co",
+        "na",
+        "od",
+        "ze",
+        "za",
+        "i",
+        "a",
+        "w",
+        "z",
+        "o",
+        # English
+        "and",
+        "are",
+        "but",
+        "for",
+        "have",
+        "not",
+        "that",
+        "the",
+        "this",
+        "was",
+        "with",
+        "you",
+        "what",
+        "should",
+    }
+)
+
+
+def compact_context(
+    text: str,
+    options: str = "",
+    target_ratio: float = 0.6,
+    min_chars: int = 600,
+) -> str:
+    """Shorten a decision context by extracting its most salient sentences.
+
+    Args:
+        text: Original user context
+        options: User's options, used to boost sentences that mention them
+        target_ratio: Fraction of the original length to keep
+        min_chars: Texts shorter than this are returned unchanged
+
+    Returns:
+        Compacted context with sentences kept in their original order
+    """
+    text = text.strip()
+    if len(text) <= min_chars:
+        return text
+
+    sentences = _deduplicate(
+        [sentence.strip() for sentence in SENTENCE_SPLIT_RE.split(text) if sentence.strip()]
+    )
+    if len(sentences) <= 1:
+        return text
+
+    frequencies = Counter(word for sentence in sentences for word in keywords(sentence))
+    option_words = set(keywords(options))
+
+    def score(index: int) -> float:
+        words = set(keywords(sentences[index]))
+        if not words:
+            return 0.0
+        salience = sum(frequencies[word] for word in words) / math.sqrt(len(words))
+        overlap = len(words & option_words)
+        # The opening sentence and direct questions usually state the decision itself
+        position = 2.0 if index == 0 else 0.0
+        question = 1.0 if sentences[index].endswith("?") else 0.0
+        return salience + 2.0 * overlap + position + question
+
+    budget = max(min_chars, int(len(text) * target_ratio))
+    selected: list[int] = []
+    used = 0
+    for index in sorted(range(len(sentences)), key=score, reverse=True):
+        length = len(sentences[index]) + 1
+        if used + length > budget and selected:
+            continue
+        selected.append(index)
+        used += length
+
+    return " ".join(sentences[index] for index in sorted(selected))
+
+
+def keywords(text: str) -> list[str]:
+    """Extract lowercase content words from text.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Words of at least three characters that are not stopwords
+    """
+    return [
+        word
+        for word in WORD_RE.findall(text.lower())
+        if len(word) >= 3 and word not in STOPWORDS and not word.isdigit()
+    ]
+
+
+def _deduplicate(sentences: list[str]) -> list[str]:
+    """Drop exact and near-duplicate sentences, keeping the first occurrence.
+
+    Sentences without keywords (short or stopword-only) are always kept: they
+    have nothing to compare, so they are no duplicates of each other.
+    """
+    kept: list[str] = []
+    kept_words: list[set[str]] = []
+    for sentence in sentences:
+        words = set(keywords(sentence))
+        is_duplicate = bool(words) and any(
+            len(words & other) / len(words | other) >= DUPLICATE_SIMILARITY for other in kept_words
+        )
+        if not is_duplicate:
+            kept.append(sentence)
+            kept_words.append(words)
+    return kept
@@ -0,0 +1,74 @@
+"""Short-lived cache of agent outputs computed speculatively for drafts."""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from src.core.config import settings
+
+
+class StepOutputCache:
+    """In-memory TTL cache of step outputs keyed by agent input fingerprint.
+
+    Entries expire after ttl_seconds; when full, the least recently used
+    entry is evicted.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        """Initialize cache.
+
+        Args:
+            ttl_seconds: Lifetime of an entry
+            max_entries: Maximum number of entries kept
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, fingerprint: str) -> dict[str, Any] | None:
+        """Get a cached output.
+
+        Args:
+            fingerprint: Agent input fingerprint
+
+        Returns:
+            Cached output, or None if missing or expired
+        """
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            return None
+
+        expires_at, output = entry
+        if expires_at <= time.monotonic():
+            del self._entries[fingerprint]
+            return None
+
+        self._entries.move_to_end(fingerprint)
+        return output
+
+    def put(self, fingerprint: str, output: dict[str, Any]) -> None:
+        """Store an output.
+
+        Args:
+            fingerprint: Agent input fingerprint
+            output: Agent output metadata
+        """
+        self._entries[fingerprint] = (time.monotonic() + self.ttl_seconds, output)
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __contains__(self, fingerprint: str) -> bool:
+        """Check whether a live entry exists."""
+        return self.get(fingerprint) is not None
+
+
+# Global cache shared by draft pre-processing and the full pipeline
+draft_cache = StepOutputCache(
+    ttl_seconds=settings.draft_cache_ttl_seconds,
+    max_entries=settings.draft_cache_max_entries,
+)
@@ -1,19 +1,36 @@
 """Decision orchestrator using multi-agent graph."""
 
-from typing import Any
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, cast
 
 from src.agents import (
+    Agent,
     CalmnessAgent,
     ContextAgent,
     IntakeAgent,
     OptionsAgent,
     SafetyAgent,
 )
+from src.agents.prompt import estimate_tokens
+from src.core.config import settings
+from src.core.ledger import LLMLedger
 from src.core.logging import get_logger
+from src.orchestrator.compaction import compact_context
+from src.orchestrator.draft_cache import draft_cache
 from src.orchestrator.state import DecisionState
+from src.orchestrator.tiers import (
+    DEADLINE_EXEMPT_STEPS,
+    PIPELINE_VARIANTS,
+    STEPS,
+    resolve_tier,
+    step_timeout,
+)
 from src.schemas.agents import AgentInput, CalmStep, DecisionOption
 from src.schemas.decision import DecisionBrief, NextCheckIn
-from src.services.openai_client import OpenAIClient
+
+if TYPE_CHECKING:
+    from src.services.openai_client import OpenAIClient
 
 logger = get_logger(__name__)
 
@@ -21,7 +38,7 @@ logger = get_logger(__name__)
 class DecisionOrchestrator:
     """Orchestrates the multi-agent decision processing pipeline."""
 
-    def __init__(self, openai_client: OpenAIClient) -> None:
+    def __init__(self, openai_client: "OpenAIClient") -> None:
         """Initialize orchestrator with agents.
 
         Args:
@@ -44,6 +61,7 @@ class DecisionOrchestrator:
         options: str,
         stress_level: int,
         user_id: str | None = None,
+        ledger: LLMLedger | None = None,
     ) -> DecisionBrief:
         """Process a decision through the multi-agent pipeline.
 
@@ -52,6 +70,7 @@ class DecisionOrchestrator:
             options: User's available options
             stress_level: User's stress level (1-10)
             user_id: Optional user identifier
+            ledger: Optional ledger collecting the LLM calls of this decision
 
         Returns:
             Complete decision brief
@@ -59,15 +78,167 @@ class DecisionOrchestrator:
         Raises:
             ContentSafetyException: If content fails safety check
         """
+        decision_brief, _ = await self.evaluate(
+            context=context,
+            options=options,
+            stress_level=stress_level,
+            user_id=user_id,
+            ledger=ledger,
+        )
+        return decision_brief
+
+    async def evaluate(
+        self,
+        context: str,
+        options: str,
+        stress_level: int,
+        user_id: str | None = None,
+        ledger: LLMLedger | None = None,
+        previous_steps: dict[str, dict[str, Any]] | None = None,
+        tier: str | None = None,
+        max_latency_ms: int | None = None,
+    ) -> tuple[DecisionBrief, DecisionState]:
+        """Process a decision and return the final state along with the brief.
+
+        Steps whose input is unchanged since a previous run (same fingerprint
+        in previous_steps) reuse the stored output instead of calling the LLM.
+        The tier selects which steps call the LLM; with a latency budget each
+        step gets a deadline, and steps that miss it fall back to templates.
+
+        Args:
+            context: User's decision context
+            options: User's available options
+            stress_level: User's stress level (1-10)
+            user_id: Optional user identifier
+            ledger: Optional ledger collecting the LLM calls of this decision
+            previous_steps: Step results of an earlier run (DecisionState.step_results)
+            tier: Requested pipeline variant ("full", "reduced" or "fast")
+            max_latency_ms: Requested maximum processing time
+
+        Returns:
+            Complete decision brief and final state
+
+        Raises:
+            ContentSafetyException: If content fails safety check
+        """
+        tier, budget_ms = resolve_tier(tier, max_latency_ms)
+        deadline = None
+        if budget_ms is not None:
+            deadline = time.monotonic() + (budget_ms - settings.tier_deadline_reserve_ms) / 1000
+
         # Initialize state
         state = DecisionState(
             context=context,
             options=options,
             stress_level=stress_level,
             user_id=user_id,
+            previous_steps=previous_steps or {},
+            tier=tier,
+            max_latency_ms=budget_ms,
+            deadline=deadline,
         )
 
-        logger.info("orchestration_started", stress_level=stress_level)
+        logger.info(
+            "orchestration_started",
+            stress_level=stress_level,
+            incremental=bool(state.previous_steps),
+            tier=tier,
+            max_latency_ms=budget_ms,
+        )
+
+        ledger = ledger or LLMLedger()
+        try:
+            with ledger.activate():
+                state = await self._run_pipeline(state)
+        except asyncio.CancelledError:
+            logger.warning(
+                "orchestration_cancelled",
+                outcome="cancelled",
+                completed_steps=state.completed_steps,
+                current_step=state.current_step,
+                llm_calls=len(ledger.records),
+            )
+            raise
+        state.llm_usage = ledger.summary()
+
+        # Step 6: Assemble final decision brief
+        decision_brief = self._assemble_decision_brief(state)
+
+        logger.info(
+            "orchestration_completed",
+            option_count=len(decision_brief.options),
+            calm_type=decision_brief.calm_step.type,
+            reused_steps=state.reused_steps,
+            tier=state.tier,
+            skipped_steps=state.skipped_steps,
+            degraded_steps=state.degraded_steps,
+            llm_calls=state.llm_usage["calls"],
+            prompt_tokens=state.llm_usage["prompt_tokens"],
+            completion_tokens=state.llm_usage["completion_tokens"],
+        )
+
+        return decision_brief, state
+
+    async def prepare_draft(
+        self,
+        context: str,
+        options: str,
+        ledger: LLMLedger | None = None,
+    ) -> tuple[dict[str, Any], bool]:
+        """Speculatively screen and run intake for input the user is still typing.
+
+        The intake output is cached under its input fingerprint, so a later
+        submit with the same context and options skips the intake call.
+
+        Args:
+            context: User's decision context (possibly partial)
+            options: User's available options (possibly partial)
+            ledger: Optional ledger collecting the LLM calls of this draft
+
+        Returns:
+            Intake output and whether it was already cached
+
+        Raises:
+            ContentSafetyException: If content fails the input screen
+        """
+        # Intake does not depend on the stress level, so any valid value will do
+        state = DecisionState(context=context, options=options, stress_level=1)
+        if settings.context_compaction_enabled:
+            state = self._compact_context(state)
+
+        self.safety_agent.screen_input(f"{state.context}\n{state.options}")
+
+        agent_input = self._intake_input(state)
+        fingerprint = self.intake_agent.input_fingerprint(agent_input)
+        output = draft_cache.get(fingerprint)
+        if output is not None:
+            logger.info("draft_cache_hit")
+            return output, True
+
+        with (ledger or LLMLedger()).activate():
+            output = (await self.intake_agent.process(agent_input)).metadata
+        draft_cache.put(fingerprint, output)
+        logger.info("draft_prepared")
+
+        return output, False
+
+    async def _run_pipeline(self, state: DecisionState) -> DecisionState:
+        """Run all agents in order.
+
+        Args:
+            state: Initial decision state
+
+        Returns:
+            State with all agent outputs
+
+        Raises:
+            ContentSafetyException: If content fails safety check
+        """
+        if settings.context_compaction_enabled:
+            state = self._compact_context(state)
+
+        # Reject crisis content before spending any LLM calls
+        self.safety_agent.screen_input(f"{state.context}\n{state.options}")
 
         # Step 1: Intake Agent - Normalize input
         state = await self._run_intake(state)
@@ -84,16 +255,35 @@ class DecisionOrchestrator:
         # Step 5: Safety Agent - Validate everything
         state = await self._run_safety(state)
 
-        # Step 6: Assemble final decision brief
-        decision_brief = self._assemble_decision_brief(state)
+        return state
 
-        logger.info(
-            "orchestration_completed",
-            option_count=len(decision_brief.options),
-            calm_type=decision_brief.calm_step.type,
+    def _compact_context(self, state: DecisionState) -> DecisionState:
+        """Shorten long user context once for all downstream agents.
+
+        Args:
+            state: Current decision state
+
+        Returns:
+            Updated state
+        """
+        compacted = compact_context(
+            state.context,
+            options=state.options,
+            target_ratio=settings.context_compaction_ratio,
+            min_chars=settings.context_compaction_min_chars,
         )
 
-        return decision_brief
+        if len(compacted) < len(state.context):
+            state.compacted_context = compacted
+            logger.info(
+                "context_compacted",
+                chars_before=len(state.context),
+                chars_after=len(compacted),
+                tokens_before=estimate_tokens(state.context),
+                tokens_after=estimate_tokens(compacted),
+            )
+
+        return state
 
     async def _run_intake(self, state: DecisionState) -> DecisionState:
         """Run intake agent.
@@ -106,19 +296,29 @@ class DecisionOrchestrator:
         """
         logger.info("orchestration_step", step="intake")
 
-        agent_input = AgentInput(
-            content=state.context,
-            context={"options": state.options, "stress_level": state.stress_level},
-            agent_name="IntakeAgent",
+        state.intake_output = await self._run_agent(
+            state, "intake", self.intake_agent, self._intake_input(state)
         )
-
-        output = await self.intake_agent.process(agent_input)
-        state.intake_output = output.metadata
         state.completed_steps.append("intake")
         state.current_step = "context"
 
         return state
 
+    def _intake_input(self, state: DecisionState) -> AgentInput:
+        """Build intake agent input.
+
+        Args:
+            state: Current decision state
+
+        Returns:
+            Intake agent input
+        """
+        return AgentInput(
+            content=state.prompt_context,
+            context={"options": state.options},
+            agent_name="IntakeAgent",
+        )
+
     async def _run_context(self, state: DecisionState) -> DecisionState:
         """Run context agent.
 
@@ -131,7 +331,7 @@ class DecisionOrchestrator:
         logger.info("orchestration_step", step="context")
 
         agent_input = AgentInput(
-            content=state.context,
+            content=state.prompt_context,
             context={
                 "intake_output": state.intake_output,
                 "stress_level": state.stress_level,
@@ -139,8 +339,9 @@ class DecisionOrchestrator:
             agent_name="ContextAgent",
         )
 
-        output = await self.context_agent.process(agent_input)
-        state.context_output = output.metadata
+        state.context_output = await self._run_agent(
+            state, "context", self.context_agent, agent_input
+        )
         state.completed_steps.append("context")
         state.current_step = "calmness"
 
@@ -161,7 +362,7 @@ class DecisionOrchestrator:
         logger.info("orchestration_step", step="calmness")
 
         agent_input = AgentInput(
-            content=state.context,
+            content=state.prompt_context,
             context={
                 "stress_level": state.stress_level,
                 "intake_output": state.intake_output,
@@ -169,8 +370,9 @@ class DecisionOrchestrator:
             agent_name="CalmnessAgent",
         )
 
-        output = await self.calmness_agent.process(agent_input)
-        state.calmness_output = output.metadata
+        state.calmness_output = await self._run_agent(
+            state, "calmness", self.calmness_agent, agent_input
+        )
         state.completed_steps.append("calmness")
         state.current_step = "options"
 
@@ -188,7 +390,7 @@ class DecisionOrchestrator:
         logger.info("orchestration_step", step="options")
 
         agent_input = AgentInput(
-            content=state.context,
+            content=state.prompt_context,
             context={
                 "options": state.options,
                 "intake_output": state.intake_output,
@@ -197,8 +399,9 @@ class DecisionOrchestrator:
             agent_name="OptionsAgent",
         )
 
-        output = await self.options_agent.process(agent_input)
-        state.options_output = output.metadata
+        state.options_output = await self._run_agent(
+            state, "options", self.options_agent, agent_input
+        )
         state.completed_steps.append("options")
         state.current_step = "safety"
 
@@ -224,19 +427,91 @@ class DecisionOrchestrator:
         agent_input = AgentInput(
             content=combined_content,
             context={
-                "output": str(state.options_output),
-                "calmness_output": str(state.calmness_output),
+                "output": state.options_output,
+                "calmness_output": state.calmness_output,
             },
             agent_name="SafetyAgent",
         )
 
-        output = await self.safety_agent.process(agent_input)
-        state.safety_output = output.metadata
+        state.safety_output = await self._run_agent(state, "safety", self.safety_agent, agent_input)
         state.completed_steps.append("safety")
         state.current_step = "complete"
 
         return state
 
+    async def _run_agent(
+        self,
+        state: DecisionState,
+        step: str,
+        agent: Agent,
+        agent_input: AgentInput,
+    ) -> dict[str, Any]:
+        """Run an agent, or reuse its previous output if its input is unchanged.
+
+        Steps outside the tier's pipeline variant, and steps that miss their
+        deadline, return the agent's template output instead. Deadline-exempt
+        steps (safety) are never cut short.
+
+        Args:
+            state: Current decision state
+            step: Orchestration step name
+            agent: Agent executing the step
+            agent_input: Input of the step
+
+        Returns:
+            Agent output metadata
+        """
+        if step not in PIPELINE_VARIANTS[state.tier]:
+            state.skipped_steps.append(step)
+            logger.info("orchestration_step_skipped", step=step, tier=state.tier)
+            return agent.fallback_output(agent_input)
+
+        fingerprint = agent.input_fingerprint(agent_input)
+        previous = state.previous_steps.get(step)
+
+        if previous is not None and previous.get("fingerprint") == fingerprint:
+            output = cast(dict[str, Any], previous["output"])
+            state.reused_steps.append(step)
+            logger.info("orchestration_step_reused", step=step, source="session")
+        elif (cached := draft_cache.get(fingerprint)) is not None:
+            output = cached
+            state.reused_steps.append(step)
+            logger.info("orchestration_step_reused", step=step, source="draft")
+        else:
+            timeout = self._step_timeout(state, step)
+            try:
+                output = (await asyncio.wait_for(agent.process(agent_input), timeout)).metadata
+            except TimeoutError:
+                state.degraded_steps.append(step)
+                logger.warning(
+                    "orchestration_step_deadline_exceeded",
+                    step=step,
+                    tier=state.tier,
+                    timeout_seconds=timeout,
+                )
+                return agent.fallback_output(agent_input)
+
+        state.step_results[step] = {"fingerprint": fingerprint, "output": output}
+        return output
+
+    def _step_timeout(self, state: DecisionState, step: str) -> float | None:
+        """Deadline for a step, as its share of the remaining latency budget.
+
+        Args:
+            state: Current decision state
+            step: Step about to run
+
+        Returns:
+            Timeout in seconds, or None without a latency budget or for a
+            deadline-exempt step
+        """
+        if state.deadline is None or step in DEADLINE_EXEMPT_STEPS:
+            return None
+
+        variant = PIPELINE_VARIANTS[state.tier]
+        remaining_steps = [name for name in STEPS[STEPS.index(step) :] if name in variant]
+        return step_timeout(step, remaining_steps, state.deadline - time.monotonic())
+
     def _assemble_decision_brief(self, state: DecisionState) -> DecisionBrief:
         """Assemble final decision brief from agent outputs.
 
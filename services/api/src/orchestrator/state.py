@@ -14,6 +14,9 @@ class DecisionState(BaseModel):
     stress_level: int
     user_id: str | None = None
 
+    # Shortened context for downstream agents (safety always sees the original)
+    compacted_context: str | None = None
+
     # Agent outputs
     intake_output: dict[str, Any] = Field(default_factory=dict)
     context_output: dict[str, Any] = Field(default_factory=dict)
@@ -21,12 +24,34 @@ class DecisionState(BaseModel):
     options_output: dict[str, Any] = Field(default_factory=dict)
     safety_output: dict[str, Any] = Field(default_factory=dict)
 
+    # Pipeline variant and overall deadline (time.monotonic(), None for no deadline)
+    tier: str = "full"
+    max_latency_ms: int | None = None
+    deadline: float | None = None
+    # Steps answered from agent templates: not run in this tier, or past their deadline
+    skipped_steps: list[str] = Field(default_factory=list)
+    degraded_steps: list[str] = Field(default_factory=list)
+
+    # Per-step input fingerprint and output, persisted so a re-run can reuse them
+    step_results: dict[str, dict[str, Any]] = Field(default_factory=dict)
+    # step_results of an earlier run of the same session
+    previous_steps: dict[str, dict[str, Any]] = Field(default_factory=dict)
+    reused_steps: list[str] = Field(default_factory=list)
+
     # Final result
     decision_brief: dict[str, Any] | None = None
 
+    # Aggregated LLM usage (see LLMLedger.summary)
+    llm_usage: dict[str, Any] = Field(default_factory=dict)
+
     # Metadata
     processing_errors: list[str] = Field(default_factory=list)
     current_step: str = "intake"
     completed_steps: list[str] = Field(default_factory=list)
 
     model_config = {"arbitrary_types_allowed": True}
+
+    @property
+    def prompt_context(self) -> str:
+        """Context sent to agents: compacted if available, original otherwise."""
+        return self.compacted_context or self.context
@@ -0,0 +1,74 @@
+"""Latency tiers: pipeline variants and per-step deadlines."""
+
+from src.core.config import settings
+
+STEPS = ("intake", "context", "calmness", "options", "safety")
+
+# Steps that call the LLM in each tier; the others use agent templates.
+# Every variant generating options with the LLM also checks them with it:
+# the safety template only screens keywords.
+PIPELINE_VARIANTS: dict[str, tuple[str, ...]] = {
+    "full": STEPS,
+    "reduced": ("intake", "options", "safety"),
+    "fast": ("options", "safety"),
+}
+
+# Steps that always run to completion: the safety template only checks
+# keywords, so a slow safety check must not pass content unchecked
+DEADLINE_EXEMPT_STEPS = frozenset({"safety"})
+
+# Relative share of the remaining latency budget given to each step
+STEP_WEIGHTS: dict[str, float] = {
+    "intake": 1.0,
+    "context": 1.0,
+    "calmness": 1.0,
+    "options": 3.0,
+    "safety": 1.0,
+}
+
+
+def resolve_tier(tier: str | None, max_latency_ms: int | None) -> tuple[str, int | None]:
+    """Choose the pipeline variant and latency budget for a request.
+
+    An explicit tier wins; otherwise the tier is derived from max_latency_ms.
+    Without either, the full pipeline runs without deadlines.
+
+    Args:
+        tier: Requested tier ("full", "reduced" or "fast")
+        max_latency_ms: Requested maximum processing time
+
+    Returns:
+        Tier name and latency budget in milliseconds (None for no deadline)
+    """
+    if tier is None:
+        if max_latency_ms is None:
+            tier = "full"
+        elif max_latency_ms <= settings.tier_fast_latency_ms:
+            tier = "fast"
+        elif max_latency_ms <= settings.tier_reduced_latency_ms:
+            tier = "reduced"
+        else:
+            tier = "full"
+
+    if max_latency_ms is None:
+        max_latency_ms = {
+            "fast": settings.tier_fast_latency_ms,
+            "reduced": settings.tier_reduced_latency_ms,
+        }.get(tier)
+
+    return tier, max_latency_ms
+
+
+def step_timeout(step: str, remaining_steps: list[str], remaining_seconds: float) -> float:
+    """Deadline for a step: its weighted share of the remaining budget.
+
+    Args:
+        step: Step about to run
+        remaining_steps: LLM steps still to run, including step
+        remaining_seconds: Time left until the overall deadline
+
+    Returns:
+        Timeout in seconds (never negative)
+    """
+    total_weight = sum(STEP_WEIGHTS[name] for name in remaining_steps) or 1.0
+    return max(0.0, remaining_seconds * STEP_WEIGHTS[step] / total_weight)
@@ -8,11 +8,24 @@ from src.schemas.agents import (
     DecisionOption,
 )
 from src.schemas.decision import (
+    BatchCreateDecisionSessionsRequest,
+    CountMode,
     CreateDecisionSessionRequest,
     DecisionBrief,
+    DecisionJobResponse,
     DecisionSessionResponse,
+    DecisionSessionSummary,
+    DraftDecisionRequest,
+    DraftDecisionResponse,
+    JobStatus,
     ListDecisionSessionsResponse,
+    LLMUsageAggregate,
+    LLMUsageReport,
     NextCheckIn,
+    ProcessingMetadata,
+    ProcessingTier,
+    SessionView,
+    UpdateDecisionSessionRequest,
 )
 
 __all__ = [
@@ -21,9 +34,22 @@ __all__ = [
     "CalmStep",
     "CalmStepType",
     "DecisionOption",
+    "BatchCreateDecisionSessionsRequest",
+    "CountMode",
     "CreateDecisionSessionRequest",
     "DecisionBrief",
+    "DecisionJobResponse",
     "DecisionSessionResponse",
+    "DecisionSessionSummary",
+    "DraftDecisionRequest",
+    "DraftDecisionResponse",
     "ListDecisionSessionsResponse",
+    "LLMUsageAggregate",
+    "LLMUsageReport",
     "NextCheckIn",
+    "ProcessingMetadata",
+    "JobStatus",
+    "ProcessingTier",
+    "SessionView",
+    "UpdateDecisionSessionRequest",
 ]
@@ -1,7 +1,7 @@
 """Schemas for multi-agent system."""
 
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -21,7 +21,9 @@ class CalmStep(BaseModel):
 
     type: CalmStepType
     title: str = Field(..., min_length=1, max_length=100, description="Tytuł kroku uspokajającego")
-    description: str = Field(..., min_length=1, max_length=500, description="Opis kroku uspokajającego")
+    description: str = Field(
+        ..., min_length=1, max_length=500, description="Opis kroku uspokajającego"
+    )
     duration_minutes: int = Field(..., ge=1, le=30, description="Czas trwania w minutach")
 
 
@@ -29,8 +31,12 @@ class DecisionOption(BaseModel):
     """Opcja decyzyjna z konsekwencjami."""
 
     title: str = Field(..., min_length=1, max_length=200, description="Tytuł opcji decyzyjnej")
-    description: str = Field(..., min_length=1, max_length=1000, description="Opis opcji decyzyjnej")
-    consequences: list[str] = Field(..., min_items=1, max_items=5, description="Lista konsekwencji tej opcji")
+    description: str = Field(
+        ..., min_length=1, max_length=1000, description="Opis opcji decyzyjnej"
+    )
+    consequences: list[str] = Field(
+        ..., min_items=1, max_items=5, description="Lista konsekwencji tej opcji"
+    )
     emotional_risk: str = Field(
         ..., description="Ocena ryzyka emocjonalnego: Niskie/Średnie/Wysokie"
     )
@@ -54,3 +60,90 @@ class AgentOutput(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict, description="Metadane dodatkowe")
     agent_name: str = Field(..., description="Nazwa agenta")
     confidence: float = Field(default=1.0, ge=0.0, le=1.0, description="Pewność wyniku")
+
+
+# Structured LLM outputs: one model per agent, sent to the API as a strict JSON schema
+
+
+class IntakeResult(BaseModel):
+    """Ustrukturyzowane dane wejściowe z Agenta Przyjmującego."""
+
+    decision_question: str = Field(..., description="Jasne sformułowanie decyzji")
+    options: list[str] = Field(..., description="Dostępne opcje, każda jako osobny element")
+    constraints: list[str] = Field(..., description="Kluczowe ograniczenia lub wymagania")
+    emotional_indicators: list[str] = Field(..., description="Wskaźniki stanu emocjonalnego")
+    time_sensitive: bool = Field(..., description="Czy decyzja jest pilna")
+    context_summary: str = Field(..., description="Krótkie podsumowanie dodatkowego kontekstu")
+
+
+class ClarifyingQuestion(BaseModel):
+    """Pytanie wyjaśniające z uzasadnieniem."""
+
+    question: str = Field(..., description="Jasne, konkretne pytanie")
+    reasoning: str = Field(..., description="Dlaczego to pytanie jest krytyczne")
+
+
+class ContextResult(BaseModel):
+    """Wynik Agenta Kontekstu."""
+
+    needs_clarification: bool = Field(..., description="Czy brakuje krytycznych informacji")
+    questions: list[ClarifyingQuestion] = Field(..., description="0-2 pytania wyjaśniające")
+    missing_info: list[str] = Field(..., description="Czego brakuje")
+
+
+class CalmnessResult(BaseModel):
+    """Wynik Agenta Uspokajającego."""
+
+    calm_step: CalmStep
+    stress_assessment: str = Field(..., description="Krótka ocena stanu emocjonalnego")
+    reasoning: str = Field(..., description="Dlaczego ten krok uspokajający jest odpowiedni")
+
+
+class OptionsResult(BaseModel):
+    """Wynik Agenta Opcji."""
+
+    options: list[DecisionOption] = Field(..., description="2-4 opcje decyzyjne")
+    considerations: str = Field(
+        ..., description="Kluczowe czynniki do rozważenia dla wszystkich opcji"
+    )
+    control_question: str = Field(
+        ..., description="Pytanie refleksyjne, które pomoże użytkownikowi myśleć głębiej"
+    )
+
+
+class OptionsEnvelope(BaseModel):
+    """Odpowiedź Agenta Opcji przed walidacją poszczególnych opcji.
+
+    Limity DecisionOption nie trafiają do ścisłego schematu, więc opcje są
+    dopasowywane i walidowane pojedynczo.
+    """
+
+    options: list[Any] = Field(..., description="Opcje decyzyjne w surowej postaci")
+    considerations: str = Field(default="", description="Kluczowe czynniki do rozważenia")
+    control_question: str = Field(default="", description="Pytanie refleksyjne")
+
+
+class OptionDescription(BaseModel):
+    """Opis pojedynczej opcji (tryb równoległy Agenta Opcji)."""
+
+    description: str = Field(..., description="Co oznacza ta opcja (max 400 znaków)")
+    consequences: list[str] = Field(..., description="2-5 konsekwencji tej opcji")
+    emotional_risk: str = Field(
+        ..., description="Ocena ryzyka emocjonalnego: Niskie/Średnie/Wysokie"
+    )
+    confidence_level: float = Field(..., description="Pewność co do tej opcji (0.0-1.0)")
+    considerations: str = Field(
+        ..., description="Kluczowy czynnik do rozważenia przy tej opcji (max 200 znaków)"
+    )
+
+
+class SafetyResult(BaseModel):
+    """Wynik Agenta Bezpieczeństwa."""
+
+    is_safe: bool = Field(..., description="Czy treść jest bezpieczna")
+    blocked_reason: str = Field(
+        ..., description="Dlaczego treść została zablokowana (pusty, jeśli nie)"
+    )
+    tone_violations: list[str] = Field(..., description="Znalezione frazy autorytarne")
+    needs_disclaimer: bool = Field(..., description="Czy potrzebne jest zastrzeżenie")
+    recommended_action: Literal["approve", "block", "revise"]
@@ -1,12 +1,15 @@
 """Schemas for decision session endpoints."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 from src.schemas.agents import CalmStep, DecisionOption
 
+ProcessingTier = Literal["full", "reduced", "fast"]
+
 
 class CreateDecisionSessionRequest(BaseModel):
     """Żądanie utworzenia nowej sesji decyzyjnej (3 pytania)."""
@@ -35,6 +38,72 @@ class CreateDecisionSessionRequest(BaseModel):
         default=None,
         description="Opcjonalne anonimowe ID użytkownika do śledzenia historii",
     )
+    tier: ProcessingTier | None = Field(
+        default=None,
+        description=(
+            "Wariant przetwarzania: full (wszyscy agenci), reduced (mniej kroków), "
+            "fast (głównie szablony). Kontrola bezpieczeństwa działa w każdym wariancie. "
+            "Domyślnie wynika z max_latency_ms."
+        ),
+    )
+    max_latency_ms: int | None = Field(
+        default=None,
+        ge=500,
+        le=120000,
+        description=(
+            "Maksymalny czas przetwarzania; kroki, które go przekroczą, używają szablonów. "
+            "Kontrola bezpieczeństwa nie jest przerywana, więc może wydłużyć czas ponad budżet"
+        ),
+    )
+
+
+class BatchCreateDecisionSessionsRequest(BaseModel):
+    """Partia żądań sesji decyzyjnych (np. import ankiet)."""
+
+    items: list[CreateDecisionSessionRequest] = Field(
+        ..., min_length=1, description="Żądania do przetworzenia"
+    )
+
+
+class UpdateDecisionSessionRequest(BaseModel):
+    """Zmiana danych wejściowych istniejącej sesji decyzyjnej.
+
+    Pominięte pola zachowują dotychczasowe wartości.
+    """
+
+    context: str | None = Field(
+        default=None,
+        min_length=10,
+        max_length=2000,
+        description="Nowy opis decyzji",
+    )
+    options: str | None = Field(
+        default=None,
+        min_length=5,
+        max_length=1000,
+        description="Nowe opcje",
+    )
+    stress_level: int | None = Field(
+        default=None,
+        ge=1,
+        le=10,
+        description="Nowy poziom stresu (1-10)",
+    )
+
+
+class DraftDecisionRequest(BaseModel):
+    """Częściowo wypełniony formularz, wysyłany w trakcie pisania."""
+
+    context: str = Field(..., min_length=10, max_length=2000, description="Opis decyzji")
+    options: str = Field(..., min_length=5, max_length=1000, description="Rozważane opcje")
+
+
+class DraftDecisionResponse(BaseModel):
+    """Wynik wstępnego przetworzenia szkicu."""
+
+    ready: bool = Field(..., description="Czy wynik intake jest gotowy do użycia przy wysłaniu")
+    cached: bool = Field(..., description="Czy wynik pochodził z pamięci podręcznej")
+    expires_in_seconds: int = Field(..., description="Jak długo wynik pozostaje ważny")
 
 
 class NextCheckIn(BaseModel):
@@ -44,9 +113,7 @@ class NextCheckIn(BaseModel):
         ...,
         description="Sugestia w czytelnej formie (np. '30 minut', 'jutro rano')",
     )
-    reasoning: str = Field(
-        ..., description="Krótkie wyjaśnienie tego czasu", max_length=200
-    )
+    reasoning: str = Field(..., description="Krótkie wyjaśnienie tego czasu", max_length=200)
 
 
 class DecisionBrief(BaseModel):
@@ -67,6 +134,20 @@ class DecisionBrief(BaseModel):
     )
 
 
+class ProcessingMetadata(BaseModel):
+    """Jak sesja została przetworzona."""
+
+    tier: ProcessingTier = Field(..., description="Wariant przetwarzania, który został użyty")
+    max_latency_ms: int | None = Field(None, description="Budżet czasu przetwarzania")
+    degraded: bool = Field(..., description="Czy któryś krok przekroczył swój termin")
+    skipped_steps: list[str] = Field(
+        default_factory=list, description="Kroki zastąpione szablonami w tym wariancie"
+    )
+    degraded_steps: list[str] = Field(
+        default_factory=list, description="Kroki zastąpione szablonami po przekroczeniu terminu"
+    )
+
+
 class DecisionSessionResponse(BaseModel):
     """Odpowiedź dla zakończonej sesji decyzyjnej."""
 
@@ -77,15 +158,79 @@ class DecisionSessionResponse(BaseModel):
     output: DecisionBrief
     stress_level: int
     processing_time_seconds: float | None = None
+    processing: ProcessingMetadata | None = None
 
     class Config:
         from_attributes = True
 
 
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class DecisionJobResponse(BaseModel):
+    """Stan zadania przetwarzania asynchronicznego."""
+
+    id: UUID
+    status: JobStatus = Field(..., description="queued, running, succeeded lub failed")
+    session_id: UUID = Field(
+        ..., description="ID sesji, która zostanie utworzona po zakończeniu zadania"
+    )
+    attempts: int = Field(..., description="Liczba dotychczasowych prób")
+    created_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = Field(None, description="Błąd ostatniej próby")
+
+
+class DecisionSessionSummary(BaseModel):
+    """Skrócona sesja decyzyjna do listy historii (view=summary)."""
+
+    id: UUID
+    created_at: datetime
+    user_id: str | None
+    stress_level: int
+    context_preview: str = Field(..., description="Początek opisu decyzji")
+    option_count: int = Field(..., description="Liczba opcji w podsumowaniu")
+    calm_step_type: str = Field(..., description="Rodzaj kroku uspokajającego")
+
+
+CountMode = Literal["exact", "estimated", "none"]
+SessionView = Literal["full", "summary"]
+
+
 class ListDecisionSessionsResponse(BaseModel):
     """Stronicowana lista sesji decyzyjnych."""
 
-    sessions: list[DecisionSessionResponse]
-    total: int
+    sessions: list[DecisionSessionResponse | DecisionSessionSummary]
+    total: int | None = Field(..., description="Liczba sesji (None, gdy pominięto liczenie)")
+    total_estimated: bool = Field(
+        False, description="Czy total jest szacunkiem planisty zamiast dokładnej liczby"
+    )
     page: int = 1
     page_size: int = 20
+    next_cursor: str | None = Field(
+        None, description="Kursor następnej strony (None na ostatniej stronie)"
+    )
+
+
+class LLMUsageAggregate(BaseModel):
+    """Zagregowane użycie LLM dla jednego agenta i modelu."""
+
+    agent_name: str
+    model: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    retries: int
+    avg_wall_time_ms: float
+    max_wall_time_ms: float
+
+
+class LLMUsageReport(BaseModel):
+    """Raport użycia LLM (tokeny, opóźnienia, ponowienia) w wybranym okresie."""
+
+    since: datetime | None = None
+    until: datetime | None = None
+    user_id: str | None = None
+    session_count: int
+    agents: list[LLMUsageAggregate]
@@ -0,0 +1,59 @@
+"""Versioned storage format of decision briefs.
+
+Sessions store the brief as JSON together with the schema version it was
+written with. Briefs of the current version were validated when they were
+produced, so read endpoints serialize their stored JSON as-is. Older briefs
+are upgraded step by step and validated.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from src.schemas.decision import DecisionBrief
+
+# Bump whenever the stored shape of DecisionBrief changes, and add a migration
+BRIEF_SCHEMA_VERSION = 1
+
+
+def _upgrade_unversioned(data: dict[str, Any]) -> dict[str, Any]:
+    """Upgrade a brief stored before versioning (version 0) to version 1.
+
+    The shape is the same, but such rows were never tagged as trusted, so they
+    are validated after the upgrade like any migrated brief.
+    """
+    return data
+
+
+# Stored brief upgrades, keyed by the version they upgrade from
+BRIEF_MIGRATIONS: dict[int, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    0: _upgrade_unversioned,
+}
+
+
+def is_current(version: int | None) -> bool:
+    """Check whether a stored brief can be served without validation.
+
+    Args:
+        version: Schema version the brief was written with
+
+    Returns:
+        Whether the brief has the current storage format
+    """
+    return version == BRIEF_SCHEMA_VERSION
+
+
+def load_brief(data: dict[str, Any], version: int | None) -> DecisionBrief:
+    """Load a stored decision brief as a model.
+
+    Args:
+        data: Stored brief JSON
+        version: Schema version the brief was written with (None before versioning)
+
+    Returns:
+        Decision brief
+    """
+    version = version or 0
+    while version < BRIEF_SCHEMA_VERSION:
+        data = BRIEF_MIGRATIONS[version](data)
+        version += 1
+    return DecisionBrief.model_validate(data)
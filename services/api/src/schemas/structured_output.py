@@ -0,0 +1,77 @@
+"""Strict JSON schema response formats generated from pydantic models."""
+
+from typing import Any
+
+from pydantic import BaseModel
+
+# Validation keywords not accepted by strict structured outputs; the models
+# still enforce them when the response is parsed.
+UNSUPPORTED_KEYWORDS = frozenset(
+    {
+        "default",
+        "title",
+        "minLength",
+        "maxLength",
+        "minimum",
+        "maximum",
+        "minItems",
+        "maxItems",
+    }
+)
+
+
+def strict_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """Build a strict JSON schema for a pydantic model.
+
+    Every object forbids additional properties and requires all of its
+    properties, as strict structured outputs demand.
+
+    Args:
+        model: Pydantic model describing the expected output
+
+    Returns:
+        JSON schema dict
+    """
+    schema: dict[str, Any] = _make_strict(model.model_json_schema())
+    return schema
+
+
+def json_schema_response_format(model: type[BaseModel]) -> dict[str, Any]:
+    """Build the chat completion response_format for a pydantic model.
+
+    Args:
+        model: Pydantic model describing the expected output
+
+    Returns:
+        response_format payload with a strict JSON schema
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "strict": True,
+            "schema": strict_json_schema(model),
+        },
+    }
+
+
+def _make_strict(node: Any) -> Any:
+    """Recursively apply strict-mode rules to a JSON schema node."""
+    if isinstance(node, list):
+        return [_make_strict(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    strict = {
+        key: _make_strict(value)
+        for key, value in node.items()
+        if key not in UNSUPPORTED_KEYWORDS and key != "properties"
+    }
+    if "properties" in node:
+        # Property names are not keywords, so only their schemas are filtered
+        strict["properties"] = {
+            name: _make_strict(schema) for name, schema in node["properties"].items()
+        }
+        strict["required"] = list(node["properties"])
+        strict["additionalProperties"] = False
+    return strict
@@ -1,27 +1,175 @@
 """Decision service: Business logic for decision sessions."""
 
+import asyncio
+import base64
+import hashlib
+import json
 import time
-from uuid import UUID
+import unicodedata
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from pydantic_core import to_json
+from sqlalchemy import distinct, func, select, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
-from src.core.errors import NotFoundException
+from src.core.errors import (
+    AppException,
+    ConflictException,
+    NotFoundException,
+    ValidationException,
+)
+from src.core.ledger import LLMLedger
 from src.core.logging import get_logger
-from src.db.models import DecisionSession
+from src.db.models import DecisionJob, DecisionSession, IdempotencyKey, LLMCall
+from src.db.notifications import session_notifier
 from src.db.vector_store import VectorStore
-from src.orchestrator import DecisionOrchestrator
+from src.orchestrator import DecisionOrchestrator, DecisionState
 from src.schemas.decision import (
+    CountMode,
     CreateDecisionSessionRequest,
     DecisionBrief,
+    DecisionJobResponse,
     DecisionSessionResponse,
+    DecisionSessionSummary,
+    DraftDecisionRequest,
+    DraftDecisionResponse,
     ListDecisionSessionsResponse,
+    LLMUsageAggregate,
+    LLMUsageReport,
+    ProcessingMetadata,
+    ProcessingTier,
+    SessionView,
+    UpdateDecisionSessionRequest,
+)
+from src.schemas.storage import BRIEF_SCHEMA_VERSION, is_current, load_brief
+from src.services.embedding_pipeline import embedding_text, schedule_embeddings
+from src.services.embedding_providers import local_embedding_provider
+from src.services.idempotency import (
+    claim_idempotency_key,
+    release_idempotency_key,
+    request_fingerprint,
 )
+from src.services.job_queue import JobQueue, idempotency_cutoff, keep_lease
 from src.services.openai_client import OpenAIClient
+from src.services.single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
+# Orchestrator runs shared by concurrent requests with identical input
+_orchestrations: SingleFlight[tuple[DecisionBrief, DecisionState, LLMLedger]] = SingleFlight(
+    "orchestration"
+)
+
+
+def orchestration_key(request: CreateDecisionSessionRequest) -> str:
+    """Klucz współdzielenia orkiestracji dla identycznych żądań.
+
+    Tekst jest normalizowany (Unicode NFC, zwinięte białe znaki), więc żądania
+    różniące się jedynie formatowaniem dzielą jedno przetwarzanie. user_id nie
+    wpływa na wynik agentów i nie jest częścią klucza.
+
+    Args:
+        request: Żądanie sesji decyzyjnej
+
+    Returns:
+        Skrót SHA-256 znormalizowanego wejścia
+    """
+    parts = [
+        unicodedata.normalize("NFC", " ".join(text.split()))
+        for text in (request.context, request.options)
+    ]
+    payload = "\x1f".join(
+        [*parts, str(request.stress_level), str(request.tier), str(request.max_latency_ms)]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def processing_metadata(
+    state: DecisionState,
+    requested_tier: ProcessingTier | None,
+    requested_max_latency_ms: int | None,
+) -> dict[str, Any]:
+    """Metadane przetwarzania zapisywane z sesją.
+
+    Args:
+        state: Stan końcowy orkiestracji
+        requested_tier: Wariant wskazany w żądaniu
+        requested_max_latency_ms: Budżet czasu wskazany w żądaniu
+
+    Returns:
+        ProcessingMetadata wraz z parametrami żądania (do odtworzenia wejścia)
+    """
+    metadata = ProcessingMetadata(
+        tier=state.tier,
+        max_latency_ms=state.max_latency_ms,
+        degraded=bool(state.degraded_steps),
+        skipped_steps=state.skipped_steps,
+        degraded_steps=state.degraded_steps,
+    )
+    return {
+        **metadata.model_dump(),
+        "requested_tier": requested_tier,
+        "requested_max_latency_ms": requested_max_latency_ms,
+    }
+
+
+# Characters of the context shown in the history list
+CONTEXT_PREVIEW_LENGTH = 120
+
+# Columns of the history list view, computed in the database so that the full
+# context and decision brief are never transferred
+SUMMARY_COLUMNS = (
+    DecisionSession.id,
+    DecisionSession.created_at,
+    DecisionSession.user_id,
+    DecisionSession.stress_level,
+    # One extra character tells whether the preview was cut
+    func.substr(DecisionSession.context, 1, CONTEXT_PREVIEW_LENGTH + 1).label("context_preview"),
+    func.json_array_length(DecisionSession.decision_brief["options"]).label("option_count"),
+    DecisionSession.decision_brief[("calm_step", "type")].as_string().label("calm_step_type"),
+)
+
+
+def encode_cursor(created_at: datetime, session_id: UUID) -> str:
+    """Koduje pozycję ostatniej sesji strony jako nieprzezroczysty kursor.
+
+    Args:
+        created_at: Czas utworzenia ostatniej sesji
+        session_id: ID ostatniej sesji
+
+    Returns:
+        Kursor base64url
+    """
+    raw = f"{created_at.isoformat()}|{session_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Dekoduje kursor utworzony przez encode_cursor.
+
+    Args:
+        cursor: Kursor base64url
+
+    Returns:
+        Czas utworzenia i ID ostatniej sesji poprzedniej strony
+
+    Raises:
+        ValidationException: Jeśli kursor jest nieprawidłowy
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, session_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(session_id)
+    except ValueError as e:
+        raise ValidationException(
+            detail="Nieprawidłowy kursor stronicowania", field="cursor"
+        ) from e
+
 
 class DecisionService:
     """Obsługuje tworzenie i pobieranie sesji decyzyjnych."""
@@ -43,15 +191,372 @@ class DecisionService:
         self.vector_store = VectorStore(db_session)
 
     async def create_decision_session(
-        self, request: CreateDecisionSessionRequest
+        self,
+        request: CreateDecisionSessionRequest,
+        idempotency_key: str | None = None,
     ) -> DecisionSessionResponse:
         """Tworzy nową sesję decyzyjną.
 
+        Klucz idempotencji jest rezerwowany w bazie przed uruchomieniem
+        agentów i współdzielony z kolejką zadań. Ponowienie żądania (w dowolnym
+        procesie API) czeka na sesję oryginału, a ponowienie po jego
+        zakończeniu (w oknie retencji) zwraca zapisaną sesję bez ponownego
+        uruchamiania agentów.
+
         Args:
             request: Żądanie sesji decyzyjnej
+            idempotency_key: Opcjonalna wartość nagłówka Idempotency-Key
 
         Returns:
             Kompletna sesja decyzyjna z wynikami
+
+        Raises:
+            ConflictException: Jeśli klucz użyto wcześniej z innym żądaniem
+                albo sesja oryginału nie powstała w czasie oczekiwania
+        """
+        if idempotency_key is None:
+            return await self._create_decision_session(request)
+
+        session_id = uuid4()
+        claim = await claim_idempotency_key(idempotency_key, request, session_id)
+        if claim is None:
+            try:
+                return await self._create_decision_session(request, idempotency_key, session_id)
+            except BaseException:
+                await release_idempotency_key(idempotency_key, session_id)
+                raise
+
+        self._check_claim(claim, request)
+        session = await self._wait_for_session(claim.session_id, settings.idempotency_wait_seconds)
+        if session is None:
+            raise ConflictException(
+                detail="Żądanie z tym kluczem Idempotency-Key jest jeszcze przetwarzane",
+                session_id=str(claim.session_id),
+            )
+        logger.info("sesja_idempotentna_powtorzona", session_id=session.id)
+        return self._check_idempotent_replay(self._to_response(session), request)
+
+    async def _create_decision_session(
+        self,
+        request: CreateDecisionSessionRequest,
+        idempotency_key: str | None = None,
+        session_id: UUID | None = None,
+    ) -> DecisionSessionResponse:
+        """Uruchamia agentów i zapisuje nową sesję.
+
+        Args:
+            request: Żądanie sesji decyzyjnej
+            idempotency_key: Opcjonalny klucz idempotencji zapisywany z sesją
+            session_id: ID sesji zarezerwowane z kluczem (domyślnie nowe)
+
+        Returns:
+            Kompletna sesja decyzyjna z wynikami
+        """
+        session, ledger, decision_brief = await self._run_decision(request, idempotency_key)
+        if session_id is not None:
+            session.id = session_id
+        processing_time = session.processing_time_seconds
+
+        records = self._llm_call_rows(session, ledger)
+
+        # One unit of work: rows are flushed here, the request scope (get_db) commits
+        self.db.add(session)
+        self.db.add_all(records)
+        try:
+            await self.db.flush()
+        except IntegrityError:
+            if idempotency_key is None:
+                raise
+            await self.db.rollback()
+            existing = await self._find_by_idempotency_key(idempotency_key)
+            if existing is not None:
+                # Another worker stored a session with the same key first
+                logger.info("sesja_idempotentna_wyscig", session_id=existing.id)
+                return self._check_idempotent_replay(existing, request)
+
+            # The key belongs to a session past the retention window
+            await self._release_expired_idempotency_key(idempotency_key)
+            self.db.add(session)
+            self.db.add_all(records)
+            await self.db.flush()
+
+        # Embedded in the background once the request commits
+        schedule_embeddings(self.db, [session.id])
+
+        logger.info(
+            "sesja_decyzyjna_utworzona",
+            session_id=session.id,
+            processing_time=processing_time,
+        )
+
+        return DecisionSessionResponse(
+            id=session.id,
+            created_at=session.created_at,
+            user_id=session.user_id,
+            input=request,
+            output=decision_brief,
+            stress_level=request.stress_level,
+            processing_time_seconds=processing_time,
+            processing=ProcessingMetadata.model_validate(session.processing_metadata),
+        )
+
+    async def enqueue_decision_session(
+        self,
+        request: CreateDecisionSessionRequest,
+        idempotency_key: str | None = None,
+    ) -> DecisionJobResponse:
+        """Dodaje żądanie do kolejki zadań przetwarzanych przez worker.
+
+        Args:
+            request: Żądanie sesji decyzyjnej
+            idempotency_key: Opcjonalna wartość nagłówka Idempotency-Key
+
+        Returns:
+            Stan zadania (z ID sesji, którą zadanie utworzy)
+
+        Raises:
+            ConflictException: Jeśli klucz użyto wcześniej z innym żądaniem
+                albo z żądaniem synchronicznym
+        """
+        queue = JobQueue(self.db)
+        if idempotency_key is None:
+            return self._to_job_response(await queue.enqueue(request))
+
+        job_id, session_id = uuid4(), uuid4()
+        claim = await claim_idempotency_key(idempotency_key, request, session_id, job_id)
+        if claim is None:
+            try:
+                job = await queue.enqueue(request, idempotency_key, job_id, session_id)
+            except BaseException:
+                await release_idempotency_key(idempotency_key, session_id)
+                raise
+            # A job queued with the key before claims were stored
+            if CreateDecisionSessionRequest.model_validate(job.payload) != request:
+                raise ConflictException(
+                    detail="Klucz Idempotency-Key został już użyty z innym żądaniem",
+                    job_id=str(job.id),
+                )
+            return self._to_job_response(job)
+
+        self._check_claim(claim, request)
+        if claim.job_id is None:
+            raise ConflictException(
+                detail="Klucz Idempotency-Key został już użyty z żądaniem synchronicznym",
+                session_id=str(claim.session_id),
+            )
+        existing = await queue.get(claim.job_id)
+        if existing is None:
+            raise ConflictException(
+                detail="Żądanie z tym kluczem Idempotency-Key jest jeszcze przetwarzane",
+                job_id=str(claim.job_id),
+            )
+        logger.info("zadanie_idempotentne_powtorzone", job_id=existing.id)
+        return self._to_job_response(existing)
+
+    async def get_job(self, job_id: UUID) -> DecisionJobResponse:
+        """Pobiera stan zadania.
+
+        Args:
+            job_id: UUID zadania
+
+        Returns:
+            Stan zadania
+
+        Raises:
+            NotFoundException: Jeśli zadanie nie zostało znalezione
+        """
+        job = await JobQueue(self.db).get(job_id)
+        if job is None:
+            raise NotFoundException(
+                detail=f"Zadanie {job_id} nie zostało znalezione",
+                resource_type="DecisionJob",
+            )
+        return self._to_job_response(job)
+
+    async def process_job(self, job: DecisionJob) -> None:
+        """Wykonuje pobrane z kolejki zadanie i zapisuje jego sesję.
+
+        Sesja i oznaczenie zadania jako zakończonego są zapisywane w jednej
+        transakcji. Jeśli sesja istnieje (poprzednia próba zapisała ją, ale
+        nie zdążyła zakończyć zadania), agenci nie są uruchamiani ponownie.
+        Podczas pracy agentów dzierżawa zadania jest przedłużana; jeśli
+        zostanie utracona (zadanie przejęła inna próba), przetwarzanie jest
+        przerywane, a wynik nie jest zapisywany.
+
+        Args:
+            job: Zadanie pobrane przez JobQueue.claim
+        """
+        queue = JobQueue(self.db)
+        if await self.db.get(DecisionSession, job.session_id) is not None:
+            if await queue.complete(job.id, job.attempts):
+                await self.db.commit()
+            else:
+                await self.db.rollback()
+            return
+
+        request = CreateDecisionSessionRequest.model_validate(job.payload)
+        decision = asyncio.create_task(self._run_decision(request))
+        heartbeat = asyncio.create_task(keep_lease(job))
+        try:
+            await asyncio.wait({decision, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Cancels the agents only if the lease was lost (or the worker stops)
+            heartbeat.cancel()
+            decision.cancel()
+            await asyncio.gather(heartbeat, decision, return_exceptions=True)
+        if decision.cancelled():
+            logger.warning("zadanie_utracilo_dzierzawe", job_id=job.id, attempts=job.attempts)
+            return
+        session, ledger, _ = decision.result()
+
+        # Locks the job row: a competing attempt can neither complete nor reclaim it
+        if not await queue.complete(job.id, job.attempts):
+            await self.db.rollback()
+            logger.warning("zadanie_utracilo_dzierzawe", job_id=job.id, attempts=job.attempts)
+            return
+
+        session.id = job.session_id
+        self.db.add(session)
+        self.db.add_all(self._llm_call_rows(session, ledger))
+        schedule_embeddings(self.db, [session.id])
+        await self.db.commit()
+
+        logger.info(
+            "zadanie_zakonczone",
+            job_id=job.id,
+            session_id=session.id,
+            processing_time=session.processing_time_seconds,
+        )
+
+    async def create_decision_sessions_batch(
+        self, requests: list[CreateDecisionSessionRequest]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Przetwarza wiele żądań z ograniczoną współbieżnością.
+
+        Wyniki są zwracane w kolejności ukończenia. Sesje, które ukończyły się
+        w tym samym czasie, są zapisywane razem w jednej transakcji. Błąd
+        pojedynczego elementu nie przerywa całej partii.
+
+        Args:
+            requests: Żądania sesji decyzyjnych
+
+        Yields:
+            Wynik dla każdego elementu: index, status oraz session lub error
+        """
+        semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+        finished: asyncio.Queue[tuple[int, Any]] = asyncio.Queue()
+
+        async def run(index: int, request: CreateDecisionSessionRequest) -> None:
+            async with semaphore:
+                outcome: tuple[DecisionSession, LLMLedger, DecisionBrief] | Exception
+                try:
+                    outcome = await self._run_decision(request)
+                except Exception as e:
+                    outcome = e
+            await finished.put((index, outcome))
+
+        logger.info("partia_sesji_rozpoczeta", count=len(requests))
+        tasks = [asyncio.create_task(run(index, request)) for index, request in enumerate(requests)]
+
+        try:
+            remaining = len(requests)
+            while remaining:
+                chunk = [await finished.get()]
+                while len(chunk) < settings.batch_insert_size and not finished.empty():
+                    chunk.append(finished.get_nowait())
+                remaining -= len(chunk)
+
+                for item in await self._persist_batch_chunk(chunk):
+                    yield item
+        finally:
+            # Stop outstanding work if the client went away
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info("partia_sesji_zakonczona", count=len(requests))
+
+    async def _persist_batch_chunk(self, chunk: list[tuple[int, Any]]) -> list[dict[str, Any]]:
+        """Zapisuje ukończone elementy partii w jednej transakcji.
+
+        Args:
+            chunk: Pary (indeks, wynik _run_decision lub wyjątek)
+
+        Returns:
+            Wyniki elementów w formacie strumienia partii
+        """
+        results: list[dict[str, Any]] = []
+        created: list[tuple[int, DecisionSession, LLMLedger, DecisionBrief]] = []
+        for index, result in chunk:
+            if isinstance(result, Exception):
+                results.append(self._batch_error(index, result))
+            else:
+                created.append((index, *result))
+
+        if not created:
+            return results
+
+        sessions = [session for _, session, _, _ in created]
+        self.db.add_all(sessions)
+        self.db.add_all(
+            LLMCall(session_id=session.id, **record.to_dict())
+            for _, session, ledger, _ in created
+            for record in ledger.records
+        )
+        schedule_embeddings(self.db, [session.id for session in sessions])
+        try:
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("partia_blad_zapisu", error=str(e), count=len(created))
+            return results + [self._batch_error(index, e) for index, *_ in created]
+
+        for index, session, _, _ in created:
+            results.append(
+                {
+                    "index": index,
+                    "status": "created",
+                    "session": self._to_response(session).model_dump(mode="json"),
+                }
+            )
+        return results
+
+    @staticmethod
+    def _batch_error(index: int, error: Exception) -> dict[str, Any]:
+        """Buduje wynik błędu elementu partii (problem+json).
+
+        Args:
+            index: Indeks elementu w partii
+            error: Wyjątek elementu
+
+        Returns:
+            Wynik elementu ze statusem error
+        """
+        if isinstance(error, AppException):
+            problem = error.to_dict()
+        else:
+            logger.error("partia_blad_elementu", index=index, error=str(error))
+            problem = {
+                "type": "about:blank",
+                "title": "Błąd wewnętrzny serwera",
+                "status": 500,
+                "detail": "Wystąpił nieoczekiwany błąd",
+            }
+        return {"index": index, "status": "error", "error": problem}
+
+    async def _run_decision(
+        self,
+        request: CreateDecisionSessionRequest,
+        idempotency_key: str | None = None,
+    ) -> tuple[DecisionSession, LLMLedger, DecisionBrief]:
+        """Uruchamia agentów i buduje (jeszcze niezapisany) rekord sesji.
+
+        Args:
+            request: Żądanie sesji decyzyjnej
+            idempotency_key: Opcjonalny klucz idempotencji zapisywany z sesją
+
+        Returns:
+            Rekord sesji, rejestr wywołań LLM do zapisania i podsumowanie decyzji
         """
         start_time = time.time()
 
@@ -61,93 +566,657 @@ class DecisionService:
             has_user_id=request.user_id is not None,
         )
 
-        # Run through orchestrator
-        decision_brief = await self.orchestrator.process_decision(
-            context=request.context,
-            options=request.options,
-            stress_level=request.stress_level,
-            user_id=request.user_id,
-        )
+        # Run through orchestrator, sharing the run with identical concurrent requests
+        if settings.orchestration_coalescing_enabled:
+            (decision_brief, state, ledger), coalesced = await _orchestrations.do(
+                orchestration_key(request), lambda: self._orchestrate(request)
+            )
+        else:
+            decision_brief, state, ledger = await self._orchestrate(request)
+            coalesced = False
+
+        if coalesced:
+            # LLM spend is accounted for on the session that ran the pipeline
+            ledger = LLMLedger()
+            llm_usage = {**ledger.summary(), "coalesced": True}
+            logger.info("orkiestracja_wspoldzielona", stress_level=request.stress_level)
+        else:
+            llm_usage = ledger.summary()
 
         processing_time = time.time() - start_time
 
         # Create database record
         session = DecisionSession(
+            id=uuid4(),
+            created_at=datetime.now(UTC),
             user_id=request.user_id,
             context=request.context,
             options=request.options,
             stress_level=request.stress_level,
             decision_brief=decision_brief.model_dump(),
+            schema_version=BRIEF_SCHEMA_VERSION,
+            agent_outputs=state.step_results,
             processing_time_seconds=processing_time,
+            processing_metadata=processing_metadata(state, request.tier, request.max_latency_ms),
+            llm_usage=llm_usage,
+            idempotency_key=idempotency_key,
         )
+        self._set_local_embedding(session)
 
-        self.db.add(session)
-        await self.db.flush()  # Get ID without committing
+        return session, ledger, decision_brief
 
-        # Generate and store embedding if enabled
-        if settings.enable_vector_search:
-            try:
-                # Combine context and summary for embedding
-                embedding_text = f"{request.context} {request.options}"
-                embedding = await self.openai_client.create_embedding(embedding_text)
+    async def get_decision_session(
+        self, session_id: UUID, wait_seconds: float = 0
+    ) -> DecisionSessionResponse:
+        """Pobiera sesję decyzyjną według ID.
 
-                await self.vector_store.store_embedding(
-                    session_id=str(session.id),
-                    embedding=embedding,
-                )
+        Z wait_seconds > 0 czeka (long-poll) na sesję, która nie została
+        jeszcze zapisana, np. sesję zadania asynchronicznego. Oczekiwanie nie
+        odpytuje bazy: budzi je powiadomienie NOTIFY wysłane przy zapisie.
+
+        Args:
+            session_id: UUID sesji
+            wait_seconds: Jak długo czekać na zapisanie sesji
+
+        Returns:
+            Odpowiedź sesji decyzyjnej
+
+        Raises:
+            NotFoundException: Jeśli sesja nie została znaleziona
+        """
+        return self._to_response(await self._get_session(session_id, wait_seconds))
+
+    async def get_decision_session_json(self, session_id: UUID, wait_seconds: float = 0) -> bytes:
+        """Jak get_decision_session, ale zwraca gotowy JSON odpowiedzi.
+
+        Sesje zapisane w bieżącej wersji schematu są serializowane wprost
+        z zapisanego JSON, bez budowania i walidacji modeli.
+
+        Args:
+            session_id: UUID sesji
+            wait_seconds: Jak długo czekać na zapisanie sesji
+
+        Returns:
+            DecisionSessionResponse jako JSON
+
+        Raises:
+            NotFoundException: Jeśli sesja nie została znaleziona
+        """
+        return to_json(self._to_payload(await self._get_session(session_id, wait_seconds)))
+
+    async def _get_session(self, session_id: UUID, wait_seconds: float) -> DecisionSession:
+        """Pobiera rekord sesji, opcjonalnie czekając na jej zapisanie.
+
+        Args:
+            session_id: UUID sesji
+            wait_seconds: Jak długo czekać na zapisanie sesji
+
+        Returns:
+            Rekord sesji
+
+        Raises:
+            NotFoundException: Jeśli sesja nie została znaleziona
+        """
+        session = await self.db.get(DecisionSession, session_id)
+        if session is None and wait_seconds > 0:
+            session = await self._wait_for_session(session_id, wait_seconds)
+
+        if not session:
+            raise NotFoundException(
+                detail=f"Sesja decyzyjna {session_id} nie została znaleziona",
+                resource_type="DecisionSession",
+            )
+
+        return session
+
+    async def _wait_for_session(
+        self, session_id: UUID, wait_seconds: float
+    ) -> DecisionSession | None:
+        """Czeka na powiadomienie o zapisaniu sesji.
+
+        Args:
+            session_id: UUID sesji
+            wait_seconds: Maksymalny czas oczekiwania
+
+        Returns:
+            Sesja lub None, jeśli nie została zapisana w tym czasie
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait_seconds
+
+        while True:
+            try:
+                await session_notifier.start()
             except Exception as e:
-                logger.warning("blad_embedding", error=str(e), session_id=session.id)
+                logger.warning("long_poll_niedostepny", error=str(e))
+                return None
 
-        await self.db.commit()
-        await self.db.refresh(session)
+            # Subscribe before checking, so a commit in between is not missed
+            notified = session_notifier.subscribe(session_id)
+            try:
+                session = await self.db.get(DecisionSession, session_id)
+                if session is not None:
+                    return session
 
-        logger.info(
-            "sesja_decyzyjna_utworzona",
-            session_id=session.id,
-            processing_time=processing_time,
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+
+                # Do not hold a pooled connection while waiting
+                await self.db.rollback()
+                try:
+                    await asyncio.wait_for(notified, timeout=remaining)
+                except TimeoutError:
+                    return None
+            finally:
+                session_notifier.unsubscribe(session_id, notified)
+
+    async def list_decision_sessions(
+        self,
+        user_id: str | None = None,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        view: SessionView = "full",
+    ) -> ListDecisionSessionsResponse:
+        """Wyświetla listę sesji decyzyjnych z paginacją.
+
+        Z kursorem (next_cursor poprzedniej strony) strona jest wyszukiwana
+        w indeksie po (created_at, id) zamiast pomijania wierszy przez OFFSET,
+        więc jej koszt nie rośnie z głębokością historii; page jest wtedy
+        ignorowane.
+
+        Widok summary pobiera z bazy tylko kolumny potrzebne liście historii
+        (początek opisu, liczba opcji, rodzaj kroku uspokajającego), bez
+        pełnego kontekstu i podsumowania decyzji.
+
+        Args:
+            user_id: Opcjonalny filtr według ID użytkownika
+            page: Numer strony (indeksowany od 1), bez kursora
+            page_size: Wyników na stronę
+            cursor: Kursor next_cursor z poprzedniej strony
+            count: Sposób liczenia total: exact, estimated (statystyki planisty) lub none
+            view: full (pełne sesje) lub summary (DecisionSessionSummary)
+
+        Returns:
+            Stronicowana lista sesji
+
+        Raises:
+            ValidationException: Jeśli kursor jest nieprawidłowy
+        """
+        rows, pagination = await self._list_page(user_id, page, page_size, cursor, count, view)
+        return ListDecisionSessionsResponse(
+            sessions=[
+                self._to_summary(row) if view == "summary" else self._to_response(row)
+                for row in rows
+            ],
+            **pagination,
         )
 
-        return DecisionSessionResponse(
-            id=session.id,
-            created_at=session.created_at,
-            user_id=session.user_id,
-            input=request,
-            output=decision_brief,
-            stress_level=request.stress_level,
-            processing_time_seconds=processing_time,
+    async def list_decision_sessions_json(
+        self,
+        user_id: str | None = None,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        view: SessionView = "full",
+    ) -> bytes:
+        """Jak list_decision_sessions, ale zwraca gotowy JSON odpowiedzi.
+
+        Sesje zapisane w bieżącej wersji schematu są serializowane wprost
+        z zapisanego JSON, bez budowania i walidacji modeli.
+
+        Args:
+            user_id: Opcjonalny filtr według ID użytkownika
+            page: Numer strony (indeksowany od 1), bez kursora
+            page_size: Wyników na stronę
+            cursor: Kursor next_cursor z poprzedniej strony
+            count: Sposób liczenia total
+            view: full lub summary
+
+        Returns:
+            ListDecisionSessionsResponse jako JSON
+
+        Raises:
+            ValidationException: Jeśli kursor jest nieprawidłowy
+        """
+        rows, pagination = await self._list_page(user_id, page, page_size, cursor, count, view)
+        return to_json(
+            {
+                "sessions": [
+                    (
+                        self._to_summary(row).model_dump(mode="json")
+                        if view == "summary"
+                        else self._to_payload(row)
+                    )
+                    for row in rows
+                ],
+                **pagination,
+            }
         )
 
-    async def get_decision_session(self, session_id: UUID) -> DecisionSessionResponse:
-        """Pobiera sesję decyzyjną według ID.
+    async def _list_page(
+        self,
+        user_id: str | None,
+        page: int,
+        page_size: int,
+        cursor: str | None,
+        count: CountMode,
+        view: SessionView,
+    ) -> tuple[Sequence[Any], dict[str, Any]]:
+        """Pobiera wiersze jednej strony listy sesji.
 
         Args:
-            session_id: UUID sesji
+            user_id: Opcjonalny filtr według ID użytkownika
+            page: Numer strony (indeksowany od 1), bez kursora
+            page_size: Wyników na stronę
+            cursor: Kursor next_cursor z poprzedniej strony
+            count: Sposób liczenia total
+            view: full (rekordy DecisionSession) lub summary (wiersze SUMMARY_COLUMNS)
 
         Returns:
-            Odpowiedź sesji decyzyjnej
+            Wiersze strony i pola stronicowania odpowiedzi
+        """
+        filters = [DecisionSession.user_id == user_id] if user_id else []
+        summary = view == "summary"
+        stmt = (
+            select(*SUMMARY_COLUMNS if summary else (DecisionSession,))
+            .where(*filters)
+            .order_by(DecisionSession.created_at.desc(), DecisionSession.id.desc())
+        )
+
+        offset = 0
+        if cursor is not None:
+            created_at, session_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(DecisionSession.created_at, DecisionSession.id) < (created_at, session_id)
+            )
+        else:
+            offset = (page - 1) * page_size
+            stmt = stmt.offset(offset)
+
+        # One extra row tells whether there is a next page
+        result = await self.db.execute(stmt.limit(page_size + 1))
+        rows = result.all() if summary else result.scalars().all()
+        sessions = rows[:page_size]
+        has_next = len(rows) > page_size
+        next_cursor = encode_cursor(sessions[-1].created_at, sessions[-1].id) if has_next else None
+
+        total: int | None = None
+        estimated = False
+        if count != "none":
+            if cursor is None and not has_next and (sessions or page == 1):
+                # Last page reached: the total is known without counting
+                total = offset + len(sessions)
+            elif count == "estimated":
+                total = await self._estimate_session_count(user_id)
+                estimated = total is not None
+            if total is None:
+                total = await self.db.scalar(
+                    select(func.count()).select_from(DecisionSession).where(*filters)
+                )
+
+        logger.info(
+            "lista_sesji_decyzyjnych",
+            total=total,
+            total_estimated=estimated,
+            page=page,
+            keyset=cursor is not None,
+            view=view,
+            returned=len(sessions),
+        )
+
+        return sessions, {
+            "total": total,
+            "total_estimated": estimated,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+        }
+
+    async def find_similar_sessions(
+        self, session_id: UUID, limit: int = 5
+    ) -> list[DecisionSessionSummary]:
+        """Znajduje najbardziej podobne sesje z historii tego samego użytkownika.
+
+        Porównuje lokalne embeddingi (n-gramy) bieżącej wersji, więc nie
+        wywołuje API; sesje anonimowe nie mają historii, a sesje z embeddingiem
+        innej wersji czekają na scripts.reembed_sessions --local.
+
+        Args:
+            session_id: UUID sesji, do której szukane są podobne
+            limit: Maksymalna liczba sesji
+
+        Returns:
+            Skrócone sesje, od najbardziej podobnej
 
         Raises:
             NotFoundException: Jeśli sesja nie została znaleziona
         """
-        stmt = select(DecisionSession).where(DecisionSession.id == session_id)
-        result = await self.db.execute(stmt)
-        session = result.scalar_one_or_none()
+        source = (
+            await self.db.execute(
+                select(
+                    DecisionSession.user_id,
+                    DecisionSession.local_embedding,
+                    DecisionSession.local_embedding_model,
+                ).where(DecisionSession.id == session_id)
+            )
+        ).first()
+        if source is None:
+            raise NotFoundException(
+                detail=f"Sesja decyzyjna {session_id} nie została znaleziona",
+                resource_type="DecisionSession",
+            )
+        version = local_embedding_provider.version
+        if source.user_id is None or source.local_embedding_model != version:
+            return []
+
+        rows = (
+            await self.db.execute(
+                select(*SUMMARY_COLUMNS)
+                .where(
+                    DecisionSession.user_id == source.user_id,
+                    DecisionSession.id != session_id,
+                    # Vectors of another version are not comparable
+                    DecisionSession.local_embedding_model == version,
+                )
+                .order_by(DecisionSession.local_embedding.cosine_distance(source.local_embedding))
+                .limit(limit)
+            )
+        ).all()
+        return [self._to_summary(row) for row in rows]
+
+    async def _estimate_session_count(self, user_id: str | None) -> int | None:
+        """Szacuje liczbę sesji na podstawie statystyk planisty PostgreSQL.
+
+        Args:
+            user_id: Opcjonalny filtr według ID użytkownika
+
+        Returns:
+            Szacowana liczba sesji lub None, jeśli tabela nie ma jeszcze statystyk
+        """
+        if user_id is None:
+            estimate = await self.db.scalar(
+                text("SELECT reltuples FROM pg_class WHERE oid = 'decision_sessions'::regclass")
+            )
+        else:
+            plan = await self.db.scalar(
+                text(
+                    "EXPLAIN (FORMAT JSON) "
+                    "SELECT 1 FROM decision_sessions WHERE user_id = :user_id"
+                ),
+                {"user_id": user_id},
+            )
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"] if plan else None
+
+        # reltuples is -1 for tables that were never vacuumed or analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
 
+    async def update_decision_session(
+        self, session_id: UUID, update: UpdateDecisionSessionRequest
+    ) -> DecisionSessionResponse:
+        """Zmienia dane wejściowe sesji i ponownie ocenia tylko dotknięte kroki.
+
+        Kroki orkiestratora, których wejście się nie zmieniło (np. intake przy
+        zmianie samego poziomu stresu), korzystają z zapisanych wyników.
+
+        Args:
+            session_id: UUID sesji
+            update: Zmienione pola
+
+        Returns:
+            Zaktualizowana sesja decyzyjna
+
+        Raises:
+            NotFoundException: Jeśli sesja nie została znaleziona
+        """
+        session = await self.db.get(DecisionSession, session_id)
         if not session:
             raise NotFoundException(
                 detail=f"Sesja decyzyjna {session_id} nie została znaleziona",
                 resource_type="DecisionSession",
             )
 
+        changes = {
+            field: value
+            for field, value in update.model_dump(exclude_none=True).items()
+            if getattr(session, field) != value
+        }
+        if not changes:
+            return self._to_response(session)
+
+        start_time = time.time()
+        logger.info("aktualizacja_sesji_decyzyjnej", session_id=session_id, fields=sorted(changes))
+
+        # Re-run with the latency tier the session was created with
+        requested = session.processing_metadata or {}
+        ledger = LLMLedger()
+        decision_brief, state = await self.orchestrator.evaluate(
+            context=changes.get("context", session.context),
+            options=changes.get("options", session.options),
+            stress_level=changes.get("stress_level", session.stress_level),
+            user_id=session.user_id,
+            ledger=ledger,
+            previous_steps=session.agent_outputs,
+            tier=requested.get("requested_tier"),
+            max_latency_ms=requested.get("requested_max_latency_ms"),
+        )
+
+        for field, value in changes.items():
+            setattr(session, field, value)
+        session.decision_brief = decision_brief.model_dump()
+        session.schema_version = BRIEF_SCHEMA_VERSION
+        session.agent_outputs = state.step_results
+        session.processing_time_seconds = time.time() - start_time
+        session.processing_metadata = processing_metadata(
+            state, requested.get("requested_tier"), requested.get("requested_max_latency_ms")
+        )
+        session.llm_usage = {**ledger.summary(), "reused_steps": state.reused_steps}
+
+        if "context" in changes or "options" in changes:
+            # The stored embedding is stale; a new one is computed in the background
+            session.embedding = None
+            session.embedding_model = None
+            schedule_embeddings(self.db, [session.id])
+            self._set_local_embedding(session)
+        self.db.add_all(self._llm_call_rows(session, ledger))
+
+        # The request scope (get_db) commits
+        await self.db.flush()
+
+        logger.info(
+            "sesja_decyzyjna_zaktualizowana",
+            session_id=session.id,
+            reused_steps=state.reused_steps,
+            processing_time=session.processing_time_seconds,
+        )
+
+        return self._to_response(session)
+
+    async def prepare_draft(self, request: DraftDecisionRequest) -> DraftDecisionResponse:
+        """Wstępnie przetwarza szkic, aby skrócić czas przetwarzania po wysłaniu.
+
+        Args:
+            request: Częściowe dane formularza
+
+        Returns:
+            Status wstępnego przetworzenia
+
+        Raises:
+            ContentSafetyException: Jeśli treść nie przeszła kontroli bezpieczeństwa
+        """
+        ledger = LLMLedger()
+        _, cached = await self.orchestrator.prepare_draft(
+            context=request.context,
+            options=request.options,
+            ledger=ledger,
+        )
+
+        usage = ledger.summary()
+        logger.info(
+            "szkic_przetworzony",
+            cached=cached,
+            prompt_tokens=usage["prompt_tokens"],
+            completion_tokens=usage["completion_tokens"],
+        )
+
+        return DraftDecisionResponse(
+            ready=True,
+            cached=cached,
+            expires_in_seconds=settings.draft_cache_ttl_seconds,
+        )
+
+    async def _orchestrate(
+        self, request: CreateDecisionSessionRequest
+    ) -> tuple[DecisionBrief, DecisionState, LLMLedger]:
+        """Przetwarza żądanie przez orkiestrator agentów.
+
+        Args:
+            request: Żądanie sesji decyzyjnej
+
+        Returns:
+            Podsumowanie decyzji, stan końcowy i rejestr wywołań LLM
+        """
+        ledger = LLMLedger()
+        decision_brief, state = await self.orchestrator.evaluate(
+            context=request.context,
+            options=request.options,
+            stress_level=request.stress_level,
+            user_id=request.user_id,
+            ledger=ledger,
+            tier=request.tier,
+            max_latency_ms=request.max_latency_ms,
+        )
+        return decision_brief, state, ledger
+
+    @staticmethod
+    def _set_local_embedding(session: DecisionSession) -> None:
+        """Ustawia lokalny embedding sesji (liczony na CPU, bez wywołania API).
+
+        Args:
+            session: Sesja z kontekstem i opcjami
+        """
+        if settings.local_embedding_enabled:
+            session.local_embedding = local_embedding_provider.embed_one(
+                embedding_text(session.context, session.options)
+            )
+            session.local_embedding_model = local_embedding_provider.version
+
+    @staticmethod
+    def _llm_call_rows(session: DecisionSession, ledger: LLMLedger) -> list[LLMCall]:
+        """Buduje wiersze wywołań LLM sesji.
+
+        Args:
+            session: Sesja z nadanym ID
+            ledger: Rejestr wywołań LLM
+
+        Returns:
+            Wiersze LLMCall do zapisania
+        """
+        return [LLMCall(session_id=session.id, **record.to_dict()) for record in ledger.records]
+
+    async def _find_by_idempotency_key(
+        self, idempotency_key: str
+    ) -> DecisionSessionResponse | None:
+        """Szuka sesji utworzonej z danym kluczem w oknie retencji.
+
+        Args:
+            idempotency_key: Wartość nagłówka Idempotency-Key
+
+        Returns:
+            Zapisana sesja lub None
+        """
+        stmt = select(DecisionSession).where(
+            DecisionSession.idempotency_key == idempotency_key,
+            DecisionSession.created_at >= idempotency_cutoff(),
+        )
+        session = (await self.db.execute(stmt)).scalar_one_or_none()
+        return self._to_response(session) if session else None
+
+    async def _release_expired_idempotency_key(self, idempotency_key: str) -> None:
+        """Zwalnia klucz sesji starszej niż okno retencji, aby można go było użyć ponownie.
+
+        Args:
+            idempotency_key: Wartość nagłówka Idempotency-Key
+        """
+        await self.db.execute(
+            update(DecisionSession)
+            .where(
+                DecisionSession.idempotency_key == idempotency_key,
+                DecisionSession.created_at < idempotency_cutoff(),
+            )
+            .values(idempotency_key=None)
+        )
+
+    @staticmethod
+    def _check_claim(claim: IdempotencyKey, request: CreateDecisionSessionRequest) -> None:
+        """Sprawdza, czy żądanie jest identyczne z tym, które zarezerwowało klucz.
+
+        Args:
+            claim: Rezerwacja klucza
+            request: Ponowione żądanie
+
+        Raises:
+            ConflictException: Jeśli żądania się różnią
+        """
+        if claim.request_hash != request_fingerprint(request):
+            raise ConflictException(
+                detail="Klucz Idempotency-Key został już użyty z innym żądaniem",
+                session_id=str(claim.session_id),
+            )
+
+    @staticmethod
+    def _check_idempotent_replay(
+        response: DecisionSessionResponse, request: CreateDecisionSessionRequest
+    ) -> DecisionSessionResponse:
+        """Sprawdza, czy ponowione żądanie jest identyczne z oryginałem.
+
+        Args:
+            response: Sesja utworzona z tym samym kluczem
+            request: Ponowione żądanie
+
+        Returns:
+            Zapisana sesja
+
+        Raises:
+            ConflictException: Jeśli żądania się różnią
+        """
+        if response.input != request:
+            raise ConflictException(
+                detail="Klucz Idempotency-Key został już użyty z innym żądaniem",
+                session_id=str(response.id),
+            )
+        return response
+
+    @staticmethod
+    def _to_response(session: DecisionSession) -> DecisionSessionResponse:
+        """Buduje odpowiedź API z rekordu sesji.
+
+        Args:
+            session: Rekord sesji decyzyjnej
+
+        Returns:
+            Odpowiedź sesji decyzyjnej
+        """
+        processing = session.processing_metadata
+
         # Reconstruct request and brief
         request = CreateDecisionSessionRequest(
             context=session.context,
             options=session.options,
             stress_level=session.stress_level,
             user_id=session.user_id,
+            tier=processing.get("requested_tier") if processing else None,
+            max_latency_ms=processing.get("requested_max_latency_ms") if processing else None,
         )
 
-        decision_brief = DecisionBrief(**session.decision_brief)
+        decision_brief = load_brief(session.decision_brief, session.schema_version)
 
         return DecisionSessionResponse(
             id=session.id,
@@ -157,78 +1226,148 @@ class DecisionService:
             output=decision_brief,
             stress_level=session.stress_level,
             processing_time_seconds=session.processing_time_seconds,
+            processing=ProcessingMetadata.model_validate(processing) if processing else None,
         )
 
-    async def list_decision_sessions(
+    @classmethod
+    def _to_payload(cls, session: DecisionSession) -> dict[str, Any]:
+        """Buduje JSON odpowiedzi API z rekordu sesji.
+
+        Sesje zapisane w bieżącej wersji schematu zostały zwalidowane przy
+        zapisie, więc ich zapisany JSON trafia do odpowiedzi bez zmian.
+        Starsze przechodzą przez migrację i walidację w _to_response.
+
+        Args:
+            session: Rekord sesji decyzyjnej
+
+        Returns:
+            DecisionSessionResponse w postaci gotowej do serializacji JSON
+        """
+        if not is_current(session.schema_version):
+            return cls._to_response(session).model_dump(mode="json")
+
+        processing = session.processing_metadata
+        return {
+            "id": session.id,
+            "created_at": session.created_at,
+            "user_id": session.user_id,
+            "input": {
+                "context": session.context,
+                "options": session.options,
+                "stress_level": session.stress_level,
+                "user_id": session.user_id,
+                "tier": processing.get("requested_tier") if processing else None,
+                "max_latency_ms": (
+                    processing.get("requested_max_latency_ms") if processing else None
+                ),
+            },
+            "output": session.decision_brief,
+            "stress_level": session.stress_level,
+            "processing_time_seconds": session.processing_time_seconds,
+            "processing": (
+                {name: processing.get(name) for name in ProcessingMetadata.model_fields}
+                if processing
+                else None
+            ),
+        }
+
+    @staticmethod
+    def _to_summary(row: Any) -> DecisionSessionSummary:
+        """Buduje skróconą sesję z wiersza SUMMARY_COLUMNS.
+
+        Args:
+            row: Wiersz zapytania widoku summary
+
+        Returns:
+            Skrócona sesja decyzyjna
+        """
+        preview = row.context_preview
+        if len(preview) > CONTEXT_PREVIEW_LENGTH:
+            preview = preview[:CONTEXT_PREVIEW_LENGTH] + "..."
+        return DecisionSessionSummary(
+            id=row.id,
+            created_at=row.created_at,
+            user_id=row.user_id,
+            stress_level=row.stress_level,
+            context_preview=preview,
+            option_count=row.option_count or 0,
+            calm_step_type=row.calm_step_type or "",
+        )
+
+    @staticmethod
+    def _to_job_response(job: DecisionJob) -> DecisionJobResponse:
+        """Buduje odpowiedź API z rekordu zadania.
+
+        Args:
+            job: Rekord zadania
+
+        Returns:
+            Stan zadania
+        """
+        return DecisionJobResponse(
+            id=job.id,
+            status=job.status,
+            session_id=job.session_id,
+            attempts=job.attempts,
+            created_at=job.created_at,
+            finished_at=job.finished_at,
+            error=job.last_error,
+        )
+
+    async def get_llm_usage(
         self,
+        since: datetime | None = None,
+        until: datetime | None = None,
         user_id: str | None = None,
-        page: int = 1,
-        page_size: int = 20,
-    ) -> ListDecisionSessionsResponse:
-        """Wyświetla listę sesji decyzyjnych z paginacją.
+    ) -> LLMUsageReport:
+        """Agreguje użycie LLM według agenta i modelu.
 
         Args:
+            since: Początek okresu (włącznie)
+            until: Koniec okresu (wyłącznie)
             user_id: Opcjonalny filtr według ID użytkownika
-            page: Numer strony (indeksowany od 1)
-            page_size: Wyników na stronę
 
         Returns:
-            Stronicowana lista sesji
+            Raport użycia LLM
         """
-        # Build query
-        stmt = select(DecisionSession).order_by(DecisionSession.created_at.desc())
-
+        filters = []
+        if since is not None:
+            filters.append(LLMCall.created_at >= since)
+        if until is not None:
+            filters.append(LLMCall.created_at < until)
         if user_id:
-            stmt = stmt.where(DecisionSession.user_id == user_id)
-
-        # Get total count
-        count_result = await self.db.execute(
-            select(DecisionSession).where(
-                DecisionSession.user_id == user_id if user_id else True
-            )
-        )
-        total = len(count_result.scalars().all())
-
-        # Apply pagination
-        offset = (page - 1) * page_size
-        stmt = stmt.offset(offset).limit(page_size)
-
-        result = await self.db.execute(stmt)
-        sessions = result.scalars().all()
-
-        # Convert to responses
-        session_responses = []
-        for session in sessions:
-            request = CreateDecisionSessionRequest(
-                context=session.context,
-                options=session.options,
-                stress_level=session.stress_level,
-                user_id=session.user_id,
-            )
-            decision_brief = DecisionBrief(**session.decision_brief)
-
-            session_responses.append(
-                DecisionSessionResponse(
-                    id=session.id,
-                    created_at=session.created_at,
-                    user_id=session.user_id,
-                    input=request,
-                    output=decision_brief,
-                    stress_level=session.stress_level,
-                    processing_time_seconds=session.processing_time_seconds,
+            filters.append(
+                LLMCall.session_id.in_(
+                    select(DecisionSession.id).where(DecisionSession.user_id == user_id)
                 )
             )
 
-        logger.info(
-            "lista_sesji_decyzyjnych",
-            total=total,
-            page=page,
-            returned=len(session_responses),
+        stmt = (
+            select(
+                LLMCall.agent_name,
+                LLMCall.model,
+                func.count().label("calls"),
+                func.sum(LLMCall.prompt_tokens).label("prompt_tokens"),
+                func.sum(LLMCall.completion_tokens).label("completion_tokens"),
+                func.sum(LLMCall.cached_tokens).label("cached_tokens"),
+                func.sum(LLMCall.retries).label("retries"),
+                func.avg(LLMCall.wall_time_ms).label("avg_wall_time_ms"),
+                func.max(LLMCall.wall_time_ms).label("max_wall_time_ms"),
+            )
+            .where(*filters)
+            .group_by(LLMCall.agent_name, LLMCall.model)
+            .order_by(func.sum(LLMCall.prompt_tokens + LLMCall.completion_tokens).desc())
         )
+        rows = (await self.db.execute(stmt)).all()
 
-        return ListDecisionSessionsResponse(
-            sessions=session_responses,
-            total=total,
-            page=page,
-            page_size=page_size,
+        session_count = await self.db.scalar(
+            select(func.count(distinct(LLMCall.session_id))).where(*filters)
+        )
+
+        return LLMUsageReport(
+            since=since,
+            until=until,
+            user_id=user_id,
+            session_count=session_count or 0,
+            agents=[LLMUsageAggregate.model_validate(row._asdict()) for row in rows],
         )
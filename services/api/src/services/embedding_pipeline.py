@@ -0,0 +1,353 @@
+"""Background embedding of stored decision sessions.
+
+Sessions are stored without an embedding and scheduled with
+``schedule_embeddings``. Once their transaction commits, the IDs are queued
+to the process-wide ``embedding_pipeline``, whose workers collect them into
+batches, embed each batch with a single API call and write the vectors back
+with one executemany UPDATE.
+
+Sessions that never get an embedding (the process crashed or the API call
+failed) keep ``embedding IS NULL`` and are queued again by the backfill that
+runs when the pipeline starts, in one process at a time. Failed batches are
+counted in ``embedding_attempts``, and the backfill gives up on a session after
+``settings.embedding_max_attempts`` of them. Embeddings of an older version
+(``embedding_model``) are replaced by ``scripts.reembed_sessions``.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import Table, bindparam, event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.db.models import DecisionSession
+from src.db.session import SessionLocal, engine
+from src.services.openai_client import OpenAIClient, openai_client
+
+logger = get_logger(__name__)
+
+# Session.info key with the IDs to embed once the transaction commits
+PENDING_EMBEDDINGS_KEY = "pending_embeddings"
+
+# pg_advisory_lock key held by the process running the backfill
+BACKFILL_LOCK_ID = 7_410_046
+
+
+def schedule_embeddings(db: AsyncSession, session_ids: Iterable[UUID]) -> None:
+    """Queue sessions for embedding once the current transaction commits.
+
+    Nothing is queued if the transaction rolls back.
+
+    Args:
+        db: Database session with the transaction storing the sessions
+        session_ids: IDs of sessions whose embedding is missing or stale
+    """
+    if not settings.enable_vector_search:
+        return
+    db.info.setdefault(PENDING_EMBEDDINGS_KEY, []).extend(session_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    """Hand the scheduled sessions to the pipeline after a commit."""
+    session_ids = session.info.pop(PENDING_EMBEDDINGS_KEY, None)
+    if session_ids:
+        embedding_pipeline.enqueue(session_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    """Drop the scheduled sessions of a rolled back transaction."""
+    session.info.pop(PENDING_EMBEDDINGS_KEY, None)
+
+
+def embedding_text(context: str, options: str) -> str:
+    """Text embedded for a session.
+
+    Args:
+        context: Decision context
+        options: Options considered
+
+    Returns:
+        Input of the embeddings endpoint
+    """
+    return f"{context} {options}"
+
+
+class EmbeddingPipeline:
+    """In-process worker pool embedding sessions in batches."""
+
+    def __init__(
+        self,
+        client: OpenAIClient,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        linger_seconds: float | None = None,
+        queue_size: int | None = None,
+    ) -> None:
+        """Initialize pipeline without starting workers.
+
+        Args:
+            client: OpenAI client used for embeddings
+            batch_size: Sessions embedded per API call (defaults to settings)
+            workers: Batches processed at the same time
+            linger_seconds: How long a batch waits to fill up
+            queue_size: Sessions held in memory before new ones are left to the backfill
+        """
+        self.client = client
+        self.batch_size = batch_size or settings.embedding_batch_size
+        self.workers = workers or settings.embedding_workers
+        self.linger_seconds = (
+            settings.embedding_batch_linger_seconds if linger_seconds is None else linger_seconds
+        )
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue(
+            queue_size or settings.embedding_queue_size
+        )
+        self._tasks: list[asyncio.Task[Any]] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of sessions waiting in the queue."""
+        return self._queue.qsize()
+
+    def enqueue(self, session_ids: Iterable[UUID]) -> None:
+        """Queue sessions for embedding without waiting.
+
+        When the queue is full the remaining sessions keep a NULL embedding
+        and are picked up by the next backfill.
+
+        Args:
+            session_ids: IDs of committed sessions
+        """
+        for session_id in session_ids:
+            try:
+                self._queue.put_nowait(session_id)
+            except asyncio.QueueFull:
+                logger.warning("embedding_queue_full", pending=self.pending)
+                return
+
+    async def start(self, backfill: bool = True) -> None:
+        """Start the workers.
+
+        Args:
+            backfill: Whether to queue stored sessions that have no embedding
+        """
+        if not settings.enable_vector_search or self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if backfill:
+            self._tasks.append(asyncio.create_task(self.backfill(datetime.utcnow())))
+        logger.info("embedding_pipeline_started", workers=self.workers, backfill=backfill)
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued batches for up to `timeout` seconds, then stop.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except TimeoutError:
+            logger.warning("embedding_pipeline_stopped_with_pending", pending=self.pending)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def backfill(self, created_before: datetime) -> int:
+        """Queue stored sessions that have no embedding.
+
+        Only one process backfills at a time: the others skip it while the
+        advisory lock is held. Sessions are read in pages and queued with
+        backpressure, so a large backlog never sits in memory at once.
+
+        Args:
+            created_before: Only sessions stored before this time (newer ones are queued on commit)
+
+        Returns:
+            Number of queued sessions
+        """
+        queued = 0
+        try:
+            async with engine.connect() as conn:
+                if not await conn.scalar(select(func.pg_try_advisory_lock(BACKFILL_LOCK_ID))):
+                    logger.info("embedding_backfill_skipped")
+                    return 0
+                # The lock belongs to the connection, not the transaction
+                await conn.commit()
+                try:
+                    async for session_ids in self._missing_embeddings(created_before):
+                        for session_id in session_ids:
+                            await self._queue.put(session_id)
+                        queued += len(session_ids)
+                finally:
+                    # Release before the connection goes back to the pool
+                    await conn.execute(select(func.pg_advisory_unlock(BACKFILL_LOCK_ID)))
+                    await conn.commit()
+        except Exception as e:
+            logger.error("embedding_backfill_failed", error=str(e), queued=queued)
+        logger.info("embedding_backfill_queued", count=queued)
+        return queued
+
+    async def _missing_embeddings(self, created_before: datetime) -> AsyncIterator[list[UUID]]:
+        """Page through sessions without an embedding that are still retried.
+
+        Args:
+            created_before: Only sessions stored before this time
+
+        Yields:
+            Session IDs, one page at a time
+        """
+        last_id: UUID | None = None
+        while True:
+            query = (
+                select(DecisionSession.id)
+                .where(
+                    DecisionSession.embedding.is_(None),
+                    DecisionSession.embedding_attempts < settings.embedding_max_attempts,
+                    DecisionSession.created_at < created_before,
+                )
+                .order_by(DecisionSession.id)
+                .limit(self.batch_size * self.workers)
+            )
+            if last_id is not None:
+                query = query.where(DecisionSession.id > last_id)
+            async with SessionLocal() as db:
+                session_ids = list((await db.execute(query)).scalars().all())
+            if not session_ids:
+                return
+            yield session_ids
+            last_id = session_ids[-1]
+
+    async def _record_failure(self, session_ids: list[UUID]) -> None:
+        """Count a failed embedding attempt for sessions still without an embedding.
+
+        Args:
+            session_ids: IDs of the failed batch
+        """
+        try:
+            async with SessionLocal() as db:
+                await db.execute(
+                    update(DecisionSession)
+                    .where(
+                        DecisionSession.id.in_(session_ids),
+                        DecisionSession.embedding.is_(None),
+                    )
+                    # Bookkeeping is not a change of the session
+                    .values(
+                        embedding_attempts=DecisionSession.embedding_attempts + 1,
+                        updated_at=DecisionSession.updated_at,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning("embedding_failure_not_recorded", error=str(e), count=len(session_ids))
+
+    async def _worker(self) -> None:
+        """Embed batches until cancelled."""
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.embed_batch(batch)
+            except Exception as e:
+                # The sessions keep a NULL embedding until the next backfill
+                logger.warning("embedding_batch_failed", error=str(e), count=len(batch))
+                await self._record_failure(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> list[UUID]:
+        """Wait for a session, then collect more for up to linger_seconds.
+
+        Returns:
+            Up to batch_size session IDs
+        """
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.linger_seconds
+        while len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    async def embed_batch(self, session_ids: list[UUID]) -> int:
+        """Embed sessions with one API call and store the vectors.
+
+        Sessions already embedded with the active version are skipped, and a
+        vector is only written if the session was not changed or embedded in
+        the meantime.
+
+        Args:
+            session_ids: IDs of sessions to embed
+
+        Returns:
+            Number of sessions embedded
+        """
+        version = settings.embedding_version
+        async with SessionLocal() as db:
+            rows = (
+                await db.execute(
+                    select(
+                        DecisionSession.id,
+                        DecisionSession.updated_at,
+                        DecisionSession.context,
+                        DecisionSession.options,
+                    ).where(
+                        DecisionSession.id.in_(session_ids),
+                        DecisionSession.embedding_model.is_distinct_from(version),
+                    )
+                )
+            ).all()
+            if not rows:
+                return 0
+            # Do not hold a pooled connection during the API call
+            await db.rollback()
+
+            embeddings = await self.client.create_embeddings(
+                [embedding_text(row.context, row.options) for row in rows]
+            )
+
+            table = cast(Table, DecisionSession.__table__)
+            await db.execute(
+                update(table).where(
+                    table.c.id == bindparam("b_id"),
+                    table.c.updated_at.is_not_distinct_from(bindparam("b_updated_at")),
+                    table.c.embedding_model.is_distinct_from(version),
+                )
+                # Background embedding is not a change of the session
+                .values(
+                    embedding=bindparam("b_embedding"),
+                    embedding_model=version,
+                    updated_at=table.c.updated_at,
+                ),
+                [
+                    {"b_id": row.id, "b_updated_at": row.updated_at, "b_embedding": embedding}
+                    for row, embedding in zip(rows, embeddings, strict=True)
+                ],
+            )
+            await db.commit()
+
+        logger.info("embedding_batch_stored", count=len(rows))
+        return len(rows)
+
+
+# Global instance
+embedding_pipeline = EmbeddingPipeline(openai_client)
@@ -0,0 +1,169 @@
+"""Embedding providers other than the OpenAI API.
+
+OpenAIClient.create_embedding(s) routes ``provider="local"`` here. The local
+provider embeds on the CPU in microseconds without a network call. Its vectors
+only capture surface similarity (shared words and character sequences), which
+is enough for near-duplicate detection and history lookups; semantic search
+stays on OpenAI embeddings.
+"""
+
+import re
+import unicodedata
+import zlib
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.core.config import settings
+
+_WORD = re.compile(r"\w+")
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into vectors of one vector space."""
+
+    @property
+    @abstractmethod
+    def version(self) -> str:
+        """Tag of the vector space; vectors of different versions are not comparable."""
+
+    @property
+    @abstractmethod
+    def dimensions(self) -> int:
+        """Length of the produced vectors."""
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Unit-length vectors in the order of texts
+        """
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """Hashed character and word n-gram vectorizer.
+
+    Character n-grams of the normalized text and word n-grams are hashed
+    (CRC32, stable across processes) into signed buckets. Without projection
+    the buckets are the vector. With ``projection_features`` the n-grams are
+    hashed into that many buckets instead and mapped to ``dimensions`` by a
+    fixed sparse random projection (Achlioptas), which spreads colliding
+    n-grams over all dimensions.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        char_ngrams: tuple[int, int] = (3, 5),
+        word_ngrams: tuple[int, int] = (1, 2),
+        projection_features: int = 0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize vectorizer.
+
+        Args:
+            dimensions: Output vector length
+            char_ngrams: Smallest and largest character n-gram
+            word_ngrams: Smallest and largest word n-gram
+            projection_features: Hashed features projected to dimensions (0 = no projection)
+            seed: Seed of the projection matrix
+        """
+        self._dimensions = dimensions
+        self.char_ngrams = char_ngrams
+        self.word_ngrams = word_ngrams
+        self.projection_features = projection_features
+        self.buckets = projection_features or dimensions
+        self._projection: np.ndarray | None = None
+        if projection_features:
+            rng = np.random.default_rng(seed)
+            # Entries +-sqrt(3) with probability 1/6 each, 0 otherwise
+            self._projection = rng.choice(
+                np.array([-np.sqrt(3), 0.0, np.sqrt(3)], dtype=np.float32),
+                size=(projection_features, dimensions),
+                p=[1 / 6, 2 / 3, 1 / 6],
+            )
+
+    @property
+    def version(self) -> str:
+        """Tag of the vector space (changes with every parameter)."""
+        char_low, char_high = self.char_ngrams
+        word_low, word_high = self.word_ngrams
+        projection = f"p{self.projection_features}" if self.projection_features else "direct"
+        return (
+            f"local-hashing-v1:c{char_low}-{char_high}:w{word_low}-{word_high}:"
+            f"{projection}:{self._dimensions}"
+        )
+
+    @property
+    def dimensions(self) -> int:
+        """Length of the produced vectors."""
+        return self._dimensions
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts on the CPU (no I/O, so it does not yield).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Unit-length vectors in the order of texts
+        """
+        return [self.embed_one(text).tolist() for text in texts]
+
+    def embed_one(self, text: str) -> np.ndarray:
+        """Embed a single text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Unit-length float32 vector (all zeros for text without n-grams)
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(gram.encode()) for gram in self._ngrams(text)), dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return np.zeros(self._dimensions, dtype=np.float32)
+
+        # One hash gives the bucket and, from the next bit, the sign
+        buckets = (hashes % self.buckets).astype(np.intp)
+        signs = 1.0 - 2.0 * ((hashes // self.buckets) & 1).astype(np.float32)
+        features = np.bincount(buckets, weights=signs, minlength=self.buckets).astype(np.float32)
+
+        if self._projection is None:
+            vector = features
+        else:
+            present = np.flatnonzero(features)
+            vector = features[present] @ self._projection[present]
+
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _ngrams(self, text: str) -> list[str]:
+        """Character n-grams of the normalized text and word n-grams."""
+        normalized = " ".join(unicodedata.normalize("NFKC", text).lower().split())
+        padded = f" {normalized} "
+        grams = [
+            padded[start : start + size]
+            for size in range(self.char_ngrams[0], self.char_ngrams[1] + 1)
+            for start in range(len(padded) - size + 1)
+        ]
+        words = _WORD.findall(normalized)
+        grams.extend(
+            # Prefixed so a word n-gram never hashes like the same character n-gram
+            "w:" + " ".join(words[start : start + size])
+            for size in range(self.word_ngrams[0], self.word_ngrams[1] + 1)
+            for start in range(len(words) - size + 1)
+        )
+        return grams
+
+
+# Global instance
+local_embedding_provider = HashingEmbeddingProvider(
+    dimensions=settings.local_embedding_dimensions,
+    projection_features=settings.local_embedding_projection_features,
+)
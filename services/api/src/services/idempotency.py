@@ -0,0 +1,130 @@
+"""Idempotency-Key claims shared by all API processes and both request modes.
+
+A request carrying a key claims it in ``idempotency_keys`` and commits the
+claim before any agent runs. A retry, on whichever process it lands, finds
+the claim and waits for or replays the claimed session instead of running
+the pipeline again. Sync requests and queued jobs use the same table, so one
+key never creates two sessions.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, and_, delete, exists, or_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.db.models import DecisionJob, DecisionSession, IdempotencyKey
+from src.db.session import SessionLocal
+from src.schemas.decision import CreateDecisionSessionRequest
+from src.services.job_queue import idempotency_cutoff
+
+logger = get_logger(__name__)
+
+
+def request_fingerprint(request: CreateDecisionSessionRequest) -> str:
+    """Hash of a request body; retries with a key must send the same body.
+
+    Args:
+        request: Decision session request
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
+def _abandoned() -> ColumnElement[bool]:
+    """Claims whose request stored neither its session nor its job in time."""
+    stale = datetime.utcnow() - timedelta(seconds=settings.idempotency_claim_timeout_seconds)
+    return and_(
+        IdempotencyKey.created_at < stale,
+        ~exists().where(DecisionSession.id == IdempotencyKey.session_id),
+        or_(
+            IdempotencyKey.job_id.is_(None),
+            ~exists().where(DecisionJob.id == IdempotencyKey.job_id),
+        ),
+    )
+
+
+async def claim_idempotency_key(
+    key: str,
+    request: CreateDecisionSessionRequest,
+    session_id: UUID,
+    job_id: UUID | None = None,
+) -> IdempotencyKey | None:
+    """Claim a key for a new request, committed in a transaction of its own.
+
+    A key past the retention window, or one whose request stored nothing
+    within idempotency_claim_timeout_seconds (the process died), is taken
+    over.
+
+    Args:
+        key: Idempotency-Key header value
+        request: Decision session request
+        session_id: ID the new session will be stored under
+        job_id: ID of the job, for a queued request
+
+    Returns:
+        None if the caller now holds the key, otherwise the existing claim
+    """
+    values = {
+        "key": key,
+        "created_at": datetime.utcnow(),
+        "request_hash": request_fingerprint(request),
+        "session_id": session_id,
+        "job_id": job_id,
+    }
+    async with SessionLocal() as db:
+        while True:
+            inserted = await db.execute(
+                insert(IdempotencyKey)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=["key"])
+            )
+            if inserted.rowcount == 1:
+                await db.commit()
+                return None
+
+            taken_over = await db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.key == key,
+                    or_(IdempotencyKey.created_at < idempotency_cutoff(), _abandoned()),
+                )
+                .values(**values)
+            )
+            if taken_over.rowcount == 1:
+                await db.commit()
+                logger.info("idempotency_key_taken_over", session_id=session_id)
+                return None
+
+            claim: IdempotencyKey | None = await db.get(IdempotencyKey, key)
+            await db.commit()
+            if claim is not None:
+                return claim
+            # Released by its request in the meantime: claim it again
+
+
+async def release_idempotency_key(key: str, session_id: UUID) -> None:
+    """Free a key whose request failed before storing anything.
+
+    A retry then runs the request instead of waiting for a session that
+    never comes. Errors are logged: the claim expires on its own.
+
+    Args:
+        key: Idempotency-Key header value
+        session_id: Session ID of the claim to release
+    """
+    try:
+        async with SessionLocal() as db:
+            await db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.session_id == session_id
+                )
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning("idempotency_key_release_failed", error=str(e), session_id=session_id)
@@ -0,0 +1,311 @@
+"""Durable decision job queue stored in PostgreSQL."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from sqlalchemy import ColumnElement, and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.db.models import DecisionJob
+from src.db.session import SessionLocal
+from src.schemas.decision import CreateDecisionSessionRequest
+
+logger = get_logger(__name__)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff before the next attempt of a failed job.
+
+    Args:
+        attempts: Attempts made so far (at least 1)
+
+    Returns:
+        Delay before the job becomes available again
+    """
+    return timedelta(seconds=settings.job_retry_backoff_seconds * 2 ** (attempts - 1))
+
+
+def idempotency_cutoff() -> datetime:
+    """Oldest creation time for which an Idempotency-Key is still remembered."""
+    return datetime.utcnow() - timedelta(hours=settings.idempotency_retention_hours)
+
+
+class JobQueue:
+    """Queue of decision jobs claimed by worker processes.
+
+    Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any
+    number of them can poll the same table without handing out a job twice.
+    A claimed job is leased until ``locked_until``; its worker extends the
+    lease while it runs (see keep_lease). If the worker dies, the job becomes
+    claimable again once the lease (visibility timeout) expires.
+
+    Every claim increments ``attempts``, which doubles as the lease token:
+    extend_lease, complete and fail only touch a job that is still running
+    under the attempt they were given, so a worker whose lease was taken
+    over cannot overwrite the outcome of the newer attempt.
+    """
+
+    def __init__(self, db_session: AsyncSession) -> None:
+        """Initialize queue.
+
+        Args:
+            db_session: Database session
+        """
+        self.db = db_session
+
+    async def enqueue(
+        self,
+        request: CreateDecisionSessionRequest,
+        idempotency_key: str | None = None,
+        job_id: UUID | None = None,
+        session_id: UUID | None = None,
+    ) -> DecisionJob:
+        """Add a decision request to the queue.
+
+        Args:
+            request: Decision session request
+            idempotency_key: Optional Idempotency-Key header value
+            job_id: ID for the job (generated if not given)
+            session_id: ID for the session the job creates (generated if not given)
+
+        Returns:
+            New job, or the job already queued with the same idempotency key
+        """
+        if idempotency_key is not None:
+            existing = await self._find_by_idempotency_key(idempotency_key)
+            if existing is not None:
+                logger.info("job_idempotent_replay", job_id=existing.id)
+                return existing
+
+        now = datetime.utcnow()
+        job = DecisionJob(
+            id=job_id or uuid4(),
+            created_at=now,
+            session_id=session_id or uuid4(),
+            idempotency_key=idempotency_key,
+            payload=request.model_dump(mode="json"),
+            status="queued",
+            attempts=0,
+            available_at=now,
+        )
+        self.db.add(job)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            if idempotency_key is None:
+                raise
+            # A concurrent request enqueued the same key first, or the key
+            # still belongs to a job older than the retention window
+            await self.db.rollback()
+            existing = await self._find_by_idempotency_key(idempotency_key)
+            if existing is not None:
+                return existing
+            await self._release_expired_idempotency_key(idempotency_key)
+            self.db.add(job)
+            await self.db.commit()
+
+        logger.info("job_enqueued", job_id=job.id, session_id=job.session_id)
+        return job
+
+    async def claim(self) -> DecisionJob | None:
+        """Lease the next available job.
+
+        Returns:
+            Claimed job (status running, attempts incremented) or None if the
+            queue is empty
+        """
+        while True:
+            now = datetime.utcnow()
+            stmt = (
+                select(DecisionJob)
+                .where(
+                    or_(
+                        and_(DecisionJob.status == "queued", DecisionJob.available_at <= now),
+                        # Lease expired: the worker running it died or hung
+                        and_(DecisionJob.status == "running", DecisionJob.locked_until < now),
+                    )
+                )
+                .order_by(DecisionJob.available_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = (await self.db.execute(stmt)).scalar_one_or_none()
+            if job is None:
+                await self.db.rollback()
+                return None
+
+            if job.status == "running":
+                logger.warning("job_lease_expired", job_id=job.id, attempts=job.attempts)
+                if job.attempts >= settings.job_max_attempts:
+                    job.status = "failed"
+                    job.last_error = "Visibility timeout exceeded"
+                    job.finished_at = now
+                    job.locked_until = None
+                    await self.db.commit()
+                    continue
+
+            job.status = "running"
+            job.attempts += 1
+            job.locked_until = now + timedelta(seconds=settings.job_visibility_timeout_seconds)
+            await self.db.commit()
+
+            logger.info("job_claimed", job_id=job.id, attempts=job.attempts)
+            return job
+
+    async def extend_lease(self, job_id: UUID, attempt: int) -> bool:
+        """Push back the lease of a running job by the visibility timeout.
+
+        Args:
+            job_id: Job ID
+            attempt: Attempt holding the lease (job.attempts after claim)
+
+        Returns:
+            Whether the lease is still held by this attempt
+        """
+        result = await self.db.execute(
+            update(DecisionJob)
+            .where(*self._leased_by(job_id, attempt))
+            .values(
+                locked_until=datetime.utcnow()
+                + timedelta(seconds=settings.job_visibility_timeout_seconds)
+            )
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def complete(self, job_id: UUID, attempt: int) -> bool:
+        """Mark a job as succeeded.
+
+        Does not commit, so the caller can store the job's results in the same
+        transaction; the updated row stays locked until then, so no other
+        attempt can complete the job meanwhile.
+
+        Args:
+            job_id: Job ID
+            attempt: Attempt holding the lease (job.attempts after claim)
+
+        Returns:
+            Whether the job was completed (False if the lease was lost)
+        """
+        result = await self.db.execute(
+            update(DecisionJob)
+            .where(*self._leased_by(job_id, attempt))
+            .values(
+                status="succeeded",
+                finished_at=datetime.utcnow(),
+                locked_until=None,
+                last_error=None,
+            )
+        )
+        return result.rowcount == 1
+
+    async def fail(self, job_id: UUID, attempt: int, error: str, retryable: bool = True) -> bool:
+        """Record a failed attempt, scheduling a retry if attempts remain.
+
+        Args:
+            job_id: Job ID
+            attempt: Attempt holding the lease (job.attempts after claim)
+            error: Error description
+            retryable: Whether another attempt could succeed
+
+        Returns:
+            Whether the failure was recorded (False if the lease was lost, e.g.
+            because another attempt already finished the job)
+        """
+        now = datetime.utcnow()
+        retry = retryable and attempt < settings.job_max_attempts
+        available_at = now + retry_delay(attempt)
+        values = (
+            {"status": "queued", "available_at": available_at}
+            if retry
+            else {"status": "failed", "finished_at": now}
+        )
+
+        result = await self.db.execute(
+            update(DecisionJob)
+            .where(*self._leased_by(job_id, attempt))
+            .values(last_error=error, locked_until=None, **values)
+        )
+        await self.db.commit()
+
+        if result.rowcount != 1:
+            logger.warning("job_lease_lost", job_id=job_id, attempts=attempt)
+            return False
+        if retry:
+            logger.warning(
+                "job_retry_scheduled",
+                job_id=job_id,
+                attempts=attempt,
+                available_at=available_at.isoformat(),
+            )
+        else:
+            logger.error("job_failed", job_id=job_id, attempts=attempt, error=error)
+        return True
+
+    async def get(self, job_id: UUID) -> DecisionJob | None:
+        """Fetch a job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job or None
+        """
+        return await self.db.get(DecisionJob, job_id)
+
+    async def _find_by_idempotency_key(self, idempotency_key: str) -> DecisionJob | None:
+        """Find the job enqueued with an idempotency key within the retention window."""
+        stmt = select(DecisionJob).where(
+            DecisionJob.idempotency_key == idempotency_key,
+            DecisionJob.created_at >= idempotency_cutoff(),
+        )
+        return (await self.db.execute(stmt)).scalar_one_or_none()
+
+    async def _release_expired_idempotency_key(self, idempotency_key: str) -> None:
+        """Free the key of a job older than the retention window for reuse."""
+        await self.db.execute(
+            update(DecisionJob)
+            .where(
+                DecisionJob.idempotency_key == idempotency_key,
+                DecisionJob.created_at < idempotency_cutoff(),
+            )
+            .values(idempotency_key=None)
+        )
+
+    @staticmethod
+    def _leased_by(job_id: UUID, attempt: int) -> tuple[ColumnElement[bool], ...]:
+        """Conditions matching a job still running under the given attempt."""
+        return (
+            DecisionJob.id == job_id,
+            DecisionJob.status == "running",
+            DecisionJob.attempts == attempt,
+        )
+
+
+async def keep_lease(job: DecisionJob) -> None:
+    """Extend the lease of a running job until cancelled.
+
+    Runs next to the job's processing, with its own database session.
+
+    Args:
+        job: Job claimed by this worker
+
+    Returns:
+        Once the lease is lost, e.g. another worker reclaimed the job
+    """
+    while True:
+        await asyncio.sleep(settings.job_heartbeat_interval_seconds)
+        try:
+            async with SessionLocal() as db:
+                extended = await JobQueue(db).extend_lease(job.id, job.attempts)
+        except Exception as e:
+            # A missed heartbeat is harmless while the lease has time left
+            logger.error("job_heartbeat_failed", job_id=job.id, error=str(e))
+            continue
+        if not extended:
+            logger.warning("job_lease_lost", job_id=job.id, attempts=job.attempts)
+            return
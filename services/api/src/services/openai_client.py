@@ -1,8 +1,12 @@
 """OpenAI client with retry logic and streaming support."""
 
+import time
+from contextvars import ContextVar
 from typing import Any
 
+import httpx
 from openai import AsyncOpenAI, OpenAIError
+from openai._types import NOT_GIVEN, NotGiven
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -10,28 +14,54 @@ from tenacity import (
     wait_exponential,
 )
 
+from src.agents.prompt_cache import get_cached_tokens
 from src.core.config import settings
 from src.core.errors import OpenAIException
+from src.core.ledger import LLMCallRecord, current_ledger
 from src.core.logging import get_logger
+from src.services.embedding_providers import EmbeddingProvider, local_embedding_provider
 
 logger = get_logger(__name__)
 
+# HTTP attempts made by the SDK for the current call (its retries are internal)
+_http_attempts: ContextVar[list[int] | None] = ContextVar("openai_http_attempts", default=None)
+
+
+async def _count_http_attempt(request: httpx.Request) -> None:
+    """httpx request hook counting attempts of the current SDK call."""
+    attempts = _http_attempts.get()
+    if attempts is not None:
+        attempts[0] += 1
+
 
 class OpenAIClient:
     """Wrapper for OpenAI API with retry logic."""
 
-    def __init__(self) -> None:
-        """Initialize OpenAI client with configuration."""
+    def __init__(self, base_url: str | None = None) -> None:
+        """Initialize OpenAI client with configuration.
+
+        Args:
+            base_url: OpenAI-compatible endpoint (defaults to settings.openai_base_url)
+        """
         if not settings.openai_api_key:
             logger.warning("openai_api_key_not_set")
 
         self.client = AsyncOpenAI(
             api_key=settings.openai_api_key,
+            base_url=base_url or settings.openai_base_url,
             max_retries=settings.openai_max_retries,
             timeout=settings.openai_timeout,
+            http_client=httpx.AsyncClient(
+                timeout=settings.openai_timeout,
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+                follow_redirects=True,
+                event_hooks={"request": [_count_http_attempt]},
+            ),
         )
         self.model = settings.openai_model
         self.embedding_model = settings.openai_embedding_model
+        # Embedding providers besides the OpenAI API, selected with provider=
+        self.embedding_providers: dict[str, EmbeddingProvider] = {"local": local_embedding_provider}
 
     @retry(
         retry=retry_if_exception_type(OpenAIError),
@@ -45,6 +75,8 @@ class OpenAIClient:
         max_tokens: int | None = None,
         tools: list[dict[str, Any]] | None = None,
         tool_choice: str | dict[str, Any] = "auto",
+        response_format: dict[str, Any] | None = None,
+        agent_name: str | None = None,
     ) -> Any:
         """Create chat completion with retry logic.
 
@@ -54,6 +86,8 @@ class OpenAIClient:
             max_tokens: Maximum tokens to generate
             tools: Optional function calling tools
             tool_choice: How to handle tool calls
+            response_format: Optional response format (e.g. strict JSON schema)
+            agent_name: Calling agent, recorded in the active LLM ledger
 
         Returns:
             OpenAI chat completion response
@@ -67,23 +101,51 @@ class OpenAIClient:
                 model=self.model,
                 message_count=len(messages),
                 has_tools=tools is not None,
+                response_format=response_format["type"] if response_format else None,
             )
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                tools=tools,
-                tool_choice=tool_choice if tools else None,
-            )
+            extra_params: dict[str, Any] = {}
+            if response_format is not None:
+                extra_params["response_format"] = response_format
+
+            attempts = [0]
+            attempts_token = _http_attempts.set(attempts)
+            started = time.perf_counter()
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    tools=tools,
+                    tool_choice=tool_choice if tools else None,
+                    **extra_params,
+                )
+            finally:
+                _http_attempts.reset(attempts_token)
+            wall_time_ms = (time.perf_counter() - started) * 1000
 
             logger.info(
                 "openai_chat_success",
                 model=self.model,
                 usage=response.usage.model_dump() if response.usage else None,
+                retries=max(attempts[0] - 1, 0),
             )
 
+            ledger = current_ledger()
+            if ledger is not None and response.usage is not None:
+                ledger.record(
+                    LLMCallRecord(
+                        agent_name=agent_name or "unknown",
+                        model=response.model or self.model,
+                        prompt_tokens=response.usage.prompt_tokens,
+                        completion_tokens=response.usage.completion_tokens,
+                        cached_tokens=get_cached_tokens(response.usage),
+                        wall_time_ms=round(wall_time_ms, 1),
+                        retries=max(attempts[0] - 1, 0),
+                    )
+                )
+
             return response
 
         except OpenAIError as e:
@@ -91,7 +153,42 @@ class OpenAIClient:
             raise OpenAIException(
                 detail=f"OpenAI API error: {str(e)}",
                 model=self.model,
-            )
+            ) from e
+
+    def _embedding_provider(self, name: str) -> EmbeddingProvider:
+        """Look up a registered embedding provider.
+
+        Args:
+            name: Provider name
+
+        Returns:
+            Embedding provider
+
+        Raises:
+            ValueError: If no provider is registered under the name
+        """
+        try:
+            return self.embedding_providers[name]
+        except KeyError:
+            raise ValueError(f"Unknown embedding provider: {name}") from None
+
+    @staticmethod
+    def _embedding_dimensions(model: str, dimensions: int | None) -> int | NotGiven:
+        """Requested embedding size, shortening vectors to the stored size.
+
+        Only text-embedding-3 and later models accept ``dimensions``;
+        text-embedding-ada-002 always returns 1536 values.
+
+        Args:
+            model: Embedding model
+            dimensions: Requested size (defaults to settings.embedding_dimensions)
+
+        Returns:
+            ``dimensions`` argument of embeddings.create
+        """
+        if model == "text-embedding-ada-002":
+            return NOT_GIVEN
+        return dimensions or settings.embedding_dimensions
 
     @retry(
         retry=retry_if_exception_type(OpenAIError),
@@ -99,20 +196,30 @@ class OpenAIClient:
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
     async def create_embedding(
-        self, text: str, model: str | None = None
+        self,
+        text: str,
+        model: str | None = None,
+        dimensions: int | None = None,
+        provider: str = "openai",
     ) -> list[float]:
         """Create embedding vector for text.
 
         Args:
             text: Text to embed
             model: Optional model override
+            dimensions: Vector size (defaults to settings.embedding_dimensions)
+            provider: "openai" or another registered provider (model and dimensions
+                then come from the provider)
 
         Returns:
-            Embedding vector (1536 dimensions for text-embedding-3-small)
+            Embedding vector
 
         Raises:
             OpenAIException: If API call fails after retries
         """
+        if provider != "openai":
+            return (await self._embedding_provider(provider).embed([text]))[0]
+
         try:
             embedding_model = model or self.embedding_model
 
@@ -125,6 +232,7 @@ class OpenAIClient:
             response = await self.client.embeddings.create(
                 model=embedding_model,
                 input=text,
+                dimensions=self._embedding_dimensions(embedding_model, dimensions),
             )
 
             embedding = response.data[0].embedding
@@ -146,8 +254,69 @@ class OpenAIClient:
             raise OpenAIException(
                 detail=f"OpenAI embedding error: {str(e)}",
                 model=embedding_model,
+            ) from e
+
+    @retry(
+        retry=retry_if_exception_type(OpenAIError),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def create_embeddings(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        dimensions: int | None = None,
+        provider: str = "openai",
+    ) -> list[list[float]]:
+        """Create embedding vectors for several texts in one API call.
+
+        Args:
+            texts: Texts to embed
+            model: Optional model override
+            dimensions: Vector size (defaults to settings.embedding_dimensions)
+            provider: "openai" or another registered provider (model and dimensions
+                then come from the provider)
+
+        Returns:
+            Embedding vectors in the order of texts
+
+        Raises:
+            OpenAIException: If API call fails after retries
+        """
+        if provider != "openai":
+            return await self._embedding_provider(provider).embed(texts)
+
+        if not texts:
+            return []
+
+        try:
+            embedding_model = model or self.embedding_model
+
+            logger.info(
+                "openai_embedding_batch_request",
+                model=embedding_model,
+                count=len(texts),
             )
 
+            response = await self.client.embeddings.create(
+                model=embedding_model,
+                input=texts,
+                dimensions=self._embedding_dimensions(embedding_model, dimensions),
+            )
+
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+        except OpenAIError as e:
+            logger.error(
+                "openai_embedding_error",
+                error=str(e),
+                model=embedding_model,
+            )
+            raise OpenAIException(
+                detail=f"OpenAI embedding error: {str(e)}",
+                model=embedding_model,
+            ) from e
+
     async def chat_completion_stream(
         self,
         messages: list[dict[str, str]],
@@ -186,7 +355,7 @@ class OpenAIClient:
 
         except OpenAIError as e:
             logger.error("openai_stream_error", error=str(e))
-            raise OpenAIException(detail=f"OpenAI streaming error: {str(e)}")
+            raise OpenAIException(detail=f"OpenAI streaming error: {str(e)}") from e
 
 
 # Global client instance
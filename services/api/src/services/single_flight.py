@@ -0,0 +1,81 @@
+"""Single-flight coalescing of concurrent calls with the same key."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Runs at most one call per key at a time; concurrent callers share its result.
+
+    The first caller for a key (the leader) executes the call. Callers arriving
+    while it is in flight wait for the same result or exception. If the leader
+    is cancelled (e.g. its client disconnected), one of the waiters takes over
+    instead of failing.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize registry.
+
+        Args:
+            name: Name used in logs
+        """
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run fn for key, or wait for the call already in flight.
+
+        Args:
+            key: Coalescing key
+            fn: Call to execute if no call for key is in flight
+
+        Returns:
+            Result and whether it was shared from another caller
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                return await self._lead(key, fn), False
+
+            logger.info("single_flight_joined", registry=self.name)
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if future.cancelled() and task is not None and not task.cancelling():
+                    # The leader was cancelled, not us: take over the call
+                    continue
+                raise
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for key is currently running."""
+        return key in self._calls
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Execute fn and publish its outcome to waiting callers."""
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved even when nobody joined the call
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
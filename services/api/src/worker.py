@@ -0,0 +1,122 @@
+"""Worker process executing queued decision jobs.
+
+Run from services/api (any number of instances):
+
+    python -m src.worker
+"""
+
+import asyncio
+import contextlib
+import signal
+
+from pydantic import ValidationError
+
+from src.core.config import settings
+from src.core.errors import ContentSafetyException, ValidationException
+from src.core.logging import configure_logging, get_logger
+from src.db.session import SessionLocal, engine
+from src.db.types import verify_embedding_columns
+from src.services.decision_service import DecisionService
+from src.services.embedding_pipeline import embedding_pipeline
+from src.services.job_queue import JobQueue
+from src.services.openai_client import openai_client
+
+logger = get_logger(__name__)
+
+# Failures caused by the request itself; retrying cannot help
+NON_RETRYABLE_ERRORS = (ContentSafetyException, ValidationException, ValidationError)
+
+
+class Worker:
+    """Claims jobs from the queue and runs them through the orchestrator."""
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        poll_interval_seconds: float | None = None,
+    ) -> None:
+        """Initialize worker.
+
+        Args:
+            concurrency: Jobs processed at the same time (defaults to settings)
+            poll_interval_seconds: Delay between polls of an empty queue
+        """
+        self.concurrency = concurrency or settings.worker_concurrency
+        self.poll_interval_seconds = poll_interval_seconds or settings.worker_poll_interval_seconds
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Finish the jobs in progress and stop claiming new ones."""
+        logger.info("worker_stopping")
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Process jobs until stop() is called."""
+        logger.info("worker_started", concurrency=self.concurrency)
+        await asyncio.gather(*(self._loop() for _ in range(self.concurrency)))
+        logger.info("worker_stopped")
+
+    async def _loop(self) -> None:
+        """Claim and run jobs one at a time, waiting while the queue is empty."""
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                # Database unavailable etc.: back off instead of spinning
+                logger.error("worker_poll_failed", error=str(e))
+                processed = False
+
+            if not processed:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self.poll_interval_seconds
+                    )
+
+    async def run_once(self) -> bool:
+        """Claim and run a single job.
+
+        Returns:
+            Whether a job was claimed
+        """
+        async with SessionLocal() as db:
+            job = await JobQueue(db).claim()
+        if job is None:
+            return False
+
+        async with SessionLocal() as db:
+            service = DecisionService(db_session=db, openai_client=openai_client)
+            try:
+                await service.process_job(job)
+            except Exception as e:
+                await db.rollback()
+                await JobQueue(db).fail(
+                    job.id,
+                    job.attempts,
+                    error=str(e),
+                    retryable=not isinstance(e, NON_RETRYABLE_ERRORS),
+                )
+        return True
+
+
+async def main() -> None:
+    """Run a worker until SIGINT or SIGTERM."""
+    worker = Worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    async with engine.connect() as conn:
+        await verify_embedding_columns(conn)
+
+    # Backfilling sessions without an embedding is left to the API processes
+    await embedding_pipeline.start(backfill=False)
+    try:
+        await worker.run()
+    finally:
+        await embedding_pipeline.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    configure_logging()
+    asyncio.run(main())
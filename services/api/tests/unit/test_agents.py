@@ -2,10 +2,11 @@
 
 import pytest
 
-from src.agents import CalmnessAgent, IntakeAgent, OptionsAgent, SafetyAgent
+from src.agents import IntakeAgent, OptionsAgent, SafetyAgent
+from src.agents.prompt_cache import get_cached_tokens
+from src.core.config import settings
 from src.core.errors import ContentSafetyException
 from src.schemas.agents import AgentInput
-from src.services.openai_client import OpenAIClient
 
 
 class MockOpenAIClient:
@@ -64,3 +65,83 @@ async def test_safety_agent_blocks_dangerous_content(
 
     with pytest.raises(ContentSafetyException):
         await agent.process(agent_input)
+
+
+class MockSingleOptionClient:
+    """Mock OpenAI client returning a single-option description."""
+
+    def __init__(self) -> None:
+        """Initialize call log."""
+        self.calls: list[dict] = []
+
+    async def chat_completion(self, messages: list, **kwargs: any) -> any:
+        """Mock chat completion."""
+        self.calls.append({"messages": messages, **kwargs})
+
+        class MockChoice:
+            class MockMessage:
+                content = (
+                    '{"description": "Opis", "consequences": ["A", "B"], '
+                    '"emotional_risk": "Niskie", "confidence_level": 0.8, '
+                    '"considerations": "Koszt zmiany"}'
+                )
+
+            message = MockMessage()
+
+        class MockResponse:
+            choices = [MockChoice()]
+
+        return MockResponse()
+
+
+@pytest.mark.asyncio
+async def test_options_agent_fan_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test options agent describes each intake option in a separate call."""
+    monkeypatch.setattr(settings, "options_fan_out_enabled", True)
+    client = MockSingleOptionClient()
+    agent = OptionsAgent(client)
+
+    agent_input = AgentInput(
+        content="Should I change jobs?",
+        context={"intake_output": {"options": ["Zostać", "Odejść", "Zostać"]}},
+        agent_name="OptionsAgent",
+    )
+
+    output = await agent.process(agent_input)
+
+    assert len(client.calls) == 2
+    assert all(call["max_tokens"] == settings.options_fan_out_max_tokens for call in client.calls)
+    assert [opt["title"] for opt in output.metadata["options"]] == ["Zostać", "Odejść"]
+    assert "Zostać" in output.metadata["control_question"]
+    assert output.metadata["considerations"] == "Zostać: Koszt zmiany\nOdejść: Koszt zmiany"
+
+
+@pytest.mark.asyncio
+async def test_agent_messages_keep_static_prefix_first() -> None:
+    """Test the system message is byte-identical across calls with different data."""
+    client = MockSingleOptionClient()
+    agent = IntakeAgent(client)
+
+    for content in ("Should I change jobs?", "Should I move to Kraków?"):
+        await agent.process(
+            AgentInput(content=content, context={"options": "A, B"}, agent_name="IntakeAgent")
+        )
+
+    first, second = (call["messages"] for call in client.calls)
+    assert first[0]["role"] == "system"
+    assert first[0]["content"] == second[0]["content"]
+    assert first[1]["content"] != second[1]["content"]
+
+
+def test_get_cached_tokens_handles_missing_details() -> None:
+    """Test cached tokens are read from usage details when reported."""
+
+    class Details:
+        cached_tokens = 1024
+
+    class Usage:
+        prompt_tokens_details = Details()
+
+    assert get_cached_tokens(Usage()) == 1024
+    assert get_cached_tokens({"prompt_tokens_details": {"cached_tokens": 512}}) == 512
+    assert get_cached_tokens(object()) == 0
@@ -0,0 +1,84 @@
+"""Unit tests for batch decision processing."""
+
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+from src.core.config import settings
+from src.core.errors import ContentSafetyException
+from src.core.ledger import LLMLedger
+from src.db.models import DecisionSession
+from src.schemas.decision import CreateDecisionSessionRequest
+from src.services.decision_service import DecisionService
+
+BRIEF = {
+    "options": [
+        {
+            "title": title,
+            "description": "Opis",
+            "consequences": ["Konsekwencja"],
+            "emotional_risk": "Niskie",
+            "confidence_level": 0.7,
+        }
+        for title in ("Zostać", "Odejść")
+    ],
+    "calm_step": {
+        "type": "breathing",
+        "title": "Oddech",
+        "description": "Weź trzy głębokie oddechy",
+        "duration_minutes": 2,
+    },
+    "control_question": "Co jest dla Ciebie najważniejsze?",
+    "next_check_in": {"suggestion": "jutro rano", "reasoning": "Po odpoczynku"},
+}
+
+
+async def test_batch_streams_results_and_isolates_errors(mocker) -> None:
+    """Test every item gets a result, concurrency is capped and errors do not abort."""
+    mocker.patch.object(settings, "enable_vector_search", False)
+    mocker.patch.object(settings, "batch_max_concurrency", 2)
+
+    db = mocker.Mock()
+    db.commit = mocker.AsyncMock()
+    db.execute = mocker.AsyncMock()
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+
+    running = 0
+    peak = 0
+
+    async def run_decision(request, idempotency_key=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if request.stress_level == 10:
+            raise ContentSafetyException(detail="Zablokowano", blocked_reason="test")
+        session = DecisionSession(
+            id=uuid4(),
+            created_at=datetime.utcnow(),
+            context=request.context,
+            options=request.options,
+            stress_level=request.stress_level,
+            decision_brief=BRIEF,
+        )
+        return session, LLMLedger(), None
+
+    mocker.patch.object(service, "_run_decision", side_effect=run_decision)
+
+    requests = [
+        CreateDecisionSessionRequest(
+            context="Czy powinienem zmienić pracę?",
+            options="Zostać, Odejść",
+            stress_level=level,
+        )
+        for level in (3, 10, 5, 7)
+    ]
+    results = [item async for item in service.create_decision_sessions_batch(requests)]
+
+    assert sorted(item["index"] for item in results) == [0, 1, 2, 3]
+    statuses = {item["index"]: item["status"] for item in results}
+    assert statuses == {0: "created", 1: "error", 2: "created", 3: "created"}
+    assert next(item for item in results if item["index"] == 1)["error"]["status"] == 400
+    assert peak == 2
+    assert db.commit.await_count <= 3
@@ -0,0 +1,43 @@
+"""Unit tests for local context compaction."""
+
+from src.orchestrator.compaction import _deduplicate, compact_context
+
+
+def test_short_context_is_unchanged() -> None:
+    """Test contexts below the threshold are returned as-is."""
+    assert compact_context("Czy zmienić pracę?", min_chars=100) == "Czy zmienić pracę?"
+
+
+def test_compaction_drops_duplicates_and_keeps_order() -> None:
+    """Test duplicate sentences are removed and salient ones keep their order."""
+    context = (
+        "Czy przyjąć ofertę pracy w Krakowie? "
+        "Nowa praca w Krakowie daje wyższą pensję. "
+        "Nowa praca w Krakowie daje wyższą pensję. "
+        "Wczoraj padał deszcz. "
+        "Obecna praca jest stabilna, ale pensja nie rośnie."
+    )
+
+    compacted = compact_context(
+        context,
+        options="Przyjąć ofertę, Zostać w obecnej pracy",
+        target_ratio=0.7,
+        min_chars=20,
+    )
+
+    assert compacted.count("Nowa praca w Krakowie") == 1
+    assert compacted.startswith("Czy przyjąć ofertę pracy w Krakowie?")
+    assert "deszcz" not in compacted
+    assert len(compacted) < len(context)
+
+
+def test_sentences_without_keywords_are_not_duplicates() -> None:
+    """Test short sentences with no keywords are all kept, unlike real duplicates."""
+    sentences = [
+        "Czy przeprowadzić się do Gdańska?",
+        "Tak.",
+        "No i?",
+        "Czy przeprowadzić się do Gdańska?",
+    ]
+
+    assert _deduplicate(sentences) == sentences[:3]
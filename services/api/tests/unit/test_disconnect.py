@@ -0,0 +1,52 @@
+"""Unit tests for cancellation on client disconnect."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.api.disconnect import run_until_disconnected
+from src.core.errors import ClientDisconnectedException
+
+
+class FakeRequest:
+    """Request stub reporting a disconnect after a number of checks."""
+
+    def __init__(self, disconnect_after: int) -> None:
+        self.checks = 0
+        self.disconnect_after = disconnect_after
+        self.url = SimpleNamespace(path="/v1/decision/sessions")
+
+    async def is_disconnected(self) -> bool:
+        self.checks += 1
+        return self.checks >= self.disconnect_after
+
+
+async def test_work_is_cancelled_when_client_disconnects() -> None:
+    """Test the running task is cancelled and the disconnect is reported."""
+    cancelled = asyncio.Event()
+
+    async def slow_work() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    with pytest.raises(ClientDisconnectedException):
+        await run_until_disconnected(FakeRequest(disconnect_after=2), slow_work(), 0.01)
+
+    assert cancelled.is_set()
+
+
+async def test_result_is_returned_when_client_stays() -> None:
+    """Test the result is returned when work finishes first."""
+
+    async def quick_work() -> str:
+        return "done"
+
+    assert (
+        await run_until_disconnected(FakeRequest(disconnect_after=100), quick_work(), 0.01)
+        == "done"
+    )
@@ -0,0 +1,176 @@
+"""Unit tests for the background embedding pipeline."""
+
+import asyncio
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.services import embedding_pipeline as pipeline_module
+from src.services.embedding_pipeline import (
+    PENDING_EMBEDDINGS_KEY,
+    EmbeddingPipeline,
+    schedule_embeddings,
+)
+
+
+def test_sessions_are_queued_only_after_commit(mocker) -> None:
+    """Test scheduled sessions reach the pipeline on commit and are dropped on rollback."""
+    mocker.patch.object(settings, "enable_vector_search", True)
+    pipeline = EmbeddingPipeline(mocker.Mock(), queue_size=10)
+    mocker.patch.object(pipeline_module, "embedding_pipeline", pipeline)
+    committed, rolled_back = uuid4(), uuid4()
+
+    db = Session()
+    db.begin()
+    schedule_embeddings(db, [rolled_back])
+    assert pipeline.pending == 0
+    db.rollback()
+    db.begin()
+    schedule_embeddings(db, [committed])
+    db.commit()
+
+    assert pipeline.pending == 1
+    assert pipeline._queue.get_nowait() == committed
+    assert PENDING_EMBEDDINGS_KEY not in db.info
+
+
+def test_full_queue_drops_to_backfill(mocker) -> None:
+    """Test enqueueing never blocks the committing request."""
+    pipeline = EmbeddingPipeline(mocker.Mock(), queue_size=2)
+
+    pipeline.enqueue([uuid4() for _ in range(5)])
+
+    assert pipeline.pending == 2
+
+
+async def test_batches_fill_up_to_batch_size(mocker) -> None:
+    """Test queued sessions are collected into batches of at most batch_size."""
+    pipeline = EmbeddingPipeline(mocker.Mock(), batch_size=3, linger_seconds=0.01)
+    session_ids = [uuid4() for _ in range(5)]
+    pipeline.enqueue(session_ids)
+
+    assert await pipeline._next_batch() == session_ids[:3]
+    assert await pipeline._next_batch() == session_ids[3:]
+
+
+async def test_batch_is_embedded_with_one_call_and_one_update(mocker) -> None:
+    """Test a batch makes a single embeddings request and a single executemany UPDATE."""
+    rows = [
+        mocker.Mock(id=uuid4(), updated_at=None, context=f"Kontekst {i}", options="A, B")
+        for i in range(3)
+    ]
+    select_result = mocker.Mock()
+    select_result.all.return_value = rows
+    db = mocker.AsyncMock()
+    db.execute.side_effect = [select_result, mocker.Mock()]
+    db_factory = mocker.patch.object(pipeline_module, "SessionLocal")
+    db_factory.return_value.__aenter__.return_value = db
+    client = mocker.Mock()
+    client.create_embeddings = mocker.AsyncMock(return_value=[[0.1], [0.2], [0.3]])
+    pipeline = EmbeddingPipeline(client)
+
+    assert await pipeline.embed_batch([row.id for row in rows]) == 3
+
+    client.create_embeddings.assert_awaited_once_with(
+        ["Kontekst 0 A, B", "Kontekst 1 A, B", "Kontekst 2 A, B"]
+    )
+    statement, params = db.execute.await_args.args
+    assert str(statement).startswith("UPDATE decision_sessions SET")
+    assert statement.compile().params["embedding_model"] == settings.embedding_version
+    assert [param["b_embedding"] for param in params] == [[0.1], [0.2], [0.3]]
+    db.commit.assert_awaited_once()
+
+
+async def test_backfill_runs_in_one_process_at_a_time(mocker) -> None:
+    """Test the backfill is skipped while another process holds the advisory lock."""
+    conn = mocker.AsyncMock()
+    conn.scalar.return_value = False
+    mocker.patch.object(pipeline_module, "engine").connect.return_value.__aenter__.return_value = (
+        conn
+    )
+    db_factory = mocker.patch.object(pipeline_module, "SessionLocal")
+    pipeline = EmbeddingPipeline(mocker.Mock())
+
+    assert await pipeline.backfill(datetime.now(UTC)) == 0
+
+    assert "pg_try_advisory_lock" in str(conn.scalar.await_args.args[0])
+    db_factory.assert_not_called()
+    assert pipeline.pending == 0
+
+
+async def test_backfill_skips_sessions_that_keep_failing(mocker) -> None:
+    """Test the backfill queues sessions under the attempt limit and then releases the lock."""
+    conn = mocker.AsyncMock()
+    conn.scalar.return_value = True
+    mocker.patch.object(pipeline_module, "engine").connect.return_value.__aenter__.return_value = (
+        conn
+    )
+    session_ids = [uuid4(), uuid4()]
+    first, second = mocker.Mock(), mocker.Mock()
+    first.scalars.return_value.all.return_value = session_ids
+    second.scalars.return_value.all.return_value = []
+    db = mocker.AsyncMock()
+    db.execute.side_effect = [first, second]
+    mocker.patch.object(pipeline_module, "SessionLocal").return_value.__aenter__.return_value = db
+    pipeline = EmbeddingPipeline(mocker.Mock())
+
+    assert await pipeline.backfill(datetime.now(UTC)) == 2
+
+    query = str(db.execute.await_args_list[0].args[0])
+    assert "decision_sessions.embedding_attempts < " in query
+    assert pipeline.pending == 2
+    assert "pg_advisory_unlock" in str(conn.execute.await_args.args[0])
+
+
+async def test_failed_batch_counts_an_attempt(mocker) -> None:
+    """Test a batch whose embedding fails increments embedding_attempts of its sessions."""
+    db = mocker.AsyncMock()
+    mocker.patch.object(pipeline_module, "SessionLocal").return_value.__aenter__.return_value = db
+    pipeline = EmbeddingPipeline(mocker.Mock(), workers=1, linger_seconds=0)
+    mocker.patch.object(pipeline, "embed_batch", side_effect=RuntimeError("API down"))
+    pipeline.enqueue([uuid4()])
+
+    worker = asyncio.create_task(pipeline._worker())
+    await asyncio.wait_for(pipeline._queue.join(), timeout=1)
+    worker.cancel()
+
+    statement = db.execute.await_args.args[0]
+    assert "embedding_attempts=(decision_sessions.embedding_attempts + " in str(statement)
+    db.commit.assert_awaited_once()
+
+
+async def test_reembedding_resumes_from_checkpoint(mocker, tmp_path) -> None:
+    """Test an interrupted re-embedding run continues after the last finished page."""
+    from scripts import reembed_sessions
+    from scripts.reembed_sessions import Checkpoint, reembed
+
+    session_ids = sorted(uuid4() for _ in range(6))
+    queries = []
+
+    def page(query):
+        queries.append(str(query.compile(compile_kwargs={"literal_binds": True})))
+        done = len(queries) - 1
+        result = mocker.Mock()
+        result.scalars.return_value.all.return_value = session_ids[done * 4 : done * 4 + 4]
+        return result
+
+    db = mocker.AsyncMock()
+    db.execute.side_effect = page
+    mocker.patch.object(reembed_sessions, "SessionLocal").return_value.__aenter__.return_value = db
+    pipeline = mocker.Mock(batch_size=2)
+    pipeline.embed_batch = mocker.AsyncMock(side_effect=[2, 2, RuntimeError("API down"), 2])
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json", "model:512")
+
+    with pytest.raises(RuntimeError):
+        await reembed(pipeline, checkpoint, concurrency=2)
+    assert checkpoint.load() == (session_ids[3], 4)
+
+    # The next run starts after the checkpoint, i.e. with the remaining page
+    pipeline.embed_batch.side_effect = [2]
+    queries[:] = ["first page"]
+    assert await reembed(pipeline, checkpoint, concurrency=2) == 6
+    assert f"decision_sessions.id > '{session_ids[3].hex}'" in queries[1]
+    assert Checkpoint(checkpoint.path, "other:1536").load() == (None, 0)
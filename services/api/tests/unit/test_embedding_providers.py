@@ -0,0 +1,138 @@
+"""Unit tests for local embedding providers."""
+
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.core.errors import NotFoundException
+from src.services.decision_service import DecisionService
+from src.services.embedding_providers import HashingEmbeddingProvider, local_embedding_provider
+from src.services.openai_client import OpenAIClient
+
+CONTEXT = "Czy przenieść zespół backendu na Kubernetes przed końcem kwartału?"
+
+
+def test_vectors_are_deterministic_unit_vectors() -> None:
+    """Test separate instances embed a text identically and to unit length."""
+    first = HashingEmbeddingProvider(dimensions=256).embed_one(CONTEXT)
+    second = HashingEmbeddingProvider(dimensions=256).embed_one(CONTEXT)
+
+    assert first.shape == (256,)
+    np.testing.assert_array_equal(first, second)
+    assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.parametrize("projection_features", [0, 4096])
+def test_near_duplicates_score_higher_than_unrelated(projection_features: int) -> None:
+    """Test a paraphrase is closer than an unrelated text, with and without projection."""
+    provider = HashingEmbeddingProvider(dimensions=128, projection_features=projection_features)
+    source = provider.embed_one(CONTEXT)
+    paraphrase = provider.embed_one("Czy przenieść zespół backendu na Kubernetes w tym kwartale?")
+    unrelated = provider.embed_one("Który dostawca kawy do biura ma najlepszą ofertę?")
+
+    assert paraphrase.shape == (128,)
+    assert float(source @ paraphrase) > float(source @ unrelated) + 0.3
+
+
+def test_text_without_ngrams_embeds_to_zeros() -> None:
+    """Test empty text gives a zero vector instead of dividing by zero."""
+    vector = HashingEmbeddingProvider(dimensions=64).embed_one("")
+
+    assert not vector.any()
+
+
+def test_version_changes_with_parameters() -> None:
+    """Test vectors of differently configured providers carry different versions."""
+    assert HashingEmbeddingProvider(256).version != HashingEmbeddingProvider(128).version
+    assert (
+        HashingEmbeddingProvider(256).version
+        != HashingEmbeddingProvider(256, projection_features=4096).version
+    )
+
+
+async def test_client_routes_local_provider_without_api_call(mocker) -> None:
+    """Test provider="local" embeds on the CPU and never calls the OpenAI API."""
+    client = OpenAIClient()
+    create = mocker.patch.object(client.client.embeddings, "create")
+    provider = HashingEmbeddingProvider(dimensions=32)
+    client.embedding_providers["local"] = provider
+
+    embeddings = await client.create_embeddings([CONTEXT, "inny tekst"], provider="local")
+    embedding = await client.create_embedding(CONTEXT, provider="local")
+
+    create.assert_not_called()
+    assert len(embeddings) == 2
+    assert embedding == embeddings[0] == provider.embed_one(CONTEXT).tolist()
+
+
+async def test_client_rejects_unknown_provider() -> None:
+    """Test an unregistered provider name fails instead of falling back to the API."""
+    with pytest.raises(ValueError, match="Unknown embedding provider"):
+        await OpenAIClient().create_embedding(CONTEXT, provider="missing")
+
+
+async def test_similar_sessions_query_local_embeddings_of_same_user(mocker) -> None:
+    """Test similar sessions are ranked by local embedding distance within the user's history."""
+    source = mocker.Mock(
+        user_id=uuid4(),
+        local_embedding=np.ones(256, dtype=np.float32),
+        local_embedding_model=local_embedding_provider.version,
+    )
+    first, second = mocker.Mock(), mocker.Mock()
+    first.first.return_value = source
+    second.all.return_value = []
+    db = mocker.Mock()
+    db.execute = mocker.AsyncMock(side_effect=[first, second])
+
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+
+    similar = await service.find_similar_sessions(uuid4(), limit=3)
+
+    query = str(db.execute.await_args_list[1].args[0])
+    assert similar == []
+    assert "decision_sessions.local_embedding <=> " in query
+    assert "decision_sessions.user_id = " in query
+    assert "decision_sessions.local_embedding_model = " in query
+    assert "decision_sessions.embedding," not in query
+
+
+async def test_similar_sessions_of_anonymous_session_are_empty(mocker) -> None:
+    """Test anonymous sessions and outdated embeddings have no history to compare against."""
+    result = mocker.Mock()
+    result.first.return_value = mocker.Mock(user_id=None, local_embedding=np.ones(256))
+    db = mocker.Mock()
+    db.execute = mocker.AsyncMock(return_value=result)
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+
+    assert await service.find_similar_sessions(uuid4()) == []
+    db.execute.assert_awaited_once()
+
+    # An embedding of another version is not comparable with the history
+    result.first.return_value = mocker.Mock(
+        user_id=uuid4(), local_embedding=np.ones(256), local_embedding_model="local-hashing-v0"
+    )
+    assert await service.find_similar_sessions(uuid4()) == []
+    assert db.execute.await_count == 2
+
+    result.first.return_value = None
+    with pytest.raises(NotFoundException):
+        await service.find_similar_sessions(uuid4())
+
+
+async def test_local_reembedding_replaces_embeddings_of_other_versions(mocker) -> None:
+    """Test the --local run selects and overwrites embeddings not of the current version."""
+    from scripts import reembed_sessions
+    from scripts.reembed_sessions import LocalEmbedder
+
+    row = mocker.Mock(id=uuid4(), context=CONTEXT, options="Tak, Nie")
+    db = mocker.AsyncMock()
+    db.execute.side_effect = [mocker.Mock(all=mocker.Mock(return_value=[row])), mocker.Mock()]
+    mocker.patch.object(reembed_sessions, "SessionLocal").return_value.__aenter__.return_value = db
+
+    assert await LocalEmbedder(batch_size=2).embed_batch([row.id]) == 1
+
+    selected, updated = (call.args[0] for call in db.execute.await_args_list)
+    assert "decision_sessions.local_embedding_model IS DISTINCT FROM " in str(selected)
+    assert "decision_sessions.local_embedding_model IS DISTINCT FROM " in str(updated)
+    assert updated.compile().params["local_embedding_model"] == local_embedding_provider.version
@@ -0,0 +1,172 @@
+"""Unit tests for the decision job queue and worker."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from src import worker as worker_module
+from src.core.config import settings
+from src.core.errors import ContentSafetyException, OpenAIException
+from src.db.models import DecisionJob
+from src.services import decision_service as service_module
+from src.services.decision_service import DecisionService
+from src.services.job_queue import JobQueue, retry_delay
+
+
+def make_job(**overrides) -> DecisionJob:
+    """Create a claimed job."""
+    fields = {
+        "id": uuid4(),
+        "session_id": uuid4(),
+        "payload": {},
+        "status": "running",
+        "attempts": 1,
+        "available_at": datetime.utcnow(),
+    }
+    fields.update(overrides)
+    return DecisionJob(**fields)
+
+
+def make_db(mocker, rowcount: int = 1):
+    """Mock database session whose updates match rowcount rows."""
+    db = mocker.Mock()
+    db.execute = mocker.AsyncMock(return_value=mocker.Mock(rowcount=rowcount))
+    db.get = mocker.AsyncMock(return_value=None)
+    db.commit = mocker.AsyncMock()
+    db.rollback = mocker.AsyncMock()
+    return db
+
+
+def update_values(db) -> dict:
+    """Parameters of the last statement executed on the mock session."""
+    return db.execute.await_args.args[0].compile().params
+
+
+def test_retry_delay_is_exponential(mocker) -> None:
+    """Test backoff doubles with every attempt."""
+    mocker.patch.object(settings, "job_retry_backoff_seconds", 10.0)
+
+    assert [retry_delay(n) for n in (1, 2, 3)] == [
+        timedelta(seconds=10),
+        timedelta(seconds=20),
+        timedelta(seconds=40),
+    ]
+
+
+async def test_fail_requeues_until_max_attempts(mocker) -> None:
+    """Test a failed job is retried later, then marked failed for good."""
+    mocker.patch.object(settings, "job_max_attempts", 2)
+    db = make_db(mocker)
+    queue = JobQueue(db)
+    job_id = uuid4()
+
+    assert await queue.fail(job_id, 1, "timeout") is True
+    values = update_values(db)
+    assert values["status"] == "queued"
+    assert values["available_at"] > datetime.utcnow()
+    assert values["locked_until"] is None
+
+    assert await queue.fail(job_id, 2, "timeout") is True
+    values = update_values(db)
+    assert values["status"] == "failed"
+    assert values["finished_at"] is not None
+    assert values["last_error"] == "timeout"
+
+
+async def test_fail_non_retryable_is_final(mocker) -> None:
+    """Test errors caused by the request are not retried."""
+    db = make_db(mocker)
+    await JobQueue(db).fail(uuid4(), 1, "blocked", retryable=False)
+
+    assert update_values(db)["status"] == "failed"
+
+
+async def test_only_the_leasing_attempt_can_finish_a_job(mocker) -> None:
+    """Test complete, fail and extend_lease are fenced by status and attempt."""
+    db = make_db(mocker, rowcount=0)
+    queue = JobQueue(db)
+    job_id = uuid4()
+
+    assert await queue.complete(job_id, 1) is False
+    statement = str(db.execute.await_args.args[0])
+    assert "decision_jobs.status = " in statement
+    assert "decision_jobs.attempts = " in statement
+    assert update_values(db)["attempts_1"] == 1
+
+    assert await queue.fail(job_id, 1, "duplicate key") is False
+    assert await queue.extend_lease(job_id, 1) is False
+
+
+async def test_idempotency_keys_of_jobs_expire(mocker) -> None:
+    """Test a job's key is only replayed within the retention window."""
+    result = mocker.Mock()
+    result.scalar_one_or_none.return_value = None
+    db = make_db(mocker)
+    db.execute.return_value = result
+
+    assert await JobQueue(db)._find_by_idempotency_key("key") is None
+    assert "decision_jobs.created_at >= " in str(db.execute.await_args.args[0])
+
+
+async def test_job_losing_its_lease_stops_without_writing(mocker) -> None:
+    """Test agents are cancelled and nothing is stored once the lease is lost."""
+
+    async def slow_decision(request):
+        await asyncio.sleep(5)
+
+    db = make_db(mocker)
+    db.add = mocker.Mock()
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+    mocker.patch.object(service, "_run_decision", side_effect=slow_decision)
+    mocker.patch.object(service_module, "keep_lease", mocker.AsyncMock(return_value=None))
+    complete = mocker.patch.object(JobQueue, "complete", mocker.AsyncMock())
+    job = make_job(
+        payload={"context": "Czy zmienić pracę?", "options": "Zostać, Odejść", "stress_level": 5}
+    )
+
+    await asyncio.wait_for(service.process_job(job), timeout=1)
+
+    complete.assert_not_awaited()
+    db.add.assert_not_called()
+    db.commit.assert_not_awaited()
+
+
+async def test_worker_runs_claimed_job(mocker) -> None:
+    """Test the worker hands a claimed job to the decision service."""
+    job = make_job()
+    mocker.patch.object(JobQueue, "claim", mocker.AsyncMock(return_value=job))
+    process = mocker.patch.object(worker_module.DecisionService, "process_job", mocker.AsyncMock())
+    fail = mocker.patch.object(JobQueue, "fail", mocker.AsyncMock())
+    mocker.patch.object(worker_module, "SessionLocal", return_value=mocker.AsyncMock())
+
+    assert await worker_module.Worker(concurrency=1).run_once() is True
+    process.assert_awaited_once_with(job)
+    fail.assert_not_awaited()
+
+
+async def test_worker_records_failures(mocker) -> None:
+    """Test failures are recorded as retryable unless caused by the request."""
+    mocker.patch.object(worker_module, "SessionLocal", return_value=mocker.AsyncMock())
+    fail = mocker.patch.object(JobQueue, "fail", mocker.AsyncMock())
+
+    for error, retryable in (
+        (OpenAIException(detail="Rate limit"), True),
+        (ContentSafetyException(detail="Zablokowano", blocked_reason="test"), False),
+    ):
+        job = make_job()
+        mocker.patch.object(JobQueue, "claim", mocker.AsyncMock(return_value=job))
+        mocker.patch.object(
+            worker_module.DecisionService, "process_job", mocker.AsyncMock(side_effect=error)
+        )
+
+        assert await worker_module.Worker(concurrency=1).run_once() is True
+        assert fail.await_args.args == (job.id, job.attempts)
+        assert fail.await_args.kwargs["retryable"] is retryable
+
+
+async def test_worker_idles_on_empty_queue(mocker) -> None:
+    """Test run_once reports an empty queue."""
+    mocker.patch.object(JobQueue, "claim", mocker.AsyncMock(return_value=None))
+    mocker.patch.object(worker_module, "SessionLocal", return_value=mocker.AsyncMock())
+
+    assert await worker_module.Worker(concurrency=1).run_once() is False
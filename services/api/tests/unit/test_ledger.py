@@ -0,0 +1,37 @@
+"""Unit tests for the LLM call ledger."""
+
+import asyncio
+
+from src.core.ledger import LLMCallRecord, LLMLedger, current_ledger
+
+
+def _record(agent_name: str, prompt_tokens: int) -> LLMCallRecord:
+    return LLMCallRecord(
+        agent_name=agent_name,
+        model="gpt-4o-mini",
+        prompt_tokens=prompt_tokens,
+        completion_tokens=10,
+        cached_tokens=0,
+        wall_time_ms=100.0,
+        retries=0,
+    )
+
+
+async def test_ledger_collects_calls_from_concurrent_tasks() -> None:
+    """Test calls made in gathered tasks land in the active ledger."""
+    ledger = LLMLedger()
+
+    async def call(agent_name: str) -> None:
+        active = current_ledger()
+        assert active is not None
+        active.record(_record(agent_name, 100))
+
+    with ledger.activate():
+        await asyncio.gather(call("OptionsAgent"), call("OptionsAgent"), call("IntakeAgent"))
+
+    assert current_ledger() is None
+    summary = ledger.summary()
+    assert summary["calls"] == 3
+    assert summary["prompt_tokens"] == 300
+    assert summary["agents"]["OptionsAgent"]["calls"] == 2
+    assert summary["agents"]["IntakeAgent"]["completion_tokens"] == 10
@@ -0,0 +1,89 @@
+"""Unit tests for session completion notifications and long-polling."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.core.errors import NotFoundException
+from src.db.notifications import SESSION_COMPLETED_CHANNEL, SessionNotifier
+from src.services.decision_service import DecisionService
+
+
+async def test_notification_wakes_only_matching_waiters() -> None:
+    """Test a NOTIFY payload resolves the waiters of that session only."""
+    notifier = SessionNotifier()
+    session_id, other_id = uuid4(), uuid4()
+    first = notifier.subscribe(session_id)
+    second = notifier.subscribe(session_id)
+    other = notifier.subscribe(other_id)
+
+    notifier._on_notification(None, 1, SESSION_COMPLETED_CHANNEL, str(session_id))
+
+    assert first.result() is True and second.result() is True
+    assert not other.done()
+    assert notifier.waiting == 1
+
+
+async def test_lost_connection_wakes_everyone() -> None:
+    """Test waiters re-check the database when notifications may have been missed."""
+    notifier = SessionNotifier()
+    waiter = notifier.subscribe(uuid4())
+
+    notifier._on_terminated(None)
+
+    assert waiter.result() is False
+    assert notifier.waiting == 0
+
+
+async def test_unsubscribe_removes_waiter() -> None:
+    """Test abandoned waits do not leak."""
+    notifier = SessionNotifier()
+    session_id = uuid4()
+    waiter = notifier.subscribe(session_id)
+
+    notifier.unsubscribe(session_id, waiter)
+
+    assert notifier.waiting == 0
+
+
+@pytest.fixture
+def notifier(mocker) -> SessionNotifier:
+    """Notifier that does not connect to the database."""
+    notifier = SessionNotifier()
+    mocker.patch.object(notifier, "start", mocker.AsyncMock())
+    mocker.patch("src.services.decision_service.session_notifier", notifier)
+    return notifier
+
+
+async def test_long_poll_returns_session_after_notification(mocker, notifier) -> None:
+    """Test GET with wait returns as soon as the session is committed."""
+    session_id = uuid4()
+    stored = mocker.Mock()
+    db = mocker.Mock()
+    db.get = mocker.AsyncMock(side_effect=[None, None, stored])
+    db.rollback = mocker.AsyncMock()
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+    mocker.patch.object(service, "_to_response", side_effect=lambda session: session)
+
+    task = asyncio.create_task(service.get_decision_session(session_id, wait_seconds=5))
+    while notifier.waiting == 0:
+        await asyncio.sleep(0)
+    notifier._on_notification(None, 1, SESSION_COMPLETED_CHANNEL, str(session_id))
+
+    assert await asyncio.wait_for(task, timeout=1) is stored
+    # The pooled connection is released while waiting
+    db.rollback.assert_awaited()
+    assert notifier.waiting == 0
+
+
+async def test_long_poll_times_out(mocker, notifier) -> None:
+    """Test a session that never arrives is reported as not found."""
+    db = mocker.Mock()
+    db.get = mocker.AsyncMock(return_value=None)
+    db.rollback = mocker.AsyncMock()
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+
+    with pytest.raises(NotFoundException):
+        await service.get_decision_session(uuid4(), wait_seconds=0.05)
+    assert notifier.waiting == 0
@@ -1,8 +1,16 @@
 """Unit tests for orchestrator."""
 
+import asyncio
+
 import pytest
 
+from src.core.config import settings
+from src.core.errors import ContentSafetyException
+from src.orchestrator.draft_cache import StepOutputCache, draft_cache
+from src.orchestrator.graph import DecisionOrchestrator
 from src.orchestrator.state import DecisionState
+from src.orchestrator.tiers import resolve_tier
+from src.schemas.agents import AgentOutput
 
 
 def test_decision_state_initialization() -> None:
@@ -34,3 +42,194 @@ def test_decision_state_tracks_steps() -> None:
     assert len(state.completed_steps) == 2
     assert "intake" in state.completed_steps
     assert state.current_step == "calmness"
+
+
+AGENT_OUTPUTS = {
+    "intake_agent": {"decision_question": "Zmienić pracę?", "options": ["Zostać", "Odejść"]},
+    "context_agent": {"needs_clarification": False, "questions": [], "missing_info": []},
+    "calmness_agent": {
+        "calm_step": {
+            "type": "breathing",
+            "title": "Oddech",
+            "description": "Weź trzy głębokie oddechy",
+            "duration_minutes": 2,
+        }
+    },
+    "options_agent": {
+        "options": [
+            {
+                "title": title,
+                "description": "Opis",
+                "consequences": ["Konsekwencja"],
+                "emotional_risk": "Niskie",
+                "confidence_level": 0.7,
+            }
+            for title in ("Zostać", "Odejść")
+        ],
+        "control_question": "Co jest dla Ciebie najważniejsze?",
+    },
+    "safety_agent": {"is_safe": True},
+}
+
+
+@pytest.fixture
+def orchestrator(mocker) -> DecisionOrchestrator:
+    """Orchestrator with agents returning fixed outputs."""
+    draft_cache.clear()
+    orchestrator = DecisionOrchestrator(mocker.Mock())
+    for attr, metadata in AGENT_OUTPUTS.items():
+        agent = getattr(orchestrator, attr)
+        mocker.patch.object(
+            agent,
+            "process",
+            return_value=AgentOutput(content="{}", metadata=metadata, agent_name=agent.name),
+        )
+    return orchestrator
+
+
+async def test_stress_level_change_reuses_intake(orchestrator: DecisionOrchestrator) -> None:
+    """Test only steps depending on stress level run again."""
+    _, first = await orchestrator.evaluate(
+        context="Czy powinienem zmienić pracę?", options="Zostać, Odejść", stress_level=3
+    )
+    assert first.reused_steps == []
+    assert set(first.step_results) == {"intake", "context", "calmness", "options", "safety"}
+
+    _, second = await orchestrator.evaluate(
+        context="Czy powinienem zmienić pracę?",
+        options="Zostać, Odejść",
+        stress_level=8,
+        previous_steps=first.step_results,
+    )
+
+    assert second.reused_steps == ["intake", "safety"]
+    assert orchestrator.intake_agent.process.await_count == 1
+    assert orchestrator.calmness_agent.process.await_count == 2
+
+
+async def test_unchanged_input_reuses_every_step(orchestrator: DecisionOrchestrator) -> None:
+    """Test a re-run with identical input makes no agent calls."""
+    _, first = await orchestrator.evaluate(
+        context="Czy powinienem zmienić pracę?", options="Zostać, Odejść", stress_level=3
+    )
+    _, second = await orchestrator.evaluate(
+        context="Czy powinienem zmienić pracę?",
+        options="Zostać, Odejść",
+        stress_level=3,
+        previous_steps=first.step_results,
+    )
+
+    assert second.reused_steps == ["intake", "context", "calmness", "options", "safety"]
+    assert orchestrator.options_agent.process.await_count == 1
+
+
+async def test_submit_reuses_draft_intake(orchestrator: DecisionOrchestrator) -> None:
+    """Test a submit matching a prepared draft skips the intake call."""
+    _, cached = await orchestrator.prepare_draft(
+        context="Czy powinienem zmienić pracę?", options="Zostać, Odejść"
+    )
+    assert cached is False
+
+    _, state = await orchestrator.evaluate(
+        context="Czy powinienem zmienić pracę?", options="Zostać, Odejść", stress_level=6
+    )
+
+    assert state.reused_steps == ["intake"]
+    assert orchestrator.intake_agent.process.await_count == 1
+
+
+async def test_draft_with_crisis_content_is_rejected(orchestrator: DecisionOrchestrator) -> None:
+    """Test the input screen runs on drafts without calling agents."""
+    with pytest.raises(ContentSafetyException):
+        await orchestrator.prepare_draft(
+            context="Nie chcę żyć, nie wiem co robić", options="Zostać, Odejść"
+        )
+
+    assert orchestrator.intake_agent.process.await_count == 0
+
+
+def test_step_output_cache_expires_and_evicts(mocker) -> None:
+    """Test entries expire after the TTL and the oldest entry is evicted."""
+    now = mocker.patch("src.orchestrator.draft_cache.time.monotonic", return_value=100.0)
+    cache = StepOutputCache(ttl_seconds=10, max_entries=2)
+
+    cache.put("a", {"value": 1})
+    cache.put("b", {"value": 2})
+    cache.put("c", {"value": 3})
+    assert cache.get("a") is None
+    assert cache.get("b") == {"value": 2}
+
+    now.return_value = 111.0
+    assert cache.get("c") is None
+
+
+def test_resolve_tier_from_latency_budget() -> None:
+    """Test the tier is derived from max_latency_ms unless given explicitly."""
+    assert resolve_tier(None, None) == ("full", None)
+    assert resolve_tier(None, 2500) == ("fast", 2500)
+    assert resolve_tier(None, 8000) == ("reduced", 8000)
+    assert resolve_tier(None, 60000) == ("full", 60000)
+    assert resolve_tier("fast", None) == ("fast", settings.tier_fast_latency_ms)
+
+
+async def test_fast_tier_uses_templates_but_keeps_safety(
+    orchestrator: DecisionOrchestrator,
+) -> None:
+    """Test the fast tier only calls the options agent and the safety check."""
+    brief, state = await orchestrator.evaluate(
+        context="Czy powinienem zmienić pracę?",
+        options="Zostać, Odejść",
+        stress_level=8,
+        tier="fast",
+    )
+
+    assert state.skipped_steps == ["intake", "context", "calmness"]
+    assert orchestrator.intake_agent.process.await_count == 0
+    assert orchestrator.options_agent.process.await_count == 1
+    assert orchestrator.safety_agent.process.await_count == 1
+    assert brief.calm_step.type == "breathing"
+
+
+async def test_step_past_deadline_falls_back_to_template(
+    orchestrator: DecisionOrchestrator, mocker
+) -> None:
+    """Test a step missing its deadline is replaced by the agent template."""
+
+    async def slow_options(agent_input):
+        await asyncio.sleep(5)
+
+    mocker.patch.object(orchestrator.options_agent, "process", side_effect=slow_options)
+
+    brief, state = await orchestrator.evaluate(
+        context="Czy powinienem zmienić pracę?",
+        options="Zostać w firmie, Przyjąć ofertę",
+        stress_level=4,
+        max_latency_ms=1000,
+    )
+
+    assert state.tier == "fast"
+    assert state.degraded_steps == ["options"]
+    assert [option.title for option in brief.options] == ["Zostać w firmie", "Przyjąć ofertę"]
+
+
+async def test_safety_is_not_cut_short_by_the_deadline(
+    orchestrator: DecisionOrchestrator, mocker
+) -> None:
+    """Test a slow safety check still runs instead of passing on keyword checks alone."""
+
+    async def slow_safety(agent_input):
+        await asyncio.sleep(0.2)
+        raise ContentSafetyException(detail="Zablokowano", blocked_reason="porada medyczna")
+
+    mocker.patch.object(orchestrator.safety_agent, "process", side_effect=slow_safety)
+
+    with pytest.raises(ContentSafetyException):
+        await orchestrator.evaluate(
+            context="Czy powinienem zmienić pracę?",
+            options="Zostać, Odejść",
+            stress_level=4,
+            tier="reduced",
+            max_latency_ms=100,
+        )
+
+    assert orchestrator.safety_agent.process.await_count == 1
@@ -0,0 +1,132 @@
+"""Unit tests for session list pagination and counting."""
+
+import re
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from src.core.errors import ValidationException
+from src.services.decision_service import DecisionService, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    """Test a cursor decodes to the position it was built from."""
+    created_at, session_id = datetime(2026, 10, 19, 12, 30, 5, 123456), uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, session_id)) == (created_at, session_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "Zm9vfGJhcg"])
+def test_invalid_cursor_is_rejected(cursor: str) -> None:
+    """Test malformed cursors raise a validation error, not a server error."""
+    with pytest.raises(ValidationException):
+        decode_cursor(cursor)
+
+
+def make_service(mocker, rows: int, count: int | None = None, estimate=None):
+    """Service whose database returns `rows` sessions for the page query."""
+    sessions = [
+        mocker.Mock(created_at=datetime(2026, 10, 19, 12, 0, i), id=uuid4()) for i in range(rows)
+    ]
+    result = mocker.Mock()
+    result.scalars.return_value.all.return_value = sessions
+
+    db = mocker.Mock()
+    db.execute = mocker.AsyncMock(return_value=result)
+    db.scalar = mocker.AsyncMock(side_effect=[estimate] if estimate is not None else [count])
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+    mocker.patch.object(service, "_to_response", return_value=None)
+    mocker.patch(
+        "src.services.decision_service.ListDecisionSessionsResponse",
+        side_effect=lambda **kwargs: kwargs,
+    )
+    return service, db, sessions
+
+
+async def test_last_page_skips_count_query(mocker) -> None:
+    """Test total is derived from the page when it is the last one."""
+    service, db, _ = make_service(mocker, rows=3)
+
+    response = await service.list_decision_sessions(page_size=5)
+
+    assert response["total"] == 3
+    assert response["next_cursor"] is None
+    db.scalar.assert_not_awaited()
+
+
+async def test_full_page_returns_cursor_and_counts(mocker) -> None:
+    """Test an extra row yields a cursor for the next page and a count(*) query."""
+    service, db, sessions = make_service(mocker, rows=6, count=42)
+
+    response = await service.list_decision_sessions(page_size=5)
+
+    assert len(response["sessions"]) == 5
+    assert response["total"] == 42
+    assert decode_cursor(response["next_cursor"]) == (sessions[4].created_at, sessions[4].id)
+    assert "count(*)" in str(db.scalar.await_args.args[0])
+
+
+async def test_keyset_page_uses_row_comparison(mocker) -> None:
+    """Test cursor pages filter on (created_at, id) instead of OFFSET."""
+    service, db, _ = make_service(mocker, rows=6, count=None)
+
+    cursor = encode_cursor(datetime(2026, 10, 19), uuid4())
+    response = await service.list_decision_sessions(page_size=5, cursor=cursor, count="none")
+
+    query = str(db.execute.await_args.args[0])
+    assert "OFFSET" not in query
+    assert "(decision_sessions.created_at, decision_sessions.id) <" in query
+    assert response["total"] is None
+    db.scalar.assert_not_awaited()
+
+
+async def test_estimated_count(mocker) -> None:
+    """Test estimated mode reports planner statistics instead of counting."""
+    service, db, _ = make_service(mocker, rows=6, estimate=1200.0)
+
+    response = await service.list_decision_sessions(page_size=5, count="estimated")
+
+    assert response["total"] == 1200
+    assert response["total_estimated"] is True
+    assert "reltuples" in str(db.scalar.await_args.args[0])
+
+
+async def test_summary_view_selects_only_list_columns(mocker) -> None:
+    """Test the summary view avoids the heavy columns and builds summaries."""
+    row = mocker.Mock(
+        created_at=datetime(2026, 10, 19),
+        id=uuid4(),
+        user_id=None,
+        stress_level=4,
+        context_preview="x" * 121,
+        option_count=3,
+        calm_step_type="breathing",
+    )
+    result = mocker.Mock()
+    result.all.return_value = [row]
+    db = mocker.Mock()
+    db.execute = mocker.AsyncMock(return_value=result)
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+
+    response = await service.list_decision_sessions(view="summary")
+
+    query = str(db.execute.await_args.args[0])
+    for column in (
+        ", decision_sessions.context,",
+        ", decision_sessions.decision_brief,",
+        "embedding",
+    ):
+        assert column not in query
+    summary = response.sessions[0]
+    assert summary.context_preview == "x" * 120 + "..."
+    assert (summary.option_count, summary.calm_step_type) == (3, "breathing")
+
+
+def test_embedding_is_deferred() -> None:
+    """Test full session loads do not fetch the embedding vector."""
+    from sqlalchemy import select
+
+    from src.db.models import DecisionSession
+
+    assert not re.search(r"decision_sessions\.embedding\b", str(select(DecisionSession)))
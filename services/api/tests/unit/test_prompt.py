@@ -0,0 +1,40 @@
+"""Unit tests for prompt serialization."""
+
+from src.agents.prompt import estimate_tokens, render_prompt, to_compact_json
+
+
+def test_to_compact_json_is_minified_and_deterministic() -> None:
+    """Test compact JSON has no whitespace, sorted keys and raw unicode."""
+    assert to_compact_json({"b": 1, "a": ["żółw"]}) == '{"a":["żółw"],"b":1}'
+
+
+def test_render_prompt_projects_fields() -> None:
+    """Test only declared fields are rendered, in declared order."""
+    prompt, dropped = render_prompt(
+        "Decyzja",
+        {
+            "intake_output": {"options": ["A", "B"], "raw": "x" * 100},
+            "stress_level": 7,
+            "unused": "ignored",
+        },
+        fields={"stress_level": None, "intake_output": ("options",)},
+    )
+
+    assert prompt == 'Decyzja\n\nContext:\nstress_level: 7\nintake_output: {"options":["A","B"]}'
+    assert dropped == []
+
+
+def test_render_prompt_trims_low_priority_fields_to_budget() -> None:
+    """Test fields are dropped from the end until the prompt fits the budget."""
+    context = {"important": "krótko", "filler": "x" * 400}
+
+    prompt, dropped = render_prompt(
+        "Decyzja",
+        context,
+        fields={"important": None, "filler": None},
+        token_budget=20,
+    )
+
+    assert dropped == ["filler"]
+    assert "important: krótko" in prompt
+    assert estimate_tokens(prompt) <= 20
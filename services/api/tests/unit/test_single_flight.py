@@ -0,0 +1,400 @@
+"""Unit tests for single-flight coalescing and idempotent session creation."""
+
+import asyncio
+import json
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from src.core.config import settings
+from src.core.errors import ConflictException
+from src.db.models import DecisionJob, IdempotencyKey
+from src.orchestrator import DecisionState
+from src.schemas.agents import CalmStep, CalmStepType, DecisionOption
+from src.schemas.decision import (
+    CreateDecisionSessionRequest,
+    DecisionBrief,
+    DecisionSessionResponse,
+    NextCheckIn,
+)
+from src.services import decision_service as service_module
+from src.services import idempotency
+from src.services.decision_service import DecisionService, orchestration_key
+from src.services.embedding_pipeline import PENDING_EMBEDDINGS_KEY
+from src.services.idempotency import claim_idempotency_key, request_fingerprint
+from src.services.single_flight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution() -> None:
+    """Test callers with the same key run the call once and share its result."""
+    flight: SingleFlight[int] = SingleFlight("test")
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert calls == 1
+    assert [value for value, _ in results] == [42] * 5
+    assert [shared for _, shared in results].count(False) == 1
+    assert not flight.in_flight("key")
+
+
+async def test_exception_is_shared_with_waiters() -> None:
+    """Test waiters receive the leader's exception."""
+    flight: SingleFlight[int] = SingleFlight("test")
+
+    async def failing() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", failing), flight.do("key", failing), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_waiter_takes_over_when_leader_is_cancelled() -> None:
+    """Test a waiter runs the call itself if the leader is cancelled."""
+    flight: SingleFlight[str] = SingleFlight("test")
+
+    async def slow() -> str:
+        await asyncio.sleep(10)
+        return "leader"
+
+    async def fast() -> str:
+        return "follower"
+
+    leader = asyncio.create_task(flight.do("key", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", fast))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await follower == ("follower", False)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+def make_response(request: CreateDecisionSessionRequest) -> DecisionSessionResponse:
+    """Build a stored session response for a request."""
+    return DecisionSessionResponse(
+        id=uuid4(),
+        created_at=datetime.utcnow(),
+        user_id=request.user_id,
+        input=request,
+        output=DecisionBrief(
+            options=[
+                DecisionOption(
+                    title=f"Opcja {index}",
+                    description="Opis",
+                    consequences=["Konsekwencja"],
+                    emotional_risk="Niskie",
+                    confidence_level=0.7,
+                )
+                for index in range(2)
+            ],
+            calm_step=CalmStep(
+                type=CalmStepType.BREATHING,
+                title="Oddech",
+                description="Weź trzy głębokie oddechy",
+                duration_minutes=2,
+            ),
+            control_question="Co jest dla Ciebie najważniejsze?",
+            next_check_in=NextCheckIn(suggestion="jutro rano", reasoning="Po odpoczynku"),
+        ),
+        stress_level=request.stress_level,
+        processing_time_seconds=1.0,
+    )
+
+
+@pytest.fixture
+def decision_request() -> CreateDecisionSessionRequest:
+    """Valid decision request."""
+    return CreateDecisionSessionRequest(
+        context="Czy powinienem zmienić pracę na lepiej płatną?",
+        options="Zostać, Odejść",
+        stress_level=3,
+    )
+
+
+class FakeClaims:
+    """Idempotency keys table shared by all services of a test, as by API processes."""
+
+    def __init__(self) -> None:
+        self.claims: dict[str, IdempotencyKey] = {}
+
+    async def claim(self, key, request, session_id, job_id=None):
+        if key in self.claims:
+            return self.claims[key]
+        self.claims[key] = IdempotencyKey(
+            key=key,
+            request_hash=request_fingerprint(request),
+            session_id=session_id,
+            job_id=job_id,
+        )
+        return None
+
+    async def release(self, key, session_id) -> None:
+        if key in self.claims and self.claims[key].session_id == session_id:
+            del self.claims[key]
+
+
+@pytest.fixture
+def claims(mocker) -> FakeClaims:
+    """In-memory idempotency key claims."""
+    fake = FakeClaims()
+    mocker.patch.object(service_module, "claim_idempotency_key", side_effect=fake.claim)
+    mocker.patch.object(service_module, "release_idempotency_key", side_effect=fake.release)
+    return fake
+
+
+def make_process(mocker, stored: dict, evaluate) -> DecisionService:
+    """Service of one API process writing sessions to a shared table."""
+    db = mocker.Mock()
+    db.info = {}
+    db.flush = mocker.AsyncMock()
+    db.add.side_effect = lambda row: stored.setdefault(row.id, row)
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+    mocker.patch.object(service.orchestrator, "evaluate", side_effect=evaluate)
+
+    async def wait_for_session(session_id, wait_seconds):
+        while session_id not in stored:
+            await asyncio.sleep(0.001)
+        return stored[session_id]
+
+    mocker.patch.object(service, "_wait_for_session", side_effect=wait_for_session)
+    return service
+
+
+async def test_idempotent_retries_on_other_processes_run_pipeline_once(
+    mocker, claims: FakeClaims, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test retries landing on other processes wait for the session of the key holder."""
+    mocker.patch.object(settings, "enable_vector_search", False)
+    mocker.patch.object(settings, "orchestration_coalescing_enabled", False)
+    brief = make_response(decision_request).output
+    stored: dict = {}
+    calls = 0
+
+    async def evaluate(**kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return brief, DecisionState(context="", options="", stress_level=1)
+
+    processes = [make_process(mocker, stored, evaluate) for _ in range(3)]
+    responses = await asyncio.gather(
+        *(process.create_decision_session(decision_request, "key-1") for process in processes)
+    )
+
+    assert calls == 1
+    assert len(stored) == 1
+    assert {response.id for response in responses} == {claims.claims["key-1"].session_id}
+
+
+async def test_idempotency_key_reused_with_different_request(
+    mocker, claims: FakeClaims, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test a claimed key used with a different payload is rejected without waiting."""
+    service = DecisionService(db_session=mocker.AsyncMock(), openai_client=mocker.Mock())
+    await claims.claim("key-1", decision_request, uuid4())
+    wait = mocker.patch.object(service, "_wait_for_session")
+
+    changed = decision_request.model_copy(update={"stress_level": 5})
+    with pytest.raises(ConflictException):
+        await service.create_decision_session(changed, "key-1")
+    wait.assert_not_awaited()
+
+
+async def test_failed_request_releases_its_idempotency_key(
+    mocker, claims: FakeClaims, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test a retry after a failure runs the request again instead of waiting."""
+    mocker.patch.object(settings, "enable_vector_search", False)
+    mocker.patch.object(settings, "orchestration_coalescing_enabled", False)
+    brief = make_response(decision_request).output
+    stored: dict = {}
+    outcomes = [
+        RuntimeError("boom"),
+        (brief, DecisionState(context="", options="", stress_level=1)),
+    ]
+    service = make_process(mocker, stored, outcomes)
+
+    with pytest.raises(RuntimeError):
+        await service.create_decision_session(decision_request, "key-1")
+    assert claims.claims == {}
+
+    response = await service.create_decision_session(decision_request, "key-1")
+
+    assert response.id == claims.claims["key-1"].session_id
+    assert list(stored) == [response.id]
+
+
+async def test_sync_and_queued_requests_share_idempotency_keys(
+    mocker, claims: FakeClaims, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test a sync retry waits for the session of the queued job and vice versa is refused."""
+
+    async def enqueue(request, idempotency_key=None, job_id=None, session_id=None):
+        return DecisionJob(
+            id=job_id,
+            created_at=datetime.utcnow(),
+            session_id=session_id,
+            payload=request.model_dump(mode="json"),
+            status="queued",
+            attempts=0,
+        )
+
+    mocker.patch.object(service_module.JobQueue, "enqueue", side_effect=enqueue)
+    service = DecisionService(db_session=mocker.AsyncMock(), openai_client=mocker.Mock())
+    wait = mocker.patch.object(service, "_wait_for_session", return_value=None)
+
+    job = await service.enqueue_decision_session(decision_request, "key-1")
+
+    with pytest.raises(ConflictException, match="przetwarzane"):
+        await service.create_decision_session(decision_request, "key-1")
+    assert wait.await_args.args[0] == job.session_id
+
+    await claims.claim("key-2", decision_request, uuid4())
+    with pytest.raises(ConflictException, match="synchronicznym"):
+        await service.enqueue_decision_session(decision_request, "key-2")
+
+
+async def test_claim_returns_the_holder_of_a_taken_key(
+    mocker, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test a key neither free, expired nor abandoned is reported as held."""
+    holder = IdempotencyKey(key="key-1", request_hash="", session_id=uuid4())
+    db = mocker.AsyncMock()
+    db.execute.return_value = mocker.Mock(rowcount=0)
+    db.get.return_value = holder
+    mocker.patch.object(idempotency, "SessionLocal", return_value=db)
+    db.__aenter__.return_value = db
+
+    assert await claim_idempotency_key("key-1", decision_request, uuid4()) is holder
+    assert db.execute.await_count == 2
+
+    db.execute.return_value = mocker.Mock(rowcount=1)
+    assert await claim_idempotency_key("key-1", decision_request, uuid4()) is None
+
+
+def test_orchestration_key_normalizes_whitespace(
+    decision_request: CreateDecisionSessionRequest,
+) -> None:
+    """Test requests differing only in formatting or user share a key."""
+    reformatted = decision_request.model_copy(
+        update={
+            "context": "  Czy powinienem  zmienić pracę\nna lepiej płatną? ",
+            "user_id": "user-2",
+        }
+    )
+    calmer = decision_request.model_copy(update={"stress_level": 1})
+
+    assert orchestration_key(reformatted) == orchestration_key(decision_request)
+    assert orchestration_key(calmer) != orchestration_key(decision_request)
+
+
+async def test_identical_requests_share_orchestration(
+    mocker, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test concurrent identical requests run the pipeline once but persist separately."""
+    mocker.patch.object(settings, "enable_vector_search", False)
+    brief = make_response(decision_request).output
+    calls = 0
+
+    async def evaluate(**kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return brief, DecisionState(context="", options="", stress_level=1)
+
+    def make_service() -> DecisionService:
+        db = mocker.Mock()
+        db.flush = mocker.AsyncMock()
+        service = DecisionService(db_session=db, openai_client=mocker.Mock())
+        mocker.patch.object(service.orchestrator, "evaluate", side_effect=evaluate)
+        return service
+
+    services = [make_service() for _ in range(3)]
+    responses = await asyncio.gather(
+        *(service.create_decision_session(decision_request) for service in services)
+    )
+
+    assert calls == 1
+    assert len({response.id for response in responses}) == 3
+    stored = [service.db.add.call_args.args[0] for service in services]
+    assert sum(bool(session.llm_usage.get("coalesced")) for session in stored) == 2
+
+
+async def test_session_is_written_in_one_flush(
+    mocker, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test creation inserts the row once, leaves the commit to the request and embeds later."""
+    mocker.patch.object(settings, "enable_vector_search", True)
+    db = mocker.Mock()
+    db.info = {}
+    db.flush = mocker.AsyncMock()
+    db.commit = mocker.AsyncMock()
+    db.refresh = mocker.AsyncMock()
+    db.execute = mocker.AsyncMock()
+    openai_client = mocker.Mock()
+    openai_client.create_embedding = mocker.AsyncMock()
+    service = DecisionService(db_session=db, openai_client=openai_client)
+    mocker.patch.object(
+        service.orchestrator,
+        "evaluate",
+        return_value=(
+            make_response(decision_request).output,
+            DecisionState(context="", options="", stress_level=1),
+        ),
+    )
+
+    response = await service.create_decision_session(decision_request)
+
+    stored = db.add.call_args.args[0]
+    assert response.id == stored.id and response.created_at == stored.created_at
+    db.flush.assert_awaited_once()
+    db.commit.assert_not_awaited()
+    db.refresh.assert_not_awaited()
+    db.execute.assert_not_awaited()
+    # The embedding is computed after the commit, off the request path
+    openai_client.create_embedding.assert_not_awaited()
+    assert db.info[PENDING_EMBEDDINGS_KEY] == [stored.id]
+
+
+async def test_created_at_is_serialized_the_same_on_create_and_read(
+    mocker, decision_request: CreateDecisionSessionRequest
+) -> None:
+    """Test POST returns created_at in the timezone-aware form GET reads back from the database."""
+    mocker.patch.object(settings, "enable_vector_search", False)
+    db = mocker.Mock()
+    db.info = {}
+    db.flush = mocker.AsyncMock()
+    service = DecisionService(db_session=db, openai_client=mocker.Mock())
+    mocker.patch.object(
+        service.orchestrator,
+        "evaluate",
+        return_value=(
+            make_response(decision_request).output,
+            DecisionState(context="", options="", stress_level=1),
+        ),
+    )
+
+    created = (await service.create_decision_session(decision_request)).model_dump(mode="json")
+
+    # TIMESTAMPTZ columns come back from asyncpg as UTC-aware datetimes
+    stored = db.add.call_args.args[0]
+    stored.created_at = stored.created_at.astimezone(UTC)
+    db.get = mocker.AsyncMock(return_value=stored)
+    read = json.loads(await service.get_decision_session_json(stored.id))
+
+    assert created["created_at"] == read["created_at"]
+    assert created["created_at"].endswith("Z")
@@ -0,0 +1,91 @@
+"""Unit tests for the versioned decision brief storage format."""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+from pydantic_core import to_json
+
+from src.db.models import DecisionSession
+from src.schemas.decision import DecisionBrief
+from src.schemas.storage import BRIEF_SCHEMA_VERSION, load_brief
+from src.services.decision_service import DecisionService
+
+BRIEF = DecisionBrief.model_validate(
+    {
+        "options": [
+            {
+                "title": title,
+                "description": "Opis",
+                "consequences": ["Konsekwencja"],
+                "emotional_risk": "Niskie",
+                "confidence_level": 0.7,
+            }
+            for title in ("Zostać", "Odejść")
+        ],
+        "calm_step": {
+            "type": "breathing",
+            "title": "Oddech",
+            "description": "Weź trzy głębokie oddechy",
+            "duration_minutes": 2,
+        },
+        "control_question": "Co jest dla Ciebie najważniejsze?",
+        "next_check_in": {"suggestion": "jutro rano", "reasoning": "Po odpoczynku"},
+    }
+)
+
+
+def make_session(schema_version: int | None) -> DecisionSession:
+    """Stored session as written by the service."""
+    return DecisionSession(
+        id=uuid4(),
+        created_at=datetime(2026, 10, 19, 12),
+        user_id="u1",
+        context="Czy powinienem zmienić pracę?",
+        options="Zostać, Odejść",
+        stress_level=5,
+        decision_brief=BRIEF.model_dump(mode="json"),
+        schema_version=schema_version,
+        processing_time_seconds=1.5,
+        processing_metadata={
+            "tier": "full",
+            "max_latency_ms": None,
+            "degraded": False,
+            "skipped_steps": [],
+            "degraded_steps": [],
+            "requested_tier": None,
+            "requested_max_latency_ms": None,
+        },
+    )
+
+
+def test_payload_matches_validated_response() -> None:
+    """Test the stored-JSON fast path serializes exactly like the model."""
+    session = make_session(BRIEF_SCHEMA_VERSION)
+
+    assert to_json(DecisionService._to_payload(session)) == (
+        DecisionService._to_response(session).model_dump_json().encode()
+    )
+
+
+def test_current_rows_are_not_revalidated(mocker) -> None:
+    """Test current-version rows skip model building entirely."""
+    validate = mocker.spy(DecisionBrief, "model_validate")
+
+    payload = DecisionService._to_payload(make_session(BRIEF_SCHEMA_VERSION))
+
+    validate.assert_not_called()
+    assert payload["output"] == BRIEF.model_dump(mode="json")
+    assert "requested_tier" not in payload["processing"]
+
+
+def test_unversioned_rows_are_validated() -> None:
+    """Test rows written before versioning go through migration and validation."""
+    session = make_session(None)
+    session.decision_brief["options"] = session.decision_brief["options"][:1]
+
+    with pytest.raises(ValidationError):
+        DecisionService._to_payload(session)
+    with pytest.raises(ValidationError):
+        load_brief(session.decision_brief, None)
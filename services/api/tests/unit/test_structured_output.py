@@ -0,0 +1,117 @@
+"""Unit tests for strict JSON schema response formats."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import ContextAgent, OptionsAgent
+from src.schemas.agents import AgentInput, OptionsResult
+from src.schemas.structured_output import json_schema_response_format
+
+
+class StaticResponseClient:
+    """Mock OpenAI client answering every call with the same content."""
+
+    def __init__(self, content: str) -> None:
+        """Initialize with the response content."""
+        self.content = content
+
+    async def chat_completion(self, messages: list, **kwargs: any) -> any:
+        """Mock chat completion."""
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_response_format_is_strict() -> None:
+    """Test every object requires all properties and forbids extra ones."""
+    response_format = json_schema_response_format(OptionsResult)
+    schema = response_format["json_schema"]["schema"]
+    option_schema = schema["$defs"]["DecisionOption"]
+
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    assert schema["additionalProperties"] is False
+    assert schema["required"] == ["options", "considerations", "control_question"]
+    assert option_schema["additionalProperties"] is False
+    assert "title" in option_schema["required"]
+    assert "maxLength" not in option_schema["properties"]["title"]
+
+
+async def test_options_over_the_limits_are_fitted_one_by_one() -> None:
+    """Test options breaking limits dropped from the schema are repaired or dropped singly."""
+    over_limit = {
+        "title": "Z" * 250,
+        "description": "Opis",
+        "consequences": ["A", "B", "C", "D", "E", "F"],
+        "emotional_risk": "Niskie",
+        "confidence_level": 1.3,
+    }
+    valid = {**over_limit, "title": "Odejść", "consequences": ["A"], "confidence_level": 0.6}
+    unrepairable = {**valid, "title": "Czekać", "consequences": []}
+    response = json.dumps(
+        {
+            "options": [over_limit, unrepairable, valid],
+            "considerations": "Koszt zmiany",
+            "control_question": "Co dalej?",
+        }
+    )
+    agent = OptionsAgent(StaticResponseClient(response))
+
+    output = await agent.process(
+        AgentInput(
+            content="Czy zmienić pracę?",
+            context={"options": "Zostać, Odejść"},
+            agent_name="OptionsAgent",
+        )
+    )
+
+    first, second = output.metadata["options"]
+    assert first["title"] == "Z" * 200
+    assert first["consequences"] == ["A", "B", "C", "D", "E"]
+    assert first["confidence_level"] == 1.0
+    assert second["title"] == "Odejść"
+    assert output.metadata["considerations"] == "Koszt zmiany"
+
+
+async def test_unparseable_options_fall_back_to_template() -> None:
+    """Test a response that is not an options object yields the template options."""
+    agent = OptionsAgent(StaticResponseClient('{"options": "Zostać"}'))
+
+    output = await agent.process(
+        AgentInput(
+            content="Czy zmienić pracę?",
+            context={"options": "Zostać, Odejść"},
+            agent_name="OptionsAgent",
+        )
+    )
+
+    assert [opt["title"] for opt in output.metadata["options"]] == ["Zostać", "Odejść"]
+    assert output.metadata["options"][0]["confidence_level"] == 0.5
+
+
+@pytest.mark.parametrize("response", ["not json", '{"needs_clarification": "maybe"}'])
+async def test_invalid_context_output_falls_back_to_template(response: str) -> None:
+    """Test unparseable or mistyped output yields the agent's template."""
+    agent = ContextAgent(StaticResponseClient(response))
+    agent_input = AgentInput(content="Czy zmienić pracę?", context={}, agent_name="ContextAgent")
+
+    output = await agent.process(agent_input)
+
+    assert output.metadata == agent.fallback_output(agent_input)
+
+
+async def test_context_output_is_validated_and_capped() -> None:
+    """Test valid output goes through the model and keeps at most two questions."""
+    question = {"question": "Jaki masz budżet?", "reasoning": "Ogranicza opcje"}
+    response = json.dumps(
+        {"needs_clarification": True, "questions": [question] * 3, "missing_info": ["budżet"]}
+    )
+    agent = ContextAgent(StaticResponseClient(response))
+
+    output = await agent.process(
+        AgentInput(content="Czy kupić dom?", context={}, agent_name="ContextAgent")
+    )
+
+    assert output.metadata["needs_clarification"] is True
+    assert output.metadata["questions"] == [question, question]
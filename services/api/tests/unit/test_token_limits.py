@@ -0,0 +1,46 @@
+"""Unit tests for adaptive completion limits."""
+
+from src.agents.token_limits import AdaptiveTokenLimiter
+
+
+def test_limit_uses_default_until_enough_samples() -> None:
+    """Test the static default applies before the window is warm."""
+    limiter = AdaptiveTokenLimiter(min_samples=5, ceiling=2000)
+
+    assert limiter.limit_for("IntakeAgent") == 2000
+    assert limiter.limit_for("OptionsAgent", default=1500) == 1500
+
+    for _ in range(4):
+        limiter.observe("OptionsAgent", completion_tokens=300, truncated=False)
+
+    assert limiter.limit_for("OptionsAgent", default=1500) == 1500
+
+
+def test_limit_learned_from_percentile_with_floor_and_ceiling() -> None:
+    """Test learned limit is percentile plus headroom, clamped."""
+    limiter = AdaptiveTokenLimiter(min_samples=3, headroom=0.5, floor=100, ceiling=1000)
+
+    for tokens in (200, 300, 400):
+        limiter.observe("CalmnessAgent", completion_tokens=tokens, truncated=False)
+    for tokens in (10, 20, 30):
+        limiter.observe("ContextAgent", completion_tokens=tokens, truncated=False)
+    for tokens in (900, 950, 990):
+        limiter.observe("OptionsAgent", completion_tokens=tokens, truncated=False)
+
+    assert limiter.limit_for("CalmnessAgent") == 600
+    assert limiter.limit_for("ContextAgent") == 100
+    assert limiter.limit_for("OptionsAgent") == 1000
+
+
+def test_truncations_are_counted_and_raise_limit() -> None:
+    """Test truncated completions back the limit off upwards."""
+    limiter = AdaptiveTokenLimiter(min_samples=2, headroom=0.0, backoff=2.0, ceiling=5000)
+
+    limiter.observe("IntakeAgent", completion_tokens=200, truncated=False)
+    limiter.observe("IntakeAgent", completion_tokens=200, truncated=False)
+    assert limiter.limit_for("IntakeAgent") == 200
+
+    limiter.observe("IntakeAgent", completion_tokens=200, truncated=True)
+
+    assert limiter.limit_for("IntakeAgent") == 400
+    assert limiter.stats()["IntakeAgent"]["truncations"] == 1
@@ -0,0 +1,109 @@
+"""Unit tests for pgvector similarity search."""
+
+import pytest
+from openai._types import NOT_GIVEN, NotGiven
+from pydantic import ValidationError
+
+from src.core.config import Settings, settings
+from src.db.types import embedding_type, verify_embedding_columns
+from src.db.vector_store import VectorStore
+from src.services.openai_client import OpenAIClient
+
+
+@pytest.fixture
+def session(mocker):
+    """Database session returning no similar sessions."""
+    result = mocker.Mock()
+    result.scalars.return_value.all.return_value = []
+    session = mocker.Mock()
+    session.execute = mocker.AsyncMock(return_value=result)
+    return session
+
+
+async def test_search_breadth_is_set_per_transaction(mocker, session) -> None:
+    """Test find_similar sets ef_search and probes locally before querying."""
+    mocker.patch.object(settings, "hnsw_ef_search", 40)
+    mocker.patch.object(settings, "ivfflat_probes", 10)
+    store = VectorStore(session)
+
+    await store.find_similar([0.0] * 1536, limit=5)
+
+    (setup, params), (query,) = (call.args for call in session.execute.await_args_list)
+    assert "set_config('hnsw.ef_search', :ef_search, true)" in str(setup)
+    assert params == {"ef_search": "40", "probes": "10"}
+    assert "<=>" in str(query)
+    assert "decision_sessions.embedding_model = " in str(query)
+
+
+async def test_ef_search_covers_limit(session) -> None:
+    """Test HNSW searches at least as many candidates as results requested."""
+
+    await VectorStore(session).find_similar([0.0] * 1536, limit=100, ef_search=40, probes=3)
+
+    assert session.execute.await_args_list[0].args[1] == {"ef_search": "100", "probes": "3"}
+
+
+@pytest.mark.parametrize(
+    ("storage", "column"), [("vector", "VECTOR(512)"), ("halfvec", "HALFVEC(512)")]
+)
+def test_embedding_column_follows_settings(mocker, storage: str, column: str) -> None:
+    """Test the embedding column type matches the configured size and precision."""
+    mocker.patch.object(settings, "embedding_dimensions", 512)
+    mocker.patch.object(settings, "embedding_storage", storage)
+
+    embedding = embedding_type()
+
+    assert embedding.get_col_spec() == column
+    assert embedding.bind_processor(None)([0.5] * 512).startswith("[0.5,")
+
+
+async def test_startup_rejects_columns_migrated_with_other_settings(mocker) -> None:
+    """Test a column created for another embedding size or precision stops startup."""
+    mocker.patch.object(settings, "embedding_dimensions", 512)
+    mocker.patch.object(settings, "embedding_storage", "halfvec")
+    mocker.patch.object(settings, "local_embedding_dimensions", 256)
+    conn = mocker.AsyncMock()
+    conn.execute.return_value = [("embedding", "halfvec(512)"), ("local_embedding", "vector(256)")]
+
+    await verify_embedding_columns(conn)
+
+    conn.execute.return_value = [("embedding", "vector(1536)")]
+    with pytest.raises(RuntimeError, match=r"embedding is vector\(1536\), settings expect halfvec"):
+        await verify_embedding_columns(conn)
+
+
+@pytest.mark.parametrize(
+    ("model", "expected"),
+    [
+        ("text-embedding-3-small", 512),
+        ("text-embedding-ada-002", NOT_GIVEN),
+    ],
+)
+async def test_embeddings_are_requested_at_stored_size(
+    mocker, model: str, expected: int | NotGiven
+) -> None:
+    """Test the API shortens vectors to the stored size where the model supports it."""
+    mocker.patch.object(settings, "embedding_dimensions", 512)
+    client = OpenAIClient()
+    create = mocker.patch.object(client.client.embeddings, "create", mocker.AsyncMock())
+    create.return_value.data = [mocker.Mock(index=0, embedding=[0.1])]
+
+    await client.create_embeddings(["tekst"], model=model)
+
+    assert create.await_args.kwargs["dimensions"] == expected
+
+
+@pytest.mark.parametrize(
+    ("storage", "dimensions", "valid"),
+    [("vector", 2000, True), ("vector", 3072, False), ("halfvec", 3072, True)],
+)
+def test_embedding_dimensions_are_capped_by_index_limits(
+    storage: str, dimensions: int, valid: bool
+) -> None:
+    """Test sizes pgvector cannot index for the storage type are rejected at startup."""
+    config = {"embedding_storage": storage, "embedding_dimensions": dimensions}
+    if valid:
+        assert Settings(**config).embedding_dimensions == dimensions
+    else:
+        with pytest.raises(ValidationError, match="halfvec"):
+            Settings(**config)